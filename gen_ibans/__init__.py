@@ -25,9 +25,20 @@ SOFTWARE.
 """
 
 from .iban_generator import IBANGenerator, BankInfo, validate_iban
+from .bank_index import BankIndex
+from .bank_updates import BankDelta
+from .shared_table import SharedBankTable
 from .cli import main
 
 from importlib.metadata import version
 
 __version__ = version("gen-ibans")
-__all__ = ["IBANGenerator", "BankInfo", "validate_iban", "main"]
+__all__ = [
+    "IBANGenerator",
+    "BankInfo",
+    "BankIndex",
+    "BankDelta",
+    "SharedBankTable",
+    "validate_iban",
+    "main",
+]
@@ -0,0 +1,225 @@
+"""
+Bank Filter Module
+
+This module provides a composable filter engine over an indexed bank table.
+Include and exclude terms are resolved through the BankIndex and combined with
+set algebra over bank IDs; regex filters only scan the remaining candidates.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .bank_index import COLUMN_NAMES, BankIndex
+
+if TYPE_CHECKING:  # pragma: no cover - imported for type hints only
+    from .iban_generator import BankInfo
+
+
+# Alternative spellings accepted for filter fields
+_FIELD_ALIASES = {
+    "bankleitzahl": "blz",
+    "bank_code": "blz",
+    "pruefziffer": "method",
+    "method_code": "method",
+    "postal_code": "plz",
+    "city": "ort",
+    "clearing": "region",
+}
+
+
+@dataclass(frozen=True, order=True)
+class FilterTerm:
+    """A single exact or prefix match on an indexed bank column.
+
+    Textual form is ``field:value``; a trailing ``*`` turns the term into a
+    prefix match (e.g. ``blz:370*``, ``bic:COBADE*``, ``method:09``).
+    """
+
+    field: str
+    value: str
+    prefix: bool = False
+
+    @classmethod
+    def parse(cls, text: str) -> "FilterTerm":
+        """
+        Parse a ``field:value`` term.
+
+        Raises:
+            ValueError: If the term is malformed or the field is not indexed
+        """
+        sep = ":" if ":" in text else "="
+        field_name, found, value = text.partition(sep)
+        field_name = field_name.strip().lower()
+        field_name = _FIELD_ALIASES.get(field_name, field_name)
+        value = value.strip()
+        if not found or not field_name or not value:
+            raise ValueError(f"Invalid bank filter term '{text}', expected FIELD:VALUE")
+        if field_name not in COLUMN_NAMES:
+            raise ValueError(
+                f"Unknown bank filter field '{field_name}'. "
+                f"Supported: {', '.join(COLUMN_NAMES)}"
+            )
+        prefix = value.endswith("*")
+        if prefix:
+            value = value.rstrip("*")
+        return cls(field_name, value, prefix)
+
+    def ids(self, index: BankIndex) -> List[int]:
+        """Return the IDs of all banks matched by this term."""
+        return index.ids(self.field, self.value, prefix=self.prefix)
+
+    def __str__(self) -> str:
+        return f"{self.field}:{self.value}{'*' if self.prefix else ''}"
+
+
+@dataclass(frozen=True)
+class BankFilter:
+    """Filter expression over a bank table.
+
+    Semantics:
+    - Include terms on the same field are OR-ed, different fields are AND-ed.
+      Without include terms all banks are candidates.
+    - Banks matched by any exclude term are removed.
+    - ``implemented_methods_only`` keeps banks whose check-digit method has a
+      registered validator.
+    - The regex filters (bank name, BIC, BLZ) are applied last to the
+      remaining candidates.
+
+    Instances are hashable and normalized, so equal expressions share one
+    cached result per BankIndex.
+    """
+
+    include: Tuple[FilterTerm, ...] = ()
+    exclude: Tuple[FilterTerm, ...] = ()
+    implemented_methods_only: bool = False
+    name_regex: Optional[str] = None
+    bic_regex: Optional[str] = None
+    blz_regex: Optional[str] = None
+
+    @classmethod
+    def from_options(
+        cls,
+        include: Iterable[str] = (),
+        exclude: Iterable[str] = (),
+        implemented_methods_only: bool = False,
+        name_regex: Optional[str] = None,
+        bic_regex: Optional[str] = None,
+        blz_regex: Optional[str] = None,
+    ) -> "BankFilter":
+        """Build a normalized filter from textual terms and regex patterns."""
+        return cls(
+            include=tuple(sorted({FilterTerm.parse(t) for t in include or ()})),
+            exclude=tuple(sorted({FilterTerm.parse(t) for t in exclude or ()})),
+            implemented_methods_only=bool(implemented_methods_only),
+            name_regex=name_regex or None,
+            bic_regex=bic_regex or None,
+            blz_regex=blz_regex or None,
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        """True if the filter keeps every bank."""
+        return not (
+            self.include
+            or self.exclude
+            or self.implemented_methods_only
+            or self.name_regex
+            or self.bic_regex
+            or self.blz_regex
+        )
+
+    def select_ids(self, index: BankIndex) -> FrozenSet[int]:
+        """
+        Resolve the filter to a set of bank IDs.
+
+        Raises:
+            re.error: If one of the regex patterns is invalid
+        """
+        # Compile first so invalid patterns fail before any work is done
+        patterns = [
+            (re.compile(pattern, flags), attr)
+            for pattern, attr, flags in (
+                (self.name_regex, "name", re.IGNORECASE),
+                (self.bic_regex, "bic", re.IGNORECASE),
+                (self.blz_regex, "bankleitzahl", 0),
+            )
+            if pattern
+        ]
+
+        selected = None
+        by_field: Dict[str, set] = {}
+        for term in self.include:
+            by_field.setdefault(term.field, set()).update(term.ids(index))
+        for ids in by_field.values():
+            selected = ids if selected is None else selected & ids
+        if selected is None:
+            selected = set(index.all_ids())
+
+        for term in self.exclude:
+            selected.difference_update(term.ids(index))
+
+        if self.implemented_methods_only:
+            from .methods import implemented_methods
+
+            implemented = set()
+            for code in implemented_methods():
+                implemented.update(index.ids_by_method(code))
+            selected &= implemented
+
+        banks = index.banks
+        for pattern, attr in patterns:
+            selected = {
+                i for i in selected if pattern.search(getattr(banks[i], attr) or "")
+            }
+
+        return frozenset(selected)
+
+    def apply(self, index: BankIndex) -> List["BankInfo"]:
+        """
+        Return the matching banks in table order.
+
+        Results are cached on the index per filter expression, so repeated
+        calls with an equal filter are free.
+        """
+        if self.is_empty:
+            return list(index.banks)
+
+        def _build() -> List["BankInfo"]:
+            banks = index.banks
+            return [banks[i] for i in sorted(self.select_ids(index))]
+
+        return list(index.cached_view(("bank_filter", self), _build))
+
+    def __str__(self) -> str:
+        parts = [f"+{t}" for t in self.include] + [f"-{t}" for t in self.exclude]
+        if self.implemented_methods_only:
+            parts.append("implemented-methods-only")
+        for label, pattern in (
+            ("name", self.name_regex),
+            ("bic", self.bic_regex),
+            ("blz", self.blz_regex),
+        ):
+            if pattern:
+                parts.append(f"{label}~/{pattern}/")
+        return " ".join(parts) or "(all banks)"
@@ -0,0 +1,224 @@
+"""
+Bank Lookup Index Module
+
+This module provides constant-time lookups over a loaded bank table by BLZ,
+BIC, check-digit method, BLZ clearing area, Merkmal, PLZ and Ort, plus sorted
+prefix lookups on the same columns.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import bisect
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+if TYPE_CHECKING:  # pragma: no cover - imported for type hints only
+    from .iban_generator import BankInfo
+
+
+def normalize_bic(bic: Optional[str]) -> str:
+    """Normalize a BIC for lookups (upper case, BIC8 expanded to BIC11 with XXX)."""
+    value = (bic or "").strip().upper()
+    if len(value) == 8:
+        value += "XXX"
+    return value
+
+
+def _normalize_text(value: Optional[str]) -> str:
+    return (value or "").strip()
+
+
+def _normalize_upper(value: Optional[str]) -> str:
+    return (value or "").strip().upper()
+
+
+def _normalize_city(value: Optional[str]) -> str:
+    return (value or "").strip().casefold()
+
+
+# Indexed columns: name -> (key extractor for a bank, normalizer for query values)
+_COLUMNS: Dict[str, tuple] = {
+    "blz": (lambda b: _normalize_text(b.bankleitzahl), _normalize_text),
+    "bic": (lambda b: normalize_bic(b.bic), _normalize_upper),
+    "method": (lambda b: _normalize_upper(b.method_code), _normalize_upper),
+    "region": (lambda b: _normalize_text(b.bankleitzahl)[:1], _normalize_text),
+    "merkmal": (
+        lambda b: _normalize_text(getattr(b, "merkmal", None)),
+        _normalize_text,
+    ),
+    "plz": (
+        lambda b: _normalize_text(getattr(b, "postal_code", None)),
+        _normalize_text,
+    ),
+    "ort": (lambda b: _normalize_city(getattr(b, "city", None)), _normalize_city),
+}
+
+# Names accepted for the indexed columns
+COLUMN_NAMES = tuple(_COLUMNS)
+
+
+class BankIndex:
+    """Lookup index over a list of banks.
+
+    Banks are addressed by their position in the indexed list (the bank ID),
+    so results of different lookups can be combined with plain set operations.
+    """
+
+    def __init__(self, banks: Sequence["BankInfo"]):
+        """
+        Build all lookup tables in a single pass.
+
+        Args:
+            banks: Bank table to index (kept by reference, not copied)
+        """
+        self.banks = banks
+        self._columns: Dict[str, Dict[str, List[int]]] = {name: {} for name in _COLUMNS}
+        # Sorted keys per column, built on first prefix query
+        self._sorted_keys: Dict[str, List[str]] = {}
+        # Cached derived views (e.g. filter results), keyed by the caller
+        self._views: Dict[Hashable, object] = {}
+
+        extractors = [
+            (self._columns[name], extract) for name, (extract, _) in _COLUMNS.items()
+        ]
+        for bank_id, bank in enumerate(banks):
+            for table, extract in extractors:
+                key = extract(bank)
+                if key:
+                    table.setdefault(key, []).append(bank_id)
+
+    def __len__(self) -> int:
+        return len(self.banks)
+
+    def _resolve(self, ids: Sequence[int]) -> List["BankInfo"]:
+        return [self.banks[i] for i in ids]
+
+    # ID lookups (for set algebra by callers such as bank filters)
+
+    def ids(self, column: str, value: str, prefix: bool = False) -> List[int]:
+        """
+        Return the IDs of all banks whose column equals (or starts with) value.
+
+        Args:
+            column: Indexed column name (see COLUMN_NAMES)
+            value: Value to look up
+            prefix: Match all keys starting with value instead of exact matches
+
+        Raises:
+            ValueError: If the column is not indexed
+        """
+        if column not in _COLUMNS:
+            raise ValueError(
+                f"Unknown bank column: {column}. Supported: {', '.join(COLUMN_NAMES)}"
+            )
+        table = self._columns[column]
+        normalize = _COLUMNS[column][1]
+        if not prefix:
+            key = normalize_bic(value) if column == "bic" else normalize(value)
+            # A copy, so callers cannot modify the index
+            return list(table.get(key, ()))
+
+        query = normalize(value)
+        keys = self._sorted_keys.get(column)
+        if keys is None:
+            keys = self._sorted_keys[column] = sorted(table)
+        result: List[int] = []
+        pos = bisect.bisect_left(keys, query)
+        while pos < len(keys) and keys[pos].startswith(query):
+            result.extend(table[keys[pos]])
+            pos += 1
+        return result
+
+    def all_ids(self) -> range:
+        """Return the IDs of all indexed banks."""
+        return range(len(self.banks))
+
+    def ids_by_blz(self, blz: str) -> List[int]:
+        """Return the IDs of all banks with the given BLZ."""
+        return self.ids("blz", blz)
+
+    def ids_by_bic(self, bic: str) -> List[int]:
+        """Return the IDs of all banks with the given BIC (BIC8 or BIC11)."""
+        return self.ids("bic", bic)
+
+    def ids_by_method(self, method_code: str) -> List[int]:
+        """Return the IDs of all banks using the given check-digit method."""
+        return self.ids("method", method_code)
+
+    def ids_by_region(self, region: Union[int, str]) -> List[int]:
+        """Return the IDs of all banks in a clearing area (first BLZ digit)."""
+        return self.ids("region", str(region).strip()[:1])
+
+    # Bank lookups
+
+    def get_by_blz(self, blz: str) -> Optional["BankInfo"]:
+        """Return the first bank for a BLZ, or None if the BLZ is unknown."""
+        ids = self.ids_by_blz(blz)
+        return self.banks[ids[0]] if ids else None
+
+    def find_by_blz(self, blz: str) -> List["BankInfo"]:
+        """Return all banks (main office and branches) for a BLZ."""
+        return self._resolve(self.ids_by_blz(blz))
+
+    def find_by_bic(self, bic: str) -> List["BankInfo"]:
+        """Return all banks sharing a BIC."""
+        return self._resolve(self.ids_by_bic(bic))
+
+    def find_by_method(self, method_code: str) -> List["BankInfo"]:
+        """Return all banks using the given check-digit method."""
+        return self._resolve(self.ids_by_method(method_code))
+
+    def find_by_region(self, region: Union[int, str]) -> List["BankInfo"]:
+        """Return all banks in a BLZ clearing area (1-9)."""
+        return self._resolve(self.ids_by_region(region))
+
+    def has_blz(self, blz: str) -> bool:
+        """Return True if the BLZ is present in the indexed table."""
+        return _normalize_text(blz) in self._columns["blz"]
+
+    @property
+    def method_codes(self) -> List[str]:
+        """Sorted list of all check-digit methods present in the table."""
+        return sorted(self._columns["method"])
+
+    @property
+    def regions(self) -> List[str]:
+        """Sorted list of all clearing areas present in the table."""
+        return sorted(self._columns["region"])
+
+    def cached_view(self, key: Hashable, build: Callable[[], object]) -> object:
+        """Return a derived view cached on this index, building it on first use.
+
+        The cache lives as long as the index, i.e. until the bank table changes.
+        """
+        try:
+            return self._views[key]
+        except KeyError:
+            view = self._views[key] = build()
+            return view
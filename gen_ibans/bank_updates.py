@@ -0,0 +1,213 @@
+"""
+Bank Data Update Module
+
+This module applies a new Bundesbank release to an already loaded bank table
+as a delta, using the Änderungskennzeichen (A/D/M/U) and the
+Nachfolge-Bankleitzahl of each record instead of reloading from scratch.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover - imported for type hints only
+    from .iban_generator import BankInfo
+
+
+# Änderungskennzeichen values used by the Bundesbank
+CHANGE_ADDED = "A"
+CHANGE_DELETED = "D"
+CHANGE_MODIFIED = "M"
+CHANGE_UNCHANGED = "U"
+
+# Upper bound for successor chains (guards against cycles in broken data)
+MAX_SUCCESSOR_HOPS = 32
+
+_COMPARED_FIELDS = (
+    "bankleitzahl",
+    "bic",
+    "name",
+    "method_code",
+    "merkmal",
+    "postal_code",
+    "city",
+    "deleted",
+    "successor_blz",
+)
+
+
+@dataclass(frozen=True)
+class BankDelta:
+    """Summary of the changes applied by a bank data update.
+
+    BLZ sets are reported on BLZ level: a BLZ is *added* if it had no record
+    in the table before, *deleted* if it has none afterwards, and *modified* if any
+    of its records (main office or branches) changed.
+    """
+
+    added: Tuple[str, ...] = ()
+    deleted: Tuple[str, ...] = ()
+    modified: Tuple[str, ...] = ()
+    unchanged_records: int = 0
+    successors: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def is_empty(self) -> bool:
+        """True if the update did not change the bank table."""
+        return not (self.added or self.deleted or self.modified)
+
+    def __str__(self) -> str:
+        return (
+            f"{len(self.added)} added, {len(self.deleted)} deleted, "
+            f"{len(self.modified)} modified BLZ(s); "
+            f"{self.unchanged_records} unchanged record(s)"
+        )
+
+
+def record_key(bank: "BankInfo") -> Tuple[str, ...]:
+    """Return the identity of a bank record across releases.
+
+    The Datensatznummer is stable across Bundesbank releases; files without it
+    fall back to BLZ, Merkmal and name.
+    """
+    if bank.record_number:
+        return ("record", bank.record_number)
+    return ("bank", bank.bankleitzahl, bank.merkmal or "", bank.name)
+
+
+def _same_record(old: "BankInfo", new: "BankInfo") -> bool:
+    return all(getattr(old, name) == getattr(new, name) for name in _COMPARED_FIELDS)
+
+
+def is_deleted(bank: "BankInfo") -> bool:
+    """True if a record is flagged ``D`` or has Bankleitzahllöschung set."""
+    return bank.deleted or (bank.change_flag or "").upper() == CHANGE_DELETED
+
+
+def active_banks(banks: Sequence["BankInfo"]) -> List["BankInfo"]:
+    """Return the records of a release that are not flagged as deleted.
+
+    Deleted records stay valid until the next release, so they are only
+    dropped on request (``drop_deleted`` of ``apply_bank_update``).
+    """
+    return [bank for bank in banks if not is_deleted(bank)]
+
+
+def successor_map(banks: Sequence["BankInfo"]) -> Dict[str, str]:
+    """Return BLZ -> Nachfolge-Bankleitzahl for all records that name a successor."""
+    return {
+        bank.bankleitzahl: bank.successor_blz
+        for bank in banks
+        if bank.successor_blz and bank.successor_blz != bank.bankleitzahl
+    }
+
+
+def resolve_successor(blz: str, successors: Mapping[str, str]) -> str:
+    """
+    Follow the successor chain of a BLZ to its current BLZ.
+
+    Returns the BLZ itself if it has no successor. Cycles and overly long
+    chains stop at the last BLZ reached.
+    """
+    current = blz
+    seen = {current}
+    for _ in range(MAX_SUCCESSOR_HOPS):
+        nxt = successors.get(current)
+        if not nxt or nxt in seen:
+            break
+        seen.add(nxt)
+        current = nxt
+    return current
+
+
+def apply_bank_update(
+    banks: Sequence["BankInfo"],
+    update: Sequence["BankInfo"],
+    successors: Optional[Mapping[str, str]] = None,
+    drop_deleted: bool = False,
+) -> Tuple[List["BankInfo"], BankDelta]:
+    """
+    Apply a new Bundesbank release to a loaded bank table.
+
+    The update is a complete release as published by the Bundesbank; the
+    Nachfolge-Bankleitzahl of every record is recorded. Records from the old
+    table that are missing in the release are removed. Records flagged ``D``
+    (or with Bankleitzahllöschung set) are still valid until the next
+    release and are kept unless ``drop_deleted`` is set. Unchanged records
+    keep their existing ``BankInfo`` objects.
+
+    Args:
+        banks: Current bank table
+        update: Records of the new release, in file order
+        successors: Known successor mapping to extend (not modified)
+        drop_deleted: Remove records flagged as deleted from the table
+
+    Returns:
+        Tuple of the new bank table (in release order) and the applied delta
+    """
+    current = {record_key(bank): bank for bank in banks}
+    merged: Dict[str, str] = dict(successors or {})
+
+    result: List["BankInfo"] = []
+    changed_blzs = set()
+    unchanged = 0
+    seen = set()
+
+    for record in update:
+        key = record_key(record)
+        seen.add(key)
+        old = current.get(key)
+
+        if record.successor_blz and record.successor_blz != record.bankleitzahl:
+            merged[record.bankleitzahl] = record.successor_blz
+
+        if drop_deleted and is_deleted(record):
+            if old is not None:
+                changed_blzs.add(old.bankleitzahl)
+            continue
+
+        if old is not None and _same_record(old, record):
+            # Keep the existing object; only the change flag of the release differs
+            result.append(old)
+            unchanged += 1
+            continue
+
+        result.append(record)
+        changed_blzs.add(record.bankleitzahl)
+        if old is not None:
+            changed_blzs.add(old.bankleitzahl)
+
+    # Records that disappeared from the release without a D flag
+    for key, old in current.items():
+        if key not in seen:
+            changed_blzs.add(old.bankleitzahl)
+
+    old_blzs = {bank.bankleitzahl for bank in banks}
+    new_blzs = {bank.bankleitzahl for bank in result}
+    delta = BankDelta(
+        added=tuple(sorted(new_blzs - old_blzs)),
+        deleted=tuple(sorted(old_blzs - new_blzs)),
+        modified=tuple(sorted((changed_blzs & old_blzs) & new_blzs)),
+        unchanged_records=unchanged,
+        successors=merged,
+    )
+    return result, delta
@@ -0,0 +1,116 @@
+"""
+Cache Lock Module
+
+This module provides an advisory inter-process file lock used to serialize
+refreshes of the shared download cache.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+
+class CacheLockTimeout(Exception):
+    """Raised when the cache lock cannot be acquired in time."""
+
+
+class CacheLock:
+    """Advisory inter-process lock on a lock file in the cache directory.
+
+    Uses ``fcntl.flock`` on POSIX and ``msvcrt.locking`` on Windows. Locks are
+    taken per open file, so separate instances also exclude each other within
+    one process.
+    """
+
+    def __init__(
+        self, path: Path, timeout: Optional[float] = None, poll_interval: float = 0.05
+    ):
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._file = None
+
+    def _try_lock(self) -> bool:
+        try:
+            if os.name == "nt":
+                import msvcrt
+
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """
+        Acquire the lock.
+
+        Returns:
+            True if acquired, False if non-blocking and held by someone else
+
+        Raises:
+            CacheLockTimeout: If blocking and the timeout expired
+        """
+        self._file = open(self.path, "a+b")
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while not self._try_lock():
+            if not blocking:
+                self._close()
+                return False
+            if deadline is not None and time.monotonic() >= deadline:
+                self._close()
+                raise CacheLockTimeout(f"Timed out waiting for cache lock {self.path}")
+            time.sleep(self.poll_interval)
+        return True
+
+    def release(self) -> None:
+        """Release the lock (no-op if not held)."""
+        if self._file is None:
+            return
+        try:
+            if os.name == "nt":
+                import msvcrt
+
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._close()
+
+    def _close(self) -> None:
+        self._file.close()
+        self._file = None
+
+    def __enter__(self) -> "CacheLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
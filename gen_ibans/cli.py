@@ -27,16 +27,29 @@ SOFTWARE.
 import click
 import csv
 import json
+import os
 import sys
 import time
 import xml.etree.ElementTree as ET
 from pathlib import Path
 from typing import List, Optional
 from click_option_group import optgroup
-import math
+import re
 
 from .iban_generator import IBANGenerator, IBANRecord, GeneratorConfig, LegalEntity
+from .bank_filter import BankFilter
 from .downloader import BundesbankDownloader
+from .download_stats import DownloadResult
+from .compression import COMPRESSIONS, compression_from_path
+from .partitioning import PARTITION_KEYS, PartitionWriter
+from .pipeline import (
+    DEFAULT_WRITE_BATCH_SIZE,
+    DEFAULT_WRITE_QUEUE_DEPTH,
+    BackgroundWriter,
+)
+from .progress import DEFAULT_PROGRESS_INTERVAL, ProgressReporter
+from .splitting import SplitWriter, parse_size
+from .writers import WRITERS, compile_fields, field_value, get_writer_class
 from .config_manager import (
     get_default_config_path,
     load_config_from_file,
@@ -60,38 +73,7 @@ class OutputFormatter:
 
     @staticmethod
     def _field_value(record: IBANRecord, field: str) -> str:
-        field = field.strip().lower()
-        if field == "iban":
-            return record.iban
-        elif field in ("bank_name", "bank-name", "bank"):
-            return record.bank.name
-        elif field == "bic":
-            return record.bank.bic
-        elif field in ("blz", "bank_code", "bankleitzahl", "code"):
-            return record.bank.bankleitzahl
-        elif field == "holders":
-            return "; ".join(
-                (
-                    f"{h.name} (Legal Entity, WID: {h.wid})"
-                    if isinstance(h, LegalEntity)
-                    else f"{h.full_name} (Tax-ID: {h.tax_id}{', WID: ' + h.wid if getattr(h, 'wid', None) else ''})"
-                )
-                for h in record.account_holders
-            )
-        elif field == "beneficiaries":
-            return (
-                "; ".join(
-                    (
-                        f"{b.name} (Legal Entity, WID: {b.wid})"
-                        if isinstance(b, LegalEntity)
-                        else f"{b.full_name} (Tax-ID: {b.tax_id}{', WID: ' + b.wid if getattr(b, 'wid', None) else ''})"
-                    )
-                    for b in record.beneficiaries
-                )
-                or "None"
-            )
-        else:
-            return ""
+        return field_value(record, field)
 
     @staticmethod
     def format_stdout(
@@ -585,8 +567,12 @@ class ColoredHelpCommand(click.Command):
 @click.option(
     "--format",
     "output_format",
-    type=click.Choice(["txt", "csv", "xml", "json"]),
-    help="Output format for file or stdout: txt, csv, xml, or json",
+    type=click.Choice(list(WRITERS)),
+    help=(
+        "Output format for file or stdout: txt, csv, xml, json, jsonl, "
+        "csv-relational (output directory), sqlite or parquet "
+        "(file only, parquet requires pyarrow)"
+    ),
 )
 @click.option(
     "--output",
@@ -596,6 +582,99 @@ class ColoredHelpCommand(click.Command):
 @click.option(
     "--no-echo", is_flag=True, help="Suppress output to stdout when writing to a file"
 )
+@click.option(
+    "--row-group-size",
+    type=click.IntRange(min=1),
+    help="Records per Parquet row group (default: 100000)",
+)
+@click.option(
+    "--compress",
+    type=click.Choice(list(COMPRESSIONS) + ["none"]),
+    help=(
+        "Compress the output file with gzip, xz or zstd (zstd requires zstandard); "
+        "default: chosen from the --output extension (.gz, .xz, .zst)"
+    ),
+)
+@click.option(
+    "--compress-level",
+    type=int,
+    help="Compression level (gzip/xz: 0-9, default 6; zstd: 1-22, default 3)",
+)
+@click.option(
+    "--compress-threads",
+    type=click.IntRange(min=0),
+    help="Additional zstd worker threads (default: 0 = one background thread)",
+)
+@click.option(
+    "--split-every",
+    type=click.IntRange(min=1),
+    metavar="N",
+    help="Rotate the output file every N records (parts plus a manifest JSON)",
+)
+@click.option(
+    "--split-size",
+    type=str,
+    metavar="SIZE",
+    help=(
+        "Rotate the output file once a part reaches SIZE uncompressed bytes "
+        "(e.g. 500MB, 1GiB)"
+    ),
+)
+@click.option(
+    "--partition-by",
+    type=click.Choice(list(PARTITION_KEYS)),
+    help=(
+        "Write one output file per BLZ, BIC or check-digit method "
+        "(or --partitions hash buckets) next to --output"
+    ),
+)
+@click.option(
+    "--partitions",
+    type=click.IntRange(min=1),
+    metavar="N",
+    help="Hash --partition-by keys into N files instead of one file per key",
+)
+@click.option(
+    "--max-open-partitions",
+    type=click.IntRange(min=1),
+    help="Partitions buffered and open at once; others are reopened on demand (default: 64)",
+)
+@click.option(
+    "--write-batch-size",
+    type=click.IntRange(min=1),
+    help="Records per batch handed to the background writer thread (default: 1000)",
+)
+@click.option(
+    "--write-queue-depth",
+    type=click.IntRange(min=0),
+    help=(
+        "Batches queued for the background writer thread before generation waits "
+        "(default: 8; 0 writes on the generating thread)"
+    ),
+)
+@click.option(
+    "--progress-fd",
+    type=click.IntRange(min=0),
+    metavar="FD",
+    help="Write JSON progress events (done, rate, ETA) to file descriptor FD",
+)
+@click.option(
+    "--progress-file",
+    type=click.Path(path_type=Path),
+    help="Write JSON progress events (done, rate, ETA) to this file or FIFO",
+)
+@click.option(
+    "--progress-interval",
+    type=click.FloatRange(min=0.001),
+    metavar="SECONDS",
+    help="Seconds between progress updates (default: 0.1 = 10 Hz)",
+)
+@click.option(
+    "--progress-every",
+    type=click.IntRange(min=1),
+    metavar="N",
+    help="Update progress every N records instead of by time",
+)
 @click.option(
     "--iban-only",
     is_flag=True,
@@ -606,7 +685,8 @@ class ColoredHelpCommand(click.Command):
     type=str,
     help=(
         "Comma-separated list of fields to include in output (overrides iban_only/no_*). "
-        "Supported fields: iban, bank_name, bic, blz, holders, beneficiaries"
+        "Supported fields: iban, account_number, bank_name, bic, blz, method, holders, "
+        "holder_count, beneficiaries, beneficiary_count, entity_type, birth_dates, wids"
     ),
 )
 @click.option(
@@ -648,6 +728,45 @@ class ColoredHelpCommand(click.Command):
     is_flag=True,
     help="Disable checking for newer versions online (rely only on cache age)",
 )
+@click.option(
+    "--stale-while-revalidate",
+    "stale_while_revalidate",
+    type=click.FloatRange(min=0),
+    default=0,
+    metavar="HOURS",
+    help=(
+        "Use cached data up to HOURS past its maximum age immediately and refresh it "
+        "in the background for the next run (default: 0 = always refresh first)"
+    ),
+)
+@click.option(
+    "--data-version",
+    "data_version",
+    type=str,
+    default=None,
+    metavar="DATE|HASH",
+    help=(
+        "Use a stored Bundesbank release: the one valid on DATE (YYYY-MM-DD) or the "
+        "archive with this SHA-256 (prefix) (default: current release)"
+    ),
+)
+@click.option(
+    "--mirror",
+    "mirrors",
+    multiple=True,
+    metavar="URL",
+    help=(
+        "Download from this mirror (http(s):// or file:// directory with "
+        "blz-aktuell-<format>-zip-data.zip); repeat for an ordered failover list, "
+        "use 'bundesbank' for the official site"
+    ),
+)
+@click.option(
+    "--timings",
+    "show_timings",
+    is_flag=True,
+    help="Print the cache outcome, per-phase timings and byte counts of the startup to stderr",
+)
 @optgroup.group("Filter")
 @optgroup.option(
     "--filter-bank-name",
@@ -664,6 +783,33 @@ class ColoredHelpCommand(click.Command):
     type=str,
     help="Regex to filter by BLZ/Bankleitzahl",
 )
+@optgroup.option(
+    "--filter",
+    "filter_include",
+    type=str,
+    multiple=True,
+    help=(
+        "Include banks matching FIELD:VALUE (repeatable; trailing * for prefix). "
+        "Fields: blz, bic, method, region, merkmal, plz, ort. "
+        "Same field is OR-ed, different fields are AND-ed"
+    ),
+)
+@optgroup.option(
+    "--filter-exclude",
+    type=str,
+    multiple=True,
+    help="Exclude banks matching FIELD:VALUE (repeatable; trailing * for prefix)",
+)
+@optgroup.option(
+    "--implemented-methods-only",
+    is_flag=True,
+    help="Only use banks whose check-digit method has a dedicated implementation",
+)
+@optgroup.option(
+    "--drop-deleted-banks",
+    is_flag=True,
+    help="Skip bank records flagged for deletion (Bankleitzahllöschung)",
+)
 @optgroup.group("Entity Type Configuration")
 @optgroup.option(
     "--legal-entity-probability",
@@ -745,6 +891,21 @@ def main(
     output_format: str,
     output: Path,
     no_echo: bool,
+    row_group_size: Optional[int],
+    compress: Optional[str],
+    compress_level: Optional[int],
+    compress_threads: Optional[int],
+    split_every: Optional[int],
+    split_size: Optional[str],
+    partition_by: Optional[str],
+    partitions: Optional[int],
+    max_open_partitions: Optional[int],
+    write_batch_size: Optional[int],
+    write_queue_depth: Optional[int],
+    progress_fd: Optional[int],
+    progress_file: Optional[Path],
+    progress_interval: Optional[float],
+    progress_every: Optional[int],
     iban_only: bool,
     fields: Optional[str],
     no_personal_info: bool,
@@ -755,9 +916,17 @@ def main(
     force_download: bool,
     cache_dir: Optional[Path],
     no_version_check: bool,
+    stale_while_revalidate: float,
+    data_version: Optional[str],
+    mirrors: tuple,
+    show_timings: bool,
     filter_bank_name: Optional[str],
     filter_bic: Optional[str],
     filter_blz: Optional[str],
+    filter_include: tuple,
+    filter_exclude: tuple,
+    implemented_methods_only: bool,
+    drop_deleted_banks: bool,
     legal_entity_probability: float,
     account_holder_single_prob: float,
     account_holder_two_prob: float,
@@ -773,8 +942,12 @@ def main(
     """Generate valid German IBANs using Bundesbank data.
 
     Data is always displayed on the command line by default in plain format.
-    Use --format to specify alternative output formats (txt, csv, xml, json).
+    Use --format to specify alternative output formats (txt, csv, csv-relational, xml,
+    json, jsonl, sqlite, parquet).
     Use --output to write to a file. Use --no-echo to suppress stdout when writing to files.
+    Output files ending in .gz, .xz or .zst (or --compress) are compressed while writing.
+    Use --split-every/--split-size to rotate the output across numbered part files.
+    Use --partition-by blz|bic|method to write one file per bank key (or --partitions N).
 
     If no DATA_FILE is provided, the latest data will be automatically downloaded
     from the Deutsche Bundesbank website and cached locally. The system automatically
@@ -806,11 +979,29 @@ def main(
         force_download=force_download,
         cache_dir=cache_dir,
         no_version_check=no_version_check,
+        stale_while_revalidate=stale_while_revalidate,
+        data_version=data_version,
+        mirrors=mirrors,
         seed=seed,
         count=count,
         output_format=output_format,
         output=output,
         no_echo=no_echo,
+        row_group_size=row_group_size,
+        compress=compress,
+        compress_level=compress_level,
+        compress_threads=compress_threads,
+        split_every=split_every,
+        split_size=split_size,
+        partition_by=partition_by,
+        partitions=partitions,
+        max_open_partitions=max_open_partitions,
+        write_batch_size=write_batch_size,
+        write_queue_depth=write_queue_depth,
+        progress_fd=progress_fd,
+        progress_file=progress_file,
+        progress_interval=progress_interval,
+        progress_every=progress_every,
         iban_only=iban_only,
         fields=fields,
         no_personal_info=no_personal_info,
@@ -820,11 +1011,17 @@ def main(
         filter_bank_name=filter_bank_name,
         filter_bic=filter_bic,
         filter_blz=filter_blz,
+        filter_include=filter_include,
+        filter_exclude=filter_exclude,
+        implemented_methods_only=implemented_methods_only,
+        drop_deleted_banks=drop_deleted_banks,
     )
     download_format = merged["download_format"]
     force_download = merged["force_download"]
     cache_dir = merged["cache_dir"]
     no_version_check = merged["no_version_check"]
+    stale_while_revalidate = merged["stale_while_revalidate"]
+    data_version = merged["data_version"]
     seed = merged["seed"]
     count = merged["count"]
     output_format = merged["output_format"]
@@ -839,6 +1036,12 @@ def main(
     filter_bank_name = merged.get("filter_bank_name", filter_bank_name)
     filter_bic = merged.get("filter_bic", filter_bic)
     filter_blz = merged.get("filter_blz", filter_blz)
+    filter_include = merged.get("filter_include", filter_include)
+    filter_exclude = merged.get("filter_exclude", filter_exclude)
+    implemented_methods_only = merged.get(
+        "implemented_methods_only", implemented_methods_only
+    )
+    drop_deleted_banks = merged.get("drop_deleted_banks", drop_deleted_banks)
 
     # Determine whether to enable colored output for CLI messages (stderr/info)
     enable_color = sys.stderr.isatty() and not no_color and not clean
@@ -849,7 +1052,15 @@ def main(
     # Validate arguments
     if count <= 0:
         raise click.BadParameter("Count must be a positive integer")
+    if merged.get("fields"):
+        # Resolve the field selection before any data is downloaded or loaded
+        try:
+            compile_fields(merged["fields"])
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="'--fields'") from e
 
+    startup_started = time.perf_counter()
+    download_results: Optional[List[DownloadResult]] = [] if show_timings else None
     try:
         # Determine data file to use (download if necessary)
         data_file_path = _determine_data_file_path(
@@ -858,8 +1069,12 @@ def main(
             force_download=force_download,
             cache_dir=cache_dir,
             no_version_check=no_version_check,
+            stale_while_revalidate=stale_while_revalidate,
+            data_version=data_version,
+            downloader_options=merged["downloader_options"],
             clean=clean,
             style=style,
+            results=download_results,
         )
 
         # Build configuration from CLI + config file + defaults
@@ -907,15 +1122,32 @@ def main(
             click.echo(
                 style(f"Loading bank data from: {data_file_path}", fg="cyan"), err=True
             )
-        generator = IBANGenerator(data_file_path, seed, config)
+        load_started = time.perf_counter()
+        generator = IBANGenerator(
+            data_file_path, seed, config, drop_deleted_banks=drop_deleted_banks
+        )
+        load_seconds = time.perf_counter() - load_started
 
-        # Apply optional regex filters on bank list
+        # Apply optional bank filters (indexed terms and regexes) on bank list
+        filter_started = time.perf_counter()
         _apply_bank_filters(
             generator,
             filter_bank_name=filter_bank_name,
             filter_bic=filter_bic,
             filter_blz=filter_blz,
+            filter_include=filter_include,
+            filter_exclude=filter_exclude,
+            implemented_methods_only=implemented_methods_only,
         )
+        filter_seconds = time.perf_counter() - filter_started
+
+        if show_timings:
+            _print_timings(
+                download_results[0] if download_results else None,
+                {"parse": load_seconds, "filter": filter_seconds},
+                time.perf_counter() - startup_started,
+                style,
+            )
 
         if not clean:
             click.echo(
@@ -927,390 +1159,175 @@ def main(
         # Generate IBANs
         if not clean:
             click.echo(style(f"Generating {count} IBANs...", fg="cyan"), err=True)
-        # Animated progress on stderr (TTY only) to avoid cluttering output
-        show_progress = sys.stderr.isatty() and not clean
-        # Dot-style spinner frames (braille dots)
-        spinner_frames = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
-        last_msg_len = 0
-        bar_width = 24
-        start_time = time.time()
-
-        def _fmt_eta(seconds: float) -> str:
-            if seconds is None or math.isnan(seconds) or seconds == float("inf"):
-                return "--:--"
-            seconds = max(0, int(seconds))
-            h = seconds // 3600
-            m = (seconds % 3600) // 60
-            s = seconds % 60
-            if h > 0:
-                return f"{h:02d}:{m:02d}:{s:02d}"
-            return f"{m:02d}:{s:02d}"
-
         # Determine what information to include (before generation loop)
         include_personal_info = not (no_personal_info or iban_only)
         include_bank_info = not (no_bank_info or iban_only)
         fields_list: Optional[list[str]] = merged.get("fields")
         output_to_stdout = not (no_echo and output)
 
-        # Prepare file writers if output file is specified (streaming, no full in-memory list)
-        file_handle = None
-        csv_writer = None
-        json_first = True
+        if output and not output_format:
+            raise click.BadParameter("--format is required when --output is specified")
+        writer_cls = get_writer_class(output_format)
+        if writer_cls.binary or writer_cls.directory:
+            if not output:
+                raise click.BadParameter(f"--format {output_format} requires --output")
+            output_to_stdout = False
+        split_every = merged.get("split_every")
+        split_size = merged.get("split_size")
+        if split_every or split_size:
+            if not output:
+                raise click.BadParameter("--split-every/--split-size require --output")
+            output_to_stdout = False
+        partition_by = merged.get("partition_by")
+        if merged.get("partitions") and not partition_by:
+            raise click.BadParameter("--partitions requires --partition-by")
+        if partition_by:
+            if not output:
+                raise click.BadParameter("--partition-by requires --output")
+            if split_every or split_size:
+                raise click.BadParameter(
+                    "--partition-by cannot be combined with --split-every/--split-size"
+                )
+            output_to_stdout = False
+        writer_options = {
+            key: value
+            for key, value in merged.get("writer_options", {}).items()
+            if key in writer_cls.options
+        }
+        # Compression: explicit --compress wins over the output file extension
+        compression = merged.get("compress")
+        if compression is None and not writer_cls.directory:
+            compression = compression_from_path(output)
+        if compression == "none" or not output:
+            compression = None
+        if compression:
+            if writer_cls.binary:
+                raise click.BadParameter(
+                    f"--compress is not supported for --format {output_format}"
+                )
+            writer_options["compression"] = compression
+            writer_options["compress_level"] = merged.get("compress_level")
+            writer_options["compress_threads"] = merged.get("compress_threads") or 0
+
+        # Every record is serialized once and fanned out to all active sinks
+        if partition_by:
+            partition_options = {}
+            if merged.get("max_open_partitions"):
+                partition_options["max_open"] = merged["max_open_partitions"]
+            writer = PartitionWriter(
+                writer_cls,
+                output,
+                by=partition_by,
+                partitions=merged.get("partitions"),
+                fields=fields_list,
+                include_personal_info=include_personal_info,
+                include_bank_info=include_bank_info,
+                **partition_options,
+                **writer_options,
+            )
+        elif split_every or split_size:
+            writer = SplitWriter(
+                writer_cls,
+                output,
+                max_records=split_every,
+                max_bytes=parse_size(split_size) if split_size else None,
+                fields=fields_list,
+                include_personal_info=include_personal_info,
+                include_bank_info=include_bank_info,
+                **writer_options,
+            )
+        else:
+            writer = writer_cls.create(
+                output,
+                echo=sys.stdout if output_to_stdout else None,
+                fields=fields_list,
+                include_personal_info=include_personal_info,
+                include_bank_info=include_bank_info,
+                **writer_options,
+            )
+        # Serialization and I/O run on a background thread fed with record
+        # batches over a bounded queue, overlapping with generation
+        write_queue_depth = merged.get("write_queue_depth")
+        if write_queue_depth is None:
+            write_queue_depth = DEFAULT_WRITE_QUEUE_DEPTH
+        if write_queue_depth > 0:
+            pipeline = BackgroundWriter(
+                writer,
+                batch_size=merged.get("write_batch_size") or DEFAULT_WRITE_BATCH_SIZE,
+                queue_depth=write_queue_depth,
+            )
+        else:
+            pipeline = writer
+        # Animated progress bar on stderr (TTY only) and/or JSON progress events,
+        # both throttled to --progress-interval or --progress-every
+        progress_fd = merged.get("progress_fd")
+        progress_file = merged.get("progress_file")
+        if progress_fd is not None:
+            progress_events = os.fdopen(
+                progress_fd, "w", encoding="utf-8", closefd=False
+            )
+        elif progress_file is not None:
+            progress_events = open(progress_file, "w", encoding="utf-8")
+        else:
+            progress_events = None
         try:
-            if output:
-                if not output_format:
-                    raise click.BadParameter(
-                        "--format is required when --output is specified"
-                    )
-                out_path = str(output)
-                if output_format == "txt":
-                    file_handle = open(out_path, "w", encoding="utf-8")
-                elif output_format == "csv":
-                    file_handle = open(out_path, "w", newline="", encoding="utf-8")
-                    csv_writer = csv.writer(file_handle)
-                    if fields_list:
-                        csv_writer.writerow([fld for fld in fields_list])
-                    else:
-                        csv_writer.writerow(
-                            [
-                                "IBAN",
-                                "Account Holders",
-                                "Beneficial Owners",
-                                "Bank Name",
-                                "BIC",
-                                "Bank Code",
-                            ]
-                        )
-                elif output_format == "json":
-                    file_handle = open(out_path, "w", encoding="utf-8")
-                    file_handle.write("[")
-                    json_first = True
-                elif output_format == "xml":
-                    file_handle = open(out_path, "w", encoding="utf-8")
-                    file_handle.write(
-                        '<?xml version="1.0" encoding="UTF-8"?>\n<accounts>\n'
-                    )
-                else:
-                    raise click.BadParameter(f"Unsupported format: {output_format}")
-
-            # Generation loop with streaming output
-            for i in range(count):
-                record = generator.generate_iban()
-
-                # STDOUT streaming (if enabled)
-                if output_to_stdout:
-                    if output_format is None or output_format == "txt":
-                        # Plain or TXT-like line output
-                        if fields_list:
-                            values = [
-                                OutputFormatter._field_value(record, f)
-                                for f in fields_list
-                            ]
-                            print(" | ".join(v for v in values if v is not None))
-                        else:
-                            holders_display = "; ".join(
-                                _format_person_inline(h) for h in record.account_holders
-                            )
-                            beneficiaries_strs = [
-                                _format_person_inline(b) for b in record.beneficiaries
-                            ]
-                            beneficiaries_display = (
-                                "; ".join(beneficiaries_strs)
-                                if beneficiaries_strs
-                                else "None"
-                            )
-                            if include_personal_info and include_bank_info:
-                                print(
-                                    f"{record.iban} | Holders: {holders_display} | Beneficiaries: {beneficiaries_display} | {record.bank.name} | {record.bank.bic} | {record.bank.bankleitzahl}"
-                                )
-                            elif include_personal_info:
-                                print(
-                                    f"{record.iban} | Holders: {holders_display} | Beneficiaries: {beneficiaries_display}"
-                                )
-                            elif include_bank_info:
-                                print(
-                                    f"{record.iban} | {record.bank.name} | {record.bank.bic} | {record.bank.bankleitzahl}"
-                                )
-                            else:
-                                print(record.iban)
-                    elif output_format == "csv":
-                        if fields_list:
-                            if i == 0:
-                                # print header
-                                print(",".join(fields_list))
-                            values = [
-                                OutputFormatter._field_value(record, f)
-                                for f in fields_list
-                            ]
-                            print(
-                                ",".join(
-                                    '"' + v.replace('"', '""') + '"' for v in values
-                                )
-                            )
-                        else:
-                            if i == 0:
-                                print(
-                                    "IBAN,Account Holders,Beneficial Owners,Bank Name,BIC,Bank Code"
-                                )
-                            holders_csv = "; ".join(
-                                _format_person_inline(h) for h in record.account_holders
-                            )
-                            beneficiaries_strs = [
-                                _format_person_inline(b) for b in record.beneficiaries
-                            ]
-                            beneficiaries_csv = (
-                                "; ".join(beneficiaries_strs)
-                                if beneficiaries_strs
-                                else "None"
-                            )
-                            print(
-                                f'"{record.iban}","{holders_csv}","{beneficiaries_csv}","{record.bank.name}","{record.bank.bic}","{record.bank.bankleitzahl}"'
-                            )
-                    elif output_format == "json":
-                        # Stream ND-JSON to stdout as regular JSON array chunks
-                        entry_obj = None
-                        if fields_list:
-                            entry_obj = {
-                                f: OutputFormatter._field_value(record, f)
-                                for f in fields_list
-                            }
-                        else:
-                            entry_obj = {
-                                "iban": record.iban,
-                                "account_holders": [
-                                    _person_to_dict(h) for h in record.account_holders
-                                ],
-                                "beneficiaries": [
-                                    _person_to_dict(b) for b in record.beneficiaries
-                                ],
-                                "bank": {
-                                    "name": record.bank.name,
-                                    "bic": record.bank.bic,
-                                    "code": record.bank.bankleitzahl,
-                                },
-                            }
-                        # For stdout we can print the object per line (JSONL) to avoid buffering
-                        print(json.dumps(entry_obj, ensure_ascii=False))
-                    elif output_format == "xml":
-                        # For stdout, print a minimal XML per record (not a full valid XML doc), to avoid buffering
-                        # Users requesting XML to stdout should redirect to file; we keep memory low here
-                        iban_elem = ET.Element("account")
-                        if fields_list:
-                            for f in fields_list:
-                                ET.SubElement(
-                                    iban_elem, f
-                                ).text = OutputFormatter._field_value(record, f)
-                        else:
-                            ET.SubElement(iban_elem, "iban").text = record.iban
-                            holders_elem = ET.SubElement(iban_elem, "account_holders")
-                            for holder in record.account_holders:
-                                _add_person_xml(holders_elem, "holder", holder)
-                            beneficiaries_elem = ET.SubElement(
-                                iban_elem, "beneficiaries"
-                            )
-                            for beneficiary in record.beneficiaries:
-                                _add_person_xml(
-                                    beneficiaries_elem, "beneficiary", beneficiary
-                                )
-                            bank_elem = ET.SubElement(iban_elem, "bank")
-                            ET.SubElement(bank_elem, "name").text = record.bank.name
-                            ET.SubElement(bank_elem, "bic").text = record.bank.bic
-                            ET.SubElement(
-                                bank_elem, "code"
-                            ).text = record.bank.bankleitzahl
-                        print(ET.tostring(iban_elem, encoding="unicode"))
-
-                # FILE streaming (if enabled)
-                if file_handle is not None:
-                    if output_format == "txt":
-                        if fields_list:
-                            values = [
-                                OutputFormatter._field_value(record, f)
-                                for f in fields_list
-                            ]
-                            file_handle.write(" | ".join(values) + "\n")
-                        else:
-                            holders_display = "; ".join(
-                                _format_person_inline(h) for h in record.account_holders
-                            )
-                            beneficiaries_strs = [
-                                _format_person_inline(b) for b in record.beneficiaries
-                            ]
-                            beneficiaries_display = (
-                                "; ".join(beneficiaries_strs)
-                                if beneficiaries_strs
-                                else "None"
-                            )
-                            if include_personal_info and include_bank_info:
-                                file_handle.write(
-                                    f"{record.iban} | Holders: {holders_display} | Beneficiaries: {beneficiaries_display} | {record.bank.name} | {record.bank.bic} | {record.bank.bankleitzahl}\n"
-                                )
-                            elif include_personal_info:
-                                file_handle.write(
-                                    f"{record.iban} | Holders: {holders_display} | Beneficiaries: {beneficiaries_display}\n"
-                                )
-                            elif include_bank_info:
-                                file_handle.write(
-                                    f"{record.iban} | {record.bank.name} | {record.bank.bic} | {record.bank.bankleitzahl}\n"
-                                )
-                            else:
-                                file_handle.write(f"{record.iban}\n")
-                    elif output_format == "csv":
-                        if fields_list:
-                            csv_writer.writerow(
-                                [
-                                    OutputFormatter._field_value(record, f)
-                                    for f in fields_list
-                                ]
-                            )
-                        else:
-                            holders_csv = "; ".join(
-                                _format_person_inline(h) for h in record.account_holders
-                            )
-                            beneficiaries_strs = [
-                                _format_person_inline(b) for b in record.beneficiaries
-                            ]
-                            beneficiaries_csv = (
-                                "; ".join(beneficiaries_strs)
-                                if beneficiaries_strs
-                                else "None"
-                            )
-                            csv_writer.writerow(
-                                [
-                                    record.iban,
-                                    holders_csv,
-                                    beneficiaries_csv,
-                                    record.bank.name,
-                                    record.bank.bic,
-                                    record.bank.bankleitzahl,
-                                ]
-                            )
-                    elif output_format == "json":
-                        entry_obj = None
-                        if fields_list:
-                            entry_obj = {
-                                f: OutputFormatter._field_value(record, f)
-                                for f in fields_list
-                            }
-                        else:
-                            entry_obj = {
-                                "iban": record.iban,
-                                "account_holders": [
-                                    _person_to_dict(h) for h in record.account_holders
-                                ],
-                                "beneficiaries": [
-                                    _person_to_dict(b) for b in record.beneficiaries
-                                ],
-                                "bank": {
-                                    "name": record.bank.name,
-                                    "bic": record.bank.bic,
-                                    "code": record.bank.bankleitzahl,
-                                },
-                            }
-                        if not json_first:
-                            file_handle.write(",\n")
-                        else:
-                            file_handle.write("\n")
-                            json_first = False
-                        file_handle.write(
-                            json.dumps(entry_obj, ensure_ascii=False, indent=None)
-                        )
-                    elif output_format == "xml":
-                        # Build per-record XML element and write it out
-                        iban_elem = ET.Element("account")
-                        if fields_list:
-                            for f in fields_list:
-                                ET.SubElement(
-                                    iban_elem, f
-                                ).text = OutputFormatter._field_value(record, f)
-                        else:
-                            ET.SubElement(iban_elem, "iban").text = record.iban
-                            holders_elem = ET.SubElement(iban_elem, "account_holders")
-                            for holder in record.account_holders:
-                                _add_person_xml(holders_elem, "holder", holder)
-                            beneficiaries_elem = ET.SubElement(
-                                iban_elem, "beneficiaries"
-                            )
-                            for beneficiary in record.beneficiaries:
-                                _add_person_xml(
-                                    beneficiaries_elem, "beneficiary", beneficiary
-                                )
-                            bank_elem = ET.SubElement(iban_elem, "bank")
-                            ET.SubElement(bank_elem, "name").text = record.bank.name
-                            ET.SubElement(bank_elem, "bic").text = record.bank.bic
-                            ET.SubElement(
-                                bank_elem, "code"
-                            ).text = record.bank.bankleitzahl
-                        # Pretty printing per record is expensive; write compact to save time/memory
-                        file_handle.write(
-                            "  " + ET.tostring(iban_elem, encoding="unicode") + "\n"
-                        )
-
-                # Update progress after processing (so write timing is included)
-                if show_progress:
-                    done = i + 1
-                    MIN_ELAPSED_TIME = 1e-6
-                    elapsed = max(MIN_ELAPSED_TIME, time.time() - start_time)
-                    rate = done / elapsed
-                    remaining = (count - done) / rate if rate > 0 else None
-                    percent = int(done * 100 / count)
-                    filled = int(bar_width * done / count)
-                    bar = "#" * filled + "-" * (bar_width - filled)
-                    frame = spinner_frames[i % len(spinner_frames)]
-                    msg = f"{frame} [{bar}] {percent:3d}% {done}/{count} ETA: {_fmt_eta(remaining)}"
-                    sys.stderr.write("\r" + msg)
-                    if len(msg) < last_msg_len:
-                        sys.stderr.write(" " * (last_msg_len - len(msg)))
-                    sys.stderr.flush()
-                    last_msg_len = len(msg)
-
-            if show_progress:
-                sys.stderr.write("\r" + " " * last_msg_len + "\r")
-                sys.stderr.flush()
-
-            # Finalize file outputs
-            if file_handle is not None:
-                if output_format == "json":
-                    if not json_first:
-                        file_handle.write("\n")
-                    file_handle.write("]")
-                elif output_format == "xml":
-                    file_handle.write("</accounts>\n")
-                file_handle.close()
-                if not clean:
-                    if output_format == "csv":
-                        click.echo(
-                            style(f"IBANs written to CSV: {out_path}", fg="green"),
-                            err=True,
-                        )
-                    elif output_format == "xml":
-                        click.echo(
-                            style(f"IBANs written to XML: {out_path}", fg="green"),
-                            err=True,
-                        )
-                    elif output_format == "json":
-                        click.echo(
-                            style(f"IBANs written to JSON: {out_path}", fg="green"),
-                            err=True,
-                        )
-                    else:
-                        click.echo(
-                            style(f"IBANs written to: {out_path}", fg="green"), err=True
-                        )
-
-            if not clean:
+            progress = ProgressReporter(
+                count,
+                bar=sys.stderr if sys.stderr.isatty() and not clean else None,
+                events=progress_events,
+                interval=merged.get("progress_interval") or DEFAULT_PROGRESS_INTERVAL,
+                every=merged.get("progress_every"),
+            )
+            update_progress = progress.update if progress.enabled else None
+            try:
+                pipeline.open()
+                # Generation loop with streaming output
+                for i in range(count):
+                    pipeline.write(generator.generate_iban())
+                    if update_progress is not None:
+                        update_progress(i + 1)
+
+                # Write footers and flush all sinks
+                pipeline.close()
+                progress.finish(count)
+            finally:
+                pipeline.abort()
+        finally:
+            if progress_events is not None:
+                progress_events.close()
+
+        if output and not clean:
+            label = f" {writer.label}" if writer.label else ""
+            if compression:
+                label += f" ({compression})"
+            if isinstance(writer, PartitionWriter):
                 click.echo(
                     style(
-                        f"Successfully generated {count} IBANs", fg="green", bold=True
+                        f"IBANs written to{label}: {len(writer.paths)} partition "
+                        f"files by {partition_by} in {output.parent}",
+                        fg="green",
                     ),
                     err=True,
                 )
-        finally:
-            try:
-                if file_handle and not file_handle.closed:
-                    file_handle.close()
-            except Exception:
-                pass
+            elif isinstance(writer, SplitWriter):
+                click.echo(
+                    style(
+                        f"IBANs written to{label}: {len(writer.parts)} parts, "
+                        f"manifest: {writer.manifest_path}",
+                        fg="green",
+                    ),
+                    err=True,
+                )
+            else:
+                click.echo(
+                    style(f"IBANs written to{label}: {output}", fg="green"), err=True
+                )
+
+        if not clean:
+            click.echo(
+                style(f"Successfully generated {count} IBANs", fg="green", bold=True),
+                err=True,
+            )
 
     except Exception as e:
         raise click.ClickException(f"Error: {e}")
@@ -1423,11 +1440,41 @@ def _merge_defaults(
     filter_bank_name: Optional[str],
     filter_bic: Optional[str],
     filter_blz: Optional[str],
+    filter_include: tuple = (),
+    filter_exclude: tuple = (),
+    implemented_methods_only: bool = False,
+    drop_deleted_banks: bool = False,
+    stale_while_revalidate: float = 0,
+    data_version: Optional[str] = None,
+    mirrors: tuple = (),
+    row_group_size: Optional[int] = None,
+    compress: Optional[str] = None,
+    compress_level: Optional[int] = None,
+    compress_threads: Optional[int] = None,
+    split_every: Optional[int] = None,
+    split_size: Optional[str] = None,
+    partition_by: Optional[str] = None,
+    partitions: Optional[int] = None,
+    max_open_partitions: Optional[int] = None,
+    write_batch_size: Optional[int] = None,
+    write_queue_depth: Optional[int] = None,
+    progress_fd: Optional[int] = None,
+    progress_file: Optional[Path] = None,
+    progress_interval: Optional[float] = None,
+    progress_every: Optional[int] = None,
 ):
     """Merge additional defaults from config file (CLI and downloader) if not provided on CLI.
 
     Returns a dict with possibly updated values.
     """
+    # Keyword arguments for BundesbankDownloader (config only, except mirrors)
+    downloader_options: dict = {}
+    if mirrors:
+        downloader_options["mirrors"] = list(mirrors)
+    # Format-specific keyword arguments for the record writer
+    writer_options: dict = {}
+    if row_group_size is not None:
+        writer_options["row_group_size"] = row_group_size
     try:
         provided_params = {
             param
@@ -1457,6 +1504,31 @@ def _merge_defaults(
             dl_cfg.get("no_version_check"), bool
         ):
             no_version_check = dl_cfg["no_version_check"]
+        if "stale_while_revalidate" not in provided_params and isinstance(
+            dl_cfg.get("stale_while_revalidate_hours"), (int, float)
+        ):
+            stale_while_revalidate = max(
+                0.0, float(dl_cfg["stale_while_revalidate_hours"])
+            )
+        if "data_version" not in provided_params and dl_cfg.get("data_version"):
+            data_version = str(dl_cfg["data_version"])
+        # Retention of stored releases
+        if isinstance(dl_cfg.get("max_snapshots"), int):
+            downloader_options["max_snapshots"] = max(1, dl_cfg["max_snapshots"])
+        if isinstance(dl_cfg.get("max_snapshot_size_mb"), (int, float)):
+            downloader_options["max_snapshot_bytes"] = int(
+                dl_cfg["max_snapshot_size_mb"] * 1024 * 1024
+            )
+        # Sources and per-request timeouts
+        if "mirrors" not in provided_params and isinstance(dl_cfg.get("mirrors"), list):
+            downloader_options["mirrors"] = [str(m) for m in dl_cfg["mirrors"]]
+        for key, option in (
+            ("timeout_seconds", "timeout"),
+            ("index_timeout_seconds", "index_timeout"),
+            ("hedge_delay_seconds", "hedge_delay"),
+        ):
+            if isinstance(dl_cfg.get(key), (int, float)) and dl_cfg[key] > 0:
+                downloader_options[option] = float(dl_cfg[key])
         # CLI-related defaults
         if "seed" not in provided_params and cli_cfg.get("seed") is not None:
             try:
@@ -1526,6 +1598,79 @@ def _merge_defaults(
                 filter_blz = fblz if fblz.strip() != "" else None  # type: ignore
             except Exception:
                 pass
+        if "filter_include" not in provided_params and isinstance(
+            cli_cfg.get("filter"), (list, tuple)
+        ):
+            filter_include = tuple(str(t) for t in cli_cfg["filter"] if str(t).strip())
+        if "filter_exclude" not in provided_params and isinstance(
+            cli_cfg.get("filter_exclude"), (list, tuple)
+        ):
+            filter_exclude = tuple(
+                str(t) for t in cli_cfg["filter_exclude"] if str(t).strip()
+            )
+        if "implemented_methods_only" not in provided_params and isinstance(
+            cli_cfg.get("implemented_methods_only"), bool
+        ):
+            implemented_methods_only = cli_cfg["implemented_methods_only"]
+        if "drop_deleted_banks" not in provided_params and isinstance(
+            cli_cfg.get("drop_deleted_banks"), bool
+        ):
+            drop_deleted_banks = cli_cfg["drop_deleted_banks"]
+        if "row_group_size" not in provided_params and isinstance(
+            cli_cfg.get("parquet_row_group_size"), int
+        ):
+            writer_options["row_group_size"] = max(1, cli_cfg["parquet_row_group_size"])
+        if (
+            "compress" not in provided_params
+            and isinstance(cli_cfg.get("compress"), str)
+            and cli_cfg["compress"].strip()
+        ):
+            compress = cli_cfg["compress"].strip().lower()
+        if "compress_level" not in provided_params and isinstance(
+            cli_cfg.get("compress_level"), int
+        ):
+            compress_level = cli_cfg["compress_level"]
+        if "compress_threads" not in provided_params and isinstance(
+            cli_cfg.get("compress_threads"), int
+        ):
+            compress_threads = max(0, cli_cfg["compress_threads"])
+        if "split_every" not in provided_params and isinstance(
+            cli_cfg.get("split_every"), int
+        ):
+            split_every = cli_cfg["split_every"] if cli_cfg["split_every"] > 0 else None
+        if "split_size" not in provided_params and isinstance(
+            cli_cfg.get("split_size"), (str, int)
+        ):
+            split_size = str(cli_cfg["split_size"]).strip() or None
+        if "partition_by" not in provided_params and isinstance(
+            cli_cfg.get("partition_by"), str
+        ):
+            partition_by = cli_cfg["partition_by"].strip().lower() or None
+        if "partitions" not in provided_params and isinstance(
+            cli_cfg.get("partitions"), int
+        ):
+            partitions = cli_cfg["partitions"] if cli_cfg["partitions"] > 0 else None
+        if "max_open_partitions" not in provided_params and isinstance(
+            cli_cfg.get("max_open_partitions"), int
+        ):
+            max_open_partitions = max(1, cli_cfg["max_open_partitions"])
+        if "write_batch_size" not in provided_params and isinstance(
+            cli_cfg.get("write_batch_size"), int
+        ):
+            write_batch_size = max(1, cli_cfg["write_batch_size"])
+        if "write_queue_depth" not in provided_params and isinstance(
+            cli_cfg.get("write_queue_depth"), int
+        ):
+            write_queue_depth = max(0, cli_cfg["write_queue_depth"])
+        if "progress_interval" not in provided_params and isinstance(
+            cli_cfg.get("progress_interval"), (int, float)
+        ):
+            if cli_cfg["progress_interval"] > 0:
+                progress_interval = float(cli_cfg["progress_interval"])
+        if "progress_every" not in provided_params and isinstance(
+            cli_cfg.get("progress_every"), int
+        ):
+            progress_every = cli_cfg["progress_every"] or None
     except Exception:
         # Ignore config merge failures for non-generator settings
         pass
@@ -1545,6 +1690,9 @@ def _merge_defaults(
         "force_download": force_download,
         "cache_dir": cache_dir,
         "no_version_check": no_version_check,
+        "stale_while_revalidate": stale_while_revalidate,
+        "data_version": data_version,
+        "downloader_options": downloader_options,
         "seed": seed,
         "count": count,
         "output_format": output_format,
@@ -1558,7 +1706,26 @@ def _merge_defaults(
         "filter_bank_name": filter_bank_name,
         "filter_bic": filter_bic,
         "filter_blz": filter_blz,
+        "filter_include": tuple(filter_include or ()),
+        "filter_exclude": tuple(filter_exclude or ()),
+        "implemented_methods_only": bool(implemented_methods_only),
+        "drop_deleted_banks": bool(drop_deleted_banks),
         "fields": normalized_fields,
+        "writer_options": writer_options,
+        "compress": compress,
+        "compress_level": compress_level,
+        "compress_threads": compress_threads,
+        "split_every": split_every,
+        "split_size": split_size,
+        "partition_by": partition_by,
+        "partitions": partitions,
+        "max_open_partitions": max_open_partitions,
+        "write_batch_size": write_batch_size,
+        "write_queue_depth": write_queue_depth,
+        "progress_fd": progress_fd,
+        "progress_file": progress_file,
+        "progress_interval": progress_interval,
+        "progress_every": progress_every,
     }
 
 
@@ -1571,8 +1738,15 @@ def _determine_data_file_path(
     no_version_check: bool,
     clean: bool,
     style,
+    stale_while_revalidate: float = 0,
+    data_version: Optional[str] = None,
+    downloader_options: Optional[dict] = None,
+    results: Optional[List[DownloadResult]] = None,
 ) -> str:
-    """Determine the data file path, downloading if necessary."""
+    """Determine the data file path, downloading if necessary.
+
+    If results is a list, the DownloadResult of the download is appended to it.
+    """
     if data_file is None:
         if not clean:
             click.echo(
@@ -1583,14 +1757,21 @@ def _determine_data_file_path(
                 err=True,
             )
         downloader = BundesbankDownloader(
-            cache_dir=str(cache_dir) if cache_dir else None
+            cache_dir=str(cache_dir) if cache_dir else None,
+            **(downloader_options or {}),
         )
         try:
             data_file_path = downloader.get_data_file(
                 format_type=download_format,
                 force_download=force_download,
                 check_version=not no_version_check,
+                stale_while_revalidate_hours=stale_while_revalidate,
+                # The CLI exits right after generating; let the refresh outlive it
+                background="process",
+                version=data_version,
             )
+            if results is not None and downloader.last_result is not None:
+                results.append(downloader.last_result)
             if not clean:
                 click.echo(
                     style(f"Downloaded data cached at: {data_file_path}", fg="cyan"),
@@ -1598,42 +1779,77 @@ def _determine_data_file_path(
                 )
         except Exception as e:
             raise click.ClickException(f"Failed to download Bundesbank data: {e}")
+        finally:
+            downloader.close()
     else:
         data_file_path = str(data_file)
     return data_file_path
 
 
+def _print_timings(
+    result: Optional[DownloadResult], phases: dict, total_seconds: float, style
+) -> None:
+    """Print the download outcome and per-phase timings to stderr."""
+    lines = []
+
+    def row(label: str, value: str) -> None:
+        lines.append(f"  {label:<16} {value:>14}")
+
+    if result is not None:
+        outcome = result.outcome or "unknown"
+        source = f" from {result.source}" if result.source else ""
+        lines.append(f"Bank data ({result.format}): {outcome}{source}")
+        for name, seconds in result.timings.items():
+            row(name, f"{seconds * 1000:.1f} ms")
+        for name, count in result.bytes.items():
+            row(f"{name} bytes", f"{count:,}")
+        row("download total", f"{result.total_seconds * 1000:.1f} ms")
+    else:
+        lines.append("Bank data: local file")
+    for name, seconds in phases.items():
+        row(name, f"{seconds * 1000:.1f} ms")
+    row("startup", f"{total_seconds * 1000:.1f} ms")
+    click.echo(style("Timings:", fg="blue", bold=True), err=True)
+    for line in lines:
+        click.echo(line, err=True)
+
+
 def _apply_bank_filters(
     generator: IBANGenerator,
     *,
     filter_bank_name: Optional[str],
     filter_bic: Optional[str],
     filter_blz: Optional[str],
+    filter_include: tuple = (),
+    filter_exclude: tuple = (),
+    implemented_methods_only: bool = False,
 ) -> None:
-    """Apply optional regex filters to the generator's bank list."""
+    """Apply optional bank filters to the generator's bank list.
+
+    Indexed include/exclude terms are resolved via the generator's index over
+    the full bank table; the regex filters then only scan the remaining
+    candidates. Results are cached on that index per filter expression.
+    """
     try:
-        import re as _re
-
-        filtered_banks = generator.banks
-        if filter_bank_name:
-            pat_name = _re.compile(filter_bank_name, _re.IGNORECASE)
-            filtered_banks = [
-                b for b in filtered_banks if pat_name.search(b.name or "")
-            ]
-        if filter_bic:
-            pat_bic = _re.compile(filter_bic, _re.IGNORECASE)
-            filtered_banks = [b for b in filtered_banks if pat_bic.search(b.bic or "")]
-        if filter_blz:
-            pat_blz = _re.compile(filter_blz)
-            filtered_banks = [
-                b for b in filtered_banks if pat_blz.search(b.bankleitzahl or "")
-            ]
-        if filter_bank_name or filter_bic or filter_blz:
-            generator.banks = filtered_banks
-            if not generator.banks:
-                raise click.ClickException("No banks match the provided filter(s).")
-    except Exception as e:
-        raise click.ClickException(f"Invalid filter regex provided: {e}")
+        bank_filter = BankFilter.from_options(
+            include=filter_include,
+            exclude=filter_exclude,
+            implemented_methods_only=implemented_methods_only,
+            name_regex=filter_bank_name,
+            bic_regex=filter_bic,
+            blz_regex=filter_blz,
+        )
+    except ValueError as e:
+        raise click.ClickException(f"Invalid bank filter: {e}") from e
+    if bank_filter.is_empty:
+        return
+    try:
+        filtered_banks = generator.select_banks(bank_filter)
+    except re.error as e:
+        raise click.ClickException(f"Invalid filter regex provided: {e}") from e
+    if not filtered_banks:
+        raise click.ClickException("No banks match the provided filter(s).")
+    generator.banks = filtered_banks
 
 
 def _get_provided_params(ctx: click.Context) -> set:
@@ -1834,191 +2050,5 @@ def _build_generator_config(
     return config
 
 
-def _format_person_inline(person) -> str:
-    # Helper for txt/csv human-readable inline formatting
-    if isinstance(person, LegalEntity):
-        return f"{person.name} (Legal Entity, WID: {person.wid}), Address: {person.full_address}"
-    else:
-        ids_str = f"Tax-ID: {person.tax_id}"
-        if getattr(person, "wid", None):
-            ids_str += f", WID: {person.wid}"
-        return f"{person.full_name} ({ids_str})"
-
-
-def _person_to_dict(person) -> dict:
-    # Helper for JSON formatting
-    if isinstance(person, LegalEntity):
-        return {
-            "type": "legal_entity",
-            "name": person.name,
-            "wid": person.wid,
-            "street_address": person.street_address,
-            "city": person.city,
-            "postal_code": person.postal_code,
-        }
-    else:
-        d = {
-            "type": "natural_person",
-            "first_name": person.first_name,
-            "last_name": person.last_name,
-            "birth_date": str(person.birth_date),
-            "tax_id": person.tax_id,
-            "street_address": person.street_address,
-            "city": person.city,
-            "postal_code": person.postal_code,
-        }
-        if getattr(person, "wid", None):
-            d["wid"] = person.wid
-        return d
-
-
-def _add_person_xml(parent: ET.Element, tag: str, person) -> None:
-    # Helper for XML formatting
-    elem = ET.SubElement(parent, tag)
-    if isinstance(person, LegalEntity):
-        ET.SubElement(elem, "type").text = "legal_entity"
-        ET.SubElement(elem, "name").text = person.name
-        ET.SubElement(elem, "wid").text = person.wid
-        ET.SubElement(elem, "street_address").text = person.street_address
-        ET.SubElement(elem, "city").text = person.city
-        ET.SubElement(elem, "postal_code").text = person.postal_code
-    else:
-        ET.SubElement(elem, "type").text = "natural_person"
-        ET.SubElement(elem, "first_name").text = person.first_name
-        ET.SubElement(elem, "last_name").text = person.last_name
-        ET.SubElement(elem, "birth_date").text = str(person.birth_date)
-        ET.SubElement(elem, "tax_id").text = person.tax_id
-        if getattr(person, "wid", None):
-            ET.SubElement(elem, "wid").text = person.wid
-        ET.SubElement(elem, "street_address").text = person.street_address
-        ET.SubElement(elem, "city").text = person.city
-        ET.SubElement(elem, "postal_code").text = person.postal_code
-
-
-def _output_results_stdout(
-    ibans: List[IBANRecord],
-    *,
-    output_format: Optional[str],
-    include_bank_info: bool,
-    include_personal_info: bool,
-    fields: Optional[list[str]] = None,
-) -> None:
-    """Handle stdout output across supported formats (txt, csv, xml, json, or plain)."""
-    formatter = OutputFormatter()
-    if output_format is None:
-        formatter.format_stdout(ibans, include_bank_info, include_personal_info, fields)
-        return
-
-    if output_format == "txt":
-        for record in ibans:
-            if fields:
-                values = [OutputFormatter._field_value(record, f) for f in fields]
-                print(" | ".join(values))
-                continue
-            holders_display = "; ".join(
-                _format_person_inline(h) for h in record.account_holders
-            )
-            beneficiaries_strs = [
-                _format_person_inline(b) for b in record.beneficiaries
-            ]
-            beneficiaries_display = (
-                "; ".join(beneficiaries_strs) if beneficiaries_strs else "None"
-            )
-
-            if include_personal_info and include_bank_info:
-                print(
-                    f"{record.iban} | Holders: {holders_display} | Beneficiaries: {beneficiaries_display} | {record.bank.name} | {record.bank.bic} | {record.bank.bankleitzahl}"
-                )
-            elif include_personal_info:
-                print(
-                    f"{record.iban} | Holders: {holders_display} | Beneficiaries: {beneficiaries_display}"
-                )
-            elif include_bank_info:
-                print(
-                    f"{record.iban} | {record.bank.name} | {record.bank.bic} | {record.bank.bankleitzahl}"
-                )
-            else:
-                print(record.iban)
-    elif output_format == "csv":
-        if fields:
-            print(",".join(fields))
-            for record in ibans:
-                values = [OutputFormatter._field_value(record, f) for f in fields]
-                # naive CSV quoting
-                print(",".join('"' + v.replace('"', '""') + '"' for v in values))
-        else:
-            print("IBAN,Account Holders,Beneficial Owners,Bank Name,BIC,Bank Code")
-            for record in ibans:
-                holders_csv = "; ".join(
-                    _format_person_inline(h) for h in record.account_holders
-                )
-                beneficiaries_strs = [
-                    _format_person_inline(b) for b in record.beneficiaries
-                ]
-                beneficiaries_csv = (
-                    "; ".join(beneficiaries_strs) if beneficiaries_strs else "None"
-                )
-
-                print(
-                    f'"{record.iban}","{holders_csv}","{beneficiaries_csv}","{record.bank.name}","{record.bank.bic}","{record.bank.bankleitzahl}"'
-                )
-    elif output_format == "xml":
-        import xml.dom.minidom
-
-        root = ET.Element("accounts")
-        for record in ibans:
-            iban_elem = ET.SubElement(root, "account")
-            if fields:
-                for f in fields:
-                    ET.SubElement(iban_elem, f).text = OutputFormatter._field_value(
-                        record, f
-                    )
-                continue
-            ET.SubElement(iban_elem, "iban").text = record.iban
-
-        root = ET.Element("accounts")
-        for record in ibans:
-            iban_elem = ET.SubElement(root, "account")
-            ET.SubElement(iban_elem, "iban").text = record.iban
-
-            holders_elem = ET.SubElement(iban_elem, "account_holders")
-            for holder in record.account_holders:
-                _add_person_xml(holders_elem, "holder", holder)
-
-            beneficiaries_elem = ET.SubElement(iban_elem, "beneficiaries")
-            for beneficiary in record.beneficiaries:
-                _add_person_xml(beneficiaries_elem, "beneficiary", beneficiary)
-
-            bank_elem = ET.SubElement(iban_elem, "bank")
-            ET.SubElement(bank_elem, "name").text = record.bank.name
-            ET.SubElement(bank_elem, "bic").text = record.bank.bic
-            ET.SubElement(bank_elem, "code").text = record.bank.bankleitzahl
-        rough_string = ET.tostring(root, "utf-8")
-        reparsed = xml.dom.minidom.parseString(rough_string)
-        print(reparsed.toprettyxml(indent="  ").split("\n", 1)[1])
-    elif output_format == "json":
-        data = []
-        for record in ibans:
-            if fields:
-                entry = {f: OutputFormatter._field_value(record, f) for f in fields}
-                data.append(entry)
-                continue
-            holders_data = [_person_to_dict(h) for h in record.account_holders]
-            beneficiaries_data = [_person_to_dict(b) for b in record.beneficiaries]
-            data.append(
-                {
-                    "iban": record.iban,
-                    "account_holders": holders_data,
-                    "beneficiaries": beneficiaries_data,
-                    "bank": {
-                        "name": record.bank.name,
-                        "bic": record.bank.bic,
-                        "code": record.bank.bankleitzahl,
-                    },
-                }
-            )
-        print(json.dumps(data, ensure_ascii=False, indent=2))
-
-
 if __name__ == "__main__":
     cli()
@@ -0,0 +1,179 @@
+"""
+Streaming output compression
+
+Compresses output files with gzip, xz or zstd on a background thread so
+that compression overlaps with record generation.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import lzma
+import queue
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional, Tuple, Union
+
+COMPRESSIONS = ("gzip", "xz", "zstd")
+
+# File name suffixes that select a compression when --compress is not given.
+COMPRESSION_SUFFIXES: Dict[str, str] = {
+    ".gz": "gzip",
+    ".xz": "xz",
+    ".zst": "zstd",
+}
+
+DEFAULT_LEVELS: Dict[str, int] = {"gzip": 6, "xz": 6, "zstd": 3}
+LEVEL_RANGES: Dict[str, Tuple[int, int]] = {
+    "gzip": (0, 9),
+    "xz": (0, 9),
+    "zstd": (1, 22),
+}
+
+# Uncompressed bytes handed to the compressor thread per block and the number
+# of blocks that may wait for it; together they bound the memory in flight.
+COMPRESSION_BLOCK_SIZE = 1 << 22
+COMPRESSION_QUEUE_DEPTH = 4
+
+
+def compression_from_path(path: Union[str, Path, None]) -> Optional[str]:
+    """Return the compression selected by the suffix of ``path``, if any."""
+    if path is None:
+        return None
+    return COMPRESSION_SUFFIXES.get(Path(path).suffix.lower())
+
+
+def compression_suffix(compression: Optional[str]) -> str:
+    """Return the file name suffix for a compression (empty for none)."""
+    for suffix, name in COMPRESSION_SUFFIXES.items():
+        if name == compression:
+            return suffix
+    return ""
+
+
+def _make_compressor(compression: str, level: Optional[int], threads: int) -> Any:
+    if compression not in COMPRESSIONS:
+        raise ValueError(
+            f"Unsupported compression: {compression} "
+            f"(supported: {', '.join(COMPRESSIONS)})"
+        )
+    if level is None:
+        level = DEFAULT_LEVELS[compression]
+    low, high = LEVEL_RANGES[compression]
+    if not low <= level <= high:
+        raise ValueError(
+            f"Compression level for {compression} must be between {low} and {high}"
+        )
+    if compression == "gzip":
+        # wbits 31 writes a gzip header (mtime 0, so output is reproducible)
+        return zlib.compressobj(level, zlib.DEFLATED, 31)
+    if compression == "xz":
+        return lzma.LZMACompressor(preset=level)
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError(
+            "zstd compression requires the 'zstandard' package "
+            "(pip install gen-ibans[zstd])"
+        ) from None
+    return zstandard.ZstdCompressor(level=level, threads=threads).compressobj()
+
+
+class CompressedFile:
+    """Write-only binary file that compresses on a background thread.
+
+    Blocks passed to ``write`` are queued and compressed by a worker thread,
+    which also writes the result to the underlying file. zlib, lzma and
+    zstandard release the GIL while compressing, so generation continues in
+    the meantime. The bounded queue applies backpressure when the compressor
+    falls behind. ``threads`` enables zstd's own worker threads. An optional
+    hashlib ``digest`` is updated with the compressed bytes as they are
+    written. With ``append`` the compressed stream is added to an existing
+    file.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        compression: str,
+        level: Optional[int] = None,
+        threads: int = 0,
+        queue_depth: int = COMPRESSION_QUEUE_DEPTH,
+        digest: Any = None,
+        append: bool = False,
+    ):
+        self._compressor = _make_compressor(compression, level, threads)
+        self.compression = compression
+        self.compressed_bytes = 0
+        self._digest = digest
+        # Appending starts a new stream (gzip member, xz stream, zstd frame);
+        # decompressors read concatenated streams as one.
+        self._fp: BinaryIO = open(path, "ab" if append else "wb", buffering=0)
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=queue_depth)
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(
+            target=self._run, name="gen-ibans-compress", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def closed(self) -> bool:
+        return self._fp.closed
+
+    def _run(self) -> None:
+        while True:
+            block = self._queue.get()
+            if block is None:
+                return
+            if self._error is not None:
+                continue  # Drain so that writers never block on a dead worker
+            try:
+                self._write_compressed(self._compressor.compress(block))
+            except BaseException as e:  # Re-raised in the writing thread
+                self._error = e
+
+    def _write_compressed(self, data: bytes) -> None:
+        if data:
+            self._fp.write(data)
+            self.compressed_bytes += len(data)
+            if self._digest is not None:
+                self._digest.update(data)
+
+    def _check(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def write(self, data: bytes) -> int:
+        self._check()
+        if data:
+            self._queue.put(bytes(data))
+        return len(data)
+
+    def close(self) -> None:
+        if self._fp.closed:
+            return
+        try:
+            self._queue.put(None)
+            self._thread.join()
+            self._check()
+            self._write_compressed(self._compressor.flush())
+        finally:
+            self._fp.close()
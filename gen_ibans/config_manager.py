@@ -91,9 +91,29 @@ class CLISectionModel(BaseModel):  # type: ignore[misc]
     # General CLI defaults
     count: int = 1
     seed: Optional[int] = None
-    output_format: Optional[str] = None  # txt, csv, xml, json
+    # txt, csv, csv-relational, xml, json, jsonl, sqlite, parquet
+    output_format: Optional[str] = None
     output: Optional[str] = None  # file path
     no_echo: bool = False
+    # Records per Parquet row group
+    parquet_row_group_size: int = 100000
+    # gzip, xz, zstd or none; empty means detect from the output extension
+    compress: Optional[str] = None
+    compress_level: Optional[int] = None
+    compress_threads: int = 0
+    # Rotate output files every N records and/or at a size such as "1GB"
+    split_every: Optional[int] = None
+    split_size: Optional[str] = None
+    # blz, bic or method: one output file per key (or hash bucket)
+    partition_by: Optional[str] = None
+    partitions: Optional[int] = None
+    max_open_partitions: int = 64
+    # Background writer thread: records per batch and queued batches (0 = off)
+    write_batch_size: int = 1000
+    write_queue_depth: int = 8
+    # Progress updates: seconds between updates, or every N records if set
+    progress_interval: float = 0.1
+    progress_every: Optional[int] = None
     iban_only: bool = False
     no_personal_info: bool = False
     no_bank_info: bool = False
@@ -105,6 +125,12 @@ class CLISectionModel(BaseModel):  # type: ignore[misc]
     filter_bank_name: Optional[str] = None
     filter_bic: Optional[str] = None
     filter_blz: Optional[str] = None
+    # Optional indexed bank filters ("field:value", trailing * for prefix)
+    filter: Optional[list[str]] = None
+    filter_exclude: Optional[list[str]] = None
+    implemented_methods_only: bool = False
+    # Skip records flagged for deletion (kept by default, still valid)
+    drop_deleted_banks: bool = False
 
 
 class DownloaderSectionModel(BaseModel):  # type: ignore[misc]
@@ -112,6 +138,16 @@ class DownloaderSectionModel(BaseModel):  # type: ignore[misc]
     force_download: bool = False
     cache_dir: Optional[str] = None
     no_version_check: bool = False
+    stale_while_revalidate_hours: float = 0
+    # Stored releases: pin one by date/hash, limit how many are kept
+    data_version: Optional[str] = None
+    max_snapshots: int = 8
+    max_snapshot_size_mb: Optional[float] = None
+    # Ordered download sources and per-request timeouts
+    mirrors: Optional[list[str]] = None
+    timeout_seconds: float = 30
+    index_timeout_seconds: float = 10
+    hedge_delay_seconds: float = 2
 
 
 class AppConfigModel(BaseModel):  # type: ignore[misc]
@@ -332,18 +368,67 @@ def default_config_toml() -> str:
         '# cache_dir = ".\\cache"\n'
         "# Online-Versionsprüfung deaktivieren (nur Cache-Alter nutzen).\n"
         "no_version_check = false\n"
+        "# Veraltete Cache-Daten bis zu so vielen Stunden nach Ablauf sofort verwenden und\n"
+        "# im Hintergrund für den nächsten Lauf aktualisieren (0 = vorher aktualisieren).\n"
+        "stale_while_revalidate_hours = 0\n"
+        "# Gespeicherten Datenstand verwenden: gültig am Datum (YYYY-MM-DD) oder SHA-256 (Präfix).\n"
+        '# data_version = "2025-06-09"\n'
+        "# Anzahl aufbewahrter Datenstände (älteste zuletzt genutzte werden entfernt).\n"
+        "max_snapshots = 8\n"
+        "# Optionale Obergrenze für den Speicherplatz aller Datenstände in MB.\n"
+        "# max_snapshot_size_mb = 200\n"
+        "# Geordnete Liste von Spiegeln (http(s):// oder file://-Verzeichnis mit\n"
+        '# blz-aktuell-<format>-zip-data.zip); "bundesbank" steht für die offizielle Seite.\n'
+        '# mirrors = ["https://mirror.intern/bundesbank/", "file:///srv/bundesbank", "bundesbank"]\n'
+        "# Zeitlimit pro Anfrage in Sekunden (Archiv bzw. Bundesbank-Übersichtsseite).\n"
+        "timeout_seconds = 30\n"
+        "index_timeout_seconds = 10\n"
+        "# Nach so vielen Sekunden ohne Antwort zusätzlich den nächsten Spiegel anfragen.\n"
+        "hedge_delay_seconds = 2\n"
         "\n"
         "[cli]\n"
         "# Standardanzahl zu generierender IBANs, wenn nicht per CLI angegeben.\n"
         "count = 1\n"
         "# Fester Seed für deterministische Ergebnisse (optional).\n"
         "# seed = 12345\n"
-        "# Ausgabeformat (txt|csv|xml|json); leer bedeutet Plain-Text.\n"
+        "# Ausgabeformat (txt|csv|csv-relational|xml|json|jsonl|sqlite|parquet); leer bedeutet Plain-Text.\n"
+        "# csv-relational schreibt normalisierte Tabellen in das Verzeichnis aus output,\n"
+        "# sqlite dieselben Tabellen in eine SQLite-Datenbankdatei.\n"
+        "# jsonl schreibt ein JSON-Objekt pro Zeile (JSON Lines) statt eines Arrays.\n"
+        "# parquet schreibt nur in Dateien und benötigt pyarrow (gen-ibans[parquet]).\n"
         '# output_format = "json"\n'
         "# Ausgabedatei-Pfad; leer bedeutet stdout.\n"
         '# output = ".\\ibans.json"\n'
         "# Unterdrücke stdout, wenn in Datei geschrieben wird.\n"
         "no_echo = false\n"
+        "# Anzahl Datensätze pro Parquet-Row-Group.\n"
+        "parquet_row_group_size = 100000\n"
+        "# Kompression der Ausgabedatei (gzip|xz|zstd|none); leer bedeutet Erkennung\n"
+        "# anhand der Dateiendung (.gz, .xz, .zst). zstd benötigt gen-ibans[zstd].\n"
+        '# compress = "gzip"\n'
+        "# Kompressionsstufe (gzip/xz: 0-9, Standard 6; zstd: 1-22, Standard 3).\n"
+        "# compress_level = 6\n"
+        "# Zusätzliche zstd-Worker-Threads (0 = ein Hintergrund-Thread).\n"
+        "compress_threads = 0\n"
+        "# Ausgabe auf nummerierte Teildateien aufteilen (ibans-00001.csv, ...) mit\n"
+        "# Manifest (ibans.manifest.json): alle N Datensätze und/oder ab einer Größe\n"
+        "# (unkomprimiert; KB/MB/GB = 1000er-, K/M/G bzw. KiB/MiB/GiB = 1024er-Potenzen).\n"
+        "# split_every = 1000000\n"
+        '# split_size = "1GB"\n'
+        "# Ausgabe nach Bankschlüssel (blz|bic|method) auf Dateien verteilen, eine Datei\n"
+        "# pro Schlüssel (ibans-blz-37040044.csv) oder mit partitions auf N Hash-Buckets.\n"
+        '# partition_by = "blz"\n'
+        "# partitions = 16\n"
+        "# Maximal gleichzeitig geöffnete Partitionsdateien.\n"
+        "max_open_partitions = 64\n"
+        "# Hintergrund-Schreibthread: Datensätze pro Batch und maximal wartende Batches\n"
+        "# (Rückstau bremst die Generierung; 0 schreibt im Generierungs-Thread).\n"
+        "write_batch_size = 1000\n"
+        "write_queue_depth = 8\n"
+        "# Fortschrittsanzeige höchstens alle progress_interval Sekunden aktualisieren\n"
+        "# (0.1 = 10 Hz) oder alle progress_every Datensätze.\n"
+        "progress_interval = 0.1\n"
+        "# progress_every = 100000\n"
         "# Nur IBANs ohne Bank- und Personendaten ausgeben.\n"
         "iban_only = false\n"
         "# Personenbezogene Daten ausblenden.\n"
@@ -355,7 +440,8 @@ def default_config_toml() -> str:
         "# Farbige Ausgabe deaktivieren.\n"
         "no_color = false\n"
         "# Auswahl der auszugebenden Felder (optional). Liste von Strings; überschreibt iban_only/no_* Flags.\n"
-        "# Unterstützt: iban, bank_name, bic, blz, holders, beneficiaries\n"
+        "# Unterstützt: iban, account_number, bank_name, bic, blz, method, holders,\n"
+        "# holder_count, beneficiaries, beneficiary_count, entity_type, birth_dates, wids\n"
         "# Beispiel: nur IBANs ausgeben\n"
         '# fields = ["iban"]\n'
         "# Beispiel: IBAN und BIC\n"
@@ -372,6 +458,16 @@ def default_config_toml() -> str:
         '# filter_bank_name = ""\n'
         '# filter_bic = ""\n'
         '# filter_blz = ""\n'
+        "#\n"
+        '# Indizierte Bankfilter als Liste von "feld:wert" (Präfix mit abschließendem *).\n'
+        "# Felder: blz, bic, method, region, merkmal, plz, ort.\n"
+        "# Gleiche Felder werden ODER-verknüpft, verschiedene Felder UND-verknüpft.\n"
+        '# filter = ["region:3", "method:09", "method:13"]\n'
+        '# filter_exclude = ["bic:COBADE*"]\n'
+        "# Nur Banken mit implementierter Prüfziffermethode verwenden.\n"
+        "# implemented_methods_only = false\n"
+        "# Zur Löschung vorgemerkte Banken (Bankleitzahllöschung) überspringen.\n"
+        "# drop_deleted_banks = false\n"
     )
 
 
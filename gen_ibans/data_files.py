@@ -0,0 +1,127 @@
+"""
+Bank Data File Helpers
+
+This module provides helpers to open Bundesbank data files as text streams,
+either directly or as a member of a ZIP archive without extracting it.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import io
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, TextIO
+
+# Data file formats published by the Bundesbank
+DATA_FORMATS = ("csv", "txt", "xml")
+
+
+def is_zip_path(file_path: str) -> bool:
+    """Return True if the path points to a ZIP archive."""
+    return Path(file_path).suffix.lower() == ".zip"
+
+
+def find_data_members(
+    names: Iterable[str], format_type: Optional[str] = None
+) -> List[str]:
+    """
+    Return the archive members that look like bank data files.
+
+    Args:
+        names: Member names of the archive
+        format_type: Preferred format (csv, txt, xml); None accepts all formats
+
+    Returns:
+        Matching member names, exact extension matches first
+    """
+    formats = [format_type] if format_type else list(DATA_FORMATS)
+    exact: List[str] = []
+    loose: List[str] = []
+    for name in names:
+        lower = name.lower()
+        if lower.endswith("/"):
+            continue
+        if any(lower.endswith(f".{fmt}") for fmt in formats):
+            exact.append(name)
+        # Also accept files that mention the format but use another data extension
+        elif (
+            format_type
+            and format_type in lower
+            and lower.endswith(tuple(f".{fmt}" for fmt in DATA_FORMATS))
+        ):
+            loose.append(name)
+    return exact + loose
+
+
+def resolve_zip_member(zip_path: str, format_type: Optional[str] = None) -> str:
+    """
+    Return the data member to read from a ZIP archive.
+
+    Raises:
+        ValueError: If the archive contains no bank data file
+    """
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        names = zf.namelist()
+    members = find_data_members(names, format_type)
+    if not members:
+        expected = format_type or "/".join(DATA_FORMATS)
+        raise ValueError(
+            f"No {expected} file found in archive {zip_path}. "
+            f"Available files: {', '.join(names)}"
+        )
+    return members[0]
+
+
+def data_format(file_path: str, member: Optional[str] = None) -> str:
+    """Return the lower-case extension (without dot) of the data file or member."""
+    return Path(member or file_path).suffix.lower().lstrip(".")
+
+
+@contextmanager
+def open_data_file(
+    file_path: str, encoding: str, member: Optional[str] = None
+) -> Iterator[TextIO]:
+    """
+    Open a bank data file as a text stream.
+
+    If member is given, file_path is treated as a ZIP archive and the member is
+    decompressed on the fly while reading; nothing is extracted to disk.
+    """
+    if member is None:
+        with open(file_path, "r", encoding=encoding) as file:
+            yield file
+        return
+    with zipfile.ZipFile(file_path, "r") as zf:
+        with zf.open(member, "r") as raw:
+            with io.TextIOWrapper(raw, encoding=encoding) as file:
+                yield file
+
+
+def iter_data_lines(file: TextIO) -> Iterator[str]:
+    """Yield lines without line endings, skipping a leading BOM."""
+    first = True
+    for line in file:
+        if first:
+            first = False
+            if line.startswith("\ufeff"):
+                line = line[1:]
+        yield line.rstrip("\r\n")
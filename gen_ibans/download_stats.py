@@ -0,0 +1,156 @@
+"""
+Download Statistics Module
+
+This module records what a downloader call did: per-phase durations, byte
+counts and the cache outcome (hit, miss, revalidation, ...), and keeps
+outcome counters across runs to report cache hit ratios.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+
+# Cache outcomes of a get_data_file() call
+OUTCOME_HIT = "hit"  # fresh cache used without any request
+OUTCOME_STALE = "stale"  # stale cache served, refreshed in the background
+OUTCOME_REVALIDATED = "revalidated"  # conditional request answered 304 Not Modified
+OUTCOME_UPDATED = "updated"  # cached archive replaced by a newer release
+OUTCOME_MISS = "miss"  # nothing cached, archive downloaded
+OUTCOME_SHARED = "shared"  # another process refreshed the cache while we waited
+OUTCOME_FALLBACK = "fallback"  # sources unreachable, fresh cache used anyway
+OUTCOME_PINNED = "pinned"  # stored release selected with a version
+OUTCOME_ERROR = "error"  # no data file could be provided
+
+# Outcomes served without downloading an archive
+CACHE_HIT_OUTCOMES = (
+    OUTCOME_HIT,
+    OUTCOME_STALE,
+    OUTCOME_REVALIDATED,
+    OUTCOME_SHARED,
+    OUTCOME_FALLBACK,
+    OUTCOME_PINNED,
+)
+
+
+@dataclass
+class DownloadResult:
+    """Outcome, timings and byte counts of one get_data_file() call.
+
+    Attributes:
+        format: Requested format (csv, txt, xml)
+        path: Path of the returned archive (None on errors)
+        outcome: One of the OUTCOME_* constants
+        source: URL the archive was revalidated or downloaded from
+        timings: Seconds spent per phase (lock, index, request, download,
+            verify, snapshot), in the order the phases first ran
+        bytes: Byte counts (index page, downloaded archive body)
+        total_seconds: Wall time of the whole call
+    """
+
+    format: str
+    path: Optional[str] = None
+    outcome: Optional[str] = None
+    source: Optional[str] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+    bytes: Dict[str, int] = field(default_factory=dict)
+    total_seconds: float = 0.0
+
+    @property
+    def from_cache(self) -> bool:
+        """True if no archive had to be downloaded."""
+        return self.outcome in CACHE_HIT_OUTCOMES
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add the time spent in the with-block to a phase."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed
+
+    def add_bytes(self, name: str, count: int) -> None:
+        self.bytes[name] = self.bytes.get(name, 0) + count
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class CacheStats:
+    """Outcome counters per format, kept in a JSON file across runs.
+
+    Updates replace the file atomically; concurrent processes may lose an
+    increment now and then, which is fine for hit ratios.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+
+    def load(self) -> Dict[str, Dict[str, int]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def record(self, format_type: str, outcome: str) -> None:
+        """Count one outcome for a format."""
+        data = self.load()
+        counts = data.setdefault(format_type, {})
+        counts[outcome] = int(counts.get(outcome, 0)) + 1
+        with tempfile.NamedTemporaryFile(
+            "w",
+            encoding="utf-8",
+            dir=self.path.parent,
+            prefix=f"{self.path.name}.",
+            suffix=".tmp",
+            delete=False,
+        ) as f:
+            json.dump(data, f, indent=2)
+            temp_path = f.name
+        os.replace(temp_path, self.path)
+
+    def summary(self, format_type: str) -> dict:
+        """Return counts and hit/revalidation/miss ratios of a format."""
+        counts = {k: int(v) for k, v in self.load().get(format_type, {}).items()}
+        requests = sum(counts.values())
+
+        def ratio(*outcomes: str) -> float:
+            if not requests:
+                return 0.0
+            return sum(counts.get(o, 0) for o in outcomes) / requests
+
+        return {
+            "requests": requests,
+            "counts": counts,
+            "hit_ratio": ratio(*CACHE_HIT_OUTCOMES),
+            "revalidation_ratio": ratio(OUTCOME_REVALIDATED),
+            "miss_ratio": ratio(OUTCOME_MISS, OUTCOME_UPDATED),
+        }
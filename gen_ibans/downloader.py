@@ -25,16 +25,47 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import hashlib
+import http.client
 import os
 import tempfile
-import urllib.request
+import zipfile
 import urllib.parse
 import re
 import json
+import subprocess
+import sys
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Union
 import time
 
+from .cache_lock import CacheLock, CacheLockTimeout
+from .data_files import find_data_members
+from .download_stats import (
+    OUTCOME_ERROR,
+    OUTCOME_FALLBACK,
+    OUTCOME_HIT,
+    OUTCOME_MISS,
+    OUTCOME_PINNED,
+    OUTCOME_REVALIDATED,
+    OUTCOME_SHARED,
+    OUTCOME_STALE,
+    OUTCOME_UPDATED,
+    CacheStats,
+    DownloadResult,
+)
+from .snapshot_store import SnapshotStore, parse_version_date
+from .transport import (
+    DefaultTransport,
+    HTTPStatusError,
+    Response,
+    SourcesFailed,
+    Transport,
+    hedged_request,
+)
+
 
 class BundesbankDownloader:
     """Downloads bank data from Deutsche Bundesbank official website."""
@@ -53,41 +84,172 @@ class BundesbankDownloader:
         "xml": "https://www.bundesbank.de/resource/blob/602592/4f3ba1d2fb3aa8de9c5e71c6cc3f6e59/mL/bankleitzahlen-xml-data.zip",
     }
 
-    def __init__(self, cache_dir: Optional[str] = None):
+    # Read/write size for streamed downloads
+    CHUNK_SIZE = 64 * 1024
+
+    # Seconds to wait for another process refreshing the same cache entry
+    LOCK_TIMEOUT = 300
+
+    # Number of archive versions kept in the snapshot store by default
+    MAX_SNAPSHOTS = 8
+
+    # Per-request timeouts in seconds (archive requests, index page)
+    TIMEOUT = 30
+    INDEX_TIMEOUT = 10
+
+    # Seconds before the next mirror is asked in parallel to a slow one
+    HEDGE_DELAY = 2.0
+
+    # Mirror list entry standing for the official Bundesbank site
+    OFFICIAL_SOURCE = "bundesbank"
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_snapshots: Optional[int] = MAX_SNAPSHOTS,
+        max_snapshot_bytes: Optional[int] = None,
+        mirrors: Optional[Sequence[str]] = None,
+        timeout: float = TIMEOUT,
+        index_timeout: float = INDEX_TIMEOUT,
+        hedge_delay: Optional[float] = HEDGE_DELAY,
+        transport: Optional[Transport] = None,
+    ):
         """
         Initialize the downloader.
 
         Args:
             cache_dir: Directory to cache downloaded files. If None, uses system temp directory.
+            max_snapshots: Number of archive versions to keep (None: unlimited)
+            max_snapshot_bytes: Total size of kept versions in bytes (None: unlimited)
+            mirrors: Ordered base URLs (http(s):// or file:// directories) hosting
+                the archives as blz-aktuell-<format>-zip-data.zip (or with a
+                {format} placeholder); "bundesbank" marks the position of the
+                official site. None or empty uses only the official site.
+            timeout: Timeout in seconds for archive requests
+            index_timeout: Timeout in seconds for the Bundesbank index page
+            hedge_delay: Seconds to wait for a mirror before also asking the
+                next one (None: only fail over on errors)
+            transport: Transport for all requests (default: persistent HTTP
+                connections per host plus file:// support)
         """
         if cache_dir is None:
             cache_dir = os.path.join(tempfile.gettempdir(), "bundesbank_data")
 
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Every downloaded release, addressed by its SHA-256
+        self.snapshots = SnapshotStore(
+            self.cache_dir / "snapshots",
+            max_snapshots=max_snapshots,
+            max_bytes=max_snapshot_bytes,
+        )
+        self.mirrors = list(mirrors or [])
+        self.timeout = timeout
+        self.index_timeout = index_timeout
+        self.hedge_delay = hedge_delay
+        self.transport = transport or DefaultTransport()
+        # Outcome counters across runs (for hit ratios in get_cache_info)
+        self.stats = CacheStats(self.cache_dir / "bundesbank_data.stats.json")
+        # Result of the last get_data_file() call, and the one being recorded per thread
+        self.last_result: Optional[DownloadResult] = None
+        self._local = threading.local()
+        # Running background refreshes per format (stale-while-revalidate)
+        self._refresh_threads: dict = {}
+        self._refresh_lock = threading.Lock()
 
     def _get_cache_path(self, format_type: str) -> Path:
-        """Get the cache file path for a specific format."""
-        return self.cache_dir / f"bundesbank_data.{format_type}"
+        """Get the cache file path for a specific format.
+
+        The cache keeps the compressed archive as published by the Bundesbank;
+        the data member is read directly from it when loading banks.
+        """
+        return self.cache_dir / f"bundesbank_data.{format_type}.zip"
 
     def _get_cache_metadata_path(self, format_type: str) -> Path:
         """Get the cache metadata file path for a specific format."""
         return self.cache_dir / f"bundesbank_data.{format_type}.meta"
 
+    def _get_lock_path(self, format_type: str) -> Path:
+        """Get the lock file path guarding refreshes of a specific format."""
+        return self.cache_dir / f"bundesbank_data.{format_type}.lock"
+
+    def _write_json_atomic(self, path: Path, data: dict) -> None:
+        """Write JSON to a temporary file in the cache dir and rename it over path."""
+        with tempfile.NamedTemporaryFile(
+            "w",
+            encoding="utf-8",
+            dir=self.cache_dir,
+            prefix=f"{path.name}.",
+            suffix=".tmp",
+            delete=False,
+        ) as f:
+            temp_path = f.name
+            try:
+                json.dump(data, f, indent=2)
+            except Exception:
+                f.close()
+                os.unlink(temp_path)
+                raise
+        try:
+            os.replace(temp_path, path)
+        except Exception:
+            os.unlink(temp_path)
+            raise
+
+    @contextmanager
+    def _phase(self, name: str) -> Iterator[None]:
+        """Time a phase of the get_data_file() call running in this thread."""
+        result = getattr(self._local, "result", None)
+        if result is None:
+            yield
+            return
+        with result.phase(name):
+            yield
+
+    def _note(
+        self, outcome: Optional[str] = None, source: Optional[str] = None, **counts: int
+    ) -> None:
+        """Record outcome, source URL and byte counts of the running get_data_file() call."""
+        result = getattr(self._local, "result", None)
+        if result is None:
+            return
+        if outcome:
+            result.outcome = outcome
+        if source:
+            result.source = source
+        for name, count in counts.items():
+            result.add_bytes(name, count)
+
+    def _get_partial_path(self, format_type: str) -> Path:
+        """Get the path of an unfinished download for a specific format."""
+        return self.cache_dir / f"bundesbank_data.{format_type}.zip.part"
+
+    def _get_partial_state_path(self, format_type: str) -> Path:
+        """Get the path of the resume state (URL and validators) of an unfinished download."""
+        return self.cache_dir / f"bundesbank_data.{format_type}.zip.part.meta"
+
     def _save_cache_metadata(
-        self, format_type: str, etag: str = None, last_modified: str = None
+        self,
+        format_type: str,
+        etag: str = None,
+        last_modified: str = None,
+        url: str = None,
+        sha256: str = None,
+        size: int = None,
     ) -> None:
-        """Save cache metadata (ETag, Last-Modified, etc.) to file."""
+        """Save cache metadata (resolved URL, ETag, Last-Modified, hash, etc.) to file."""
         metadata_path = self._get_cache_metadata_path(format_type)
         metadata = {
             "timestamp": time.time(),
+            "url": url,
             "etag": etag,
             "last_modified": last_modified,
+            "sha256": sha256,
+            "size": size,
         }
 
         try:
-            with open(metadata_path, "w", encoding="utf-8") as f:
-                json.dump(metadata, f, indent=2)
+            self._write_json_atomic(metadata_path, metadata)
         except Exception:
             # If metadata save fails, don't break the main functionality
             pass
@@ -105,73 +267,155 @@ class BundesbankDownloader:
         except Exception:
             return {}
 
-    def _get_remote_etag(self, format_type: str) -> str:
-        """Get ETag from remote file without downloading."""
-        try:
-            url = self._resolve_url(format_type)
-            req = urllib.request.Request(url, method="HEAD")
-            with urllib.request.urlopen(req, timeout=10) as resp:
-                return resp.headers.get("ETag", "").strip('"')
-        except Exception:
-            return None
-
-    def _is_cache_valid(
-        self,
-        cache_path: Path,
-        format_type: str,
-        max_age_hours: int = 24,
-        check_version: bool = True,
-    ) -> bool:
+    def _is_cache_fresh(self, cache_path: Path, max_age_hours: int = 24) -> bool:
         """
-        Check if cached file is still valid (not too old and up-to-date).
+        Check if the cached file exists and is younger than max_age_hours.
 
         Args:
             cache_path: Path to cached file
-            format_type: File format for metadata lookup
-            max_age_hours: Maximum age in hours before forcing refresh
-            check_version: Whether to check for newer versions online
+            max_age_hours: Maximum age in hours before a refresh is required
 
         Returns:
-            True if cache is valid, False otherwise
+            True if the cache can be used without contacting the server
         """
-        if not cache_path.exists():
-            return False
-
-        # Check file age first (quick check)
-        file_age = time.time() - cache_path.stat().st_mtime
-        max_age_seconds = max_age_hours * 3600
+        age = self._cache_age_hours(cache_path)
+        return age is not None and age < max_age_hours
 
-        # If file is too old, it's invalid regardless of version
-        if file_age >= max_age_seconds:
-            return False
-
-        # If version checking is disabled, rely only on age
-        if not check_version:
-            return True
-
-        # Check if we have a newer version available online
+    @staticmethod
+    def _cache_age_hours(cache_path: Path) -> Optional[float]:
+        """Return the age of a cached file in hours, or None if it does not exist."""
         try:
-            metadata = self._load_cache_metadata(format_type)
-            cached_etag = metadata.get("etag")
+            return (time.time() - cache_path.stat().st_mtime) / 3600
+        except FileNotFoundError:
+            return None
 
-            # If we don't have cached ETag, assume cache is valid for now
-            # (to avoid excessive network calls)
-            if not cached_etag:
-                return True
+    @staticmethod
+    def _conditional_headers(metadata: dict) -> dict:
+        """Build If-None-Match / If-Modified-Since headers from cache metadata."""
+        headers = {}
+        etag = metadata.get("etag")
+        if etag:
+            # Older metadata stored the ETag without quotes
+            if not etag.startswith(('"', "W/")):
+                etag = f'"{etag}"'
+            headers["If-None-Match"] = etag
+        if metadata.get("last_modified"):
+            headers["If-Modified-Since"] = metadata["last_modified"]
+        return headers
+
+    def _revalidate(self, format_type: str) -> Optional[str]:
+        """
+        Revalidate the cached archive with a single conditional GET.
 
-            # Get current ETag from remote server
-            remote_etag = self._get_remote_etag(format_type)
+        Uses the URL resolved on the previous download, so the Bundesbank
+        index page is not fetched again. A 304 response keeps the cache (and
+        resets its age); a 200 response stores the new archive right away.
 
-            # If we can't get remote ETag, assume cache is valid
-            if not remote_etag:
-                return True
+        Returns:
+            Path to the cached archive, or None if no URL is cached or the
+            cached URL is gone (404/410) and has to be resolved again
 
-            # If ETags differ, we have a newer version available
-            return cached_etag == remote_etag
+        Raises:
+            Exception: If the server cannot be reached or the response is invalid
+        """
+        metadata = self._load_cache_metadata(format_type)
+        url = metadata.get("url")
+        if not url:
+            return None
 
-        except Exception:
-            # If version check fails, fall back to age-based validation
-            return True
+        # An earlier refresh was interrupted: finish it instead of starting over
+        if self._load_partial_state(format_type).get("url") == url:
+            self._note(OUTCOME_UPDATED)
+            return self._download_archive(url, format_type)
+
+        # The cached validators only mean something to the source that sent them
+        official: Union[str, Callable[[], str]] = url
+        if self._is_mirror_url(url, format_type):
+            official = lambda: self._resolve_url(format_type)  # noqa: E731
+        conditional = self._conditional_headers(metadata)
+        try:
+            with self._phase("request"):
+                source, response = self._request_any(
+                    self._candidates(format_type, official),
+                    lambda candidate: conditional if candidate == url else {},
+                )
+        except SourcesFailed as e:
+            if e.gone:
+                return None
+            raise
+        with response:
+            if response.status != 304:
+                self._note(OUTCOME_UPDATED, source)
+                return self._store_archive(response, source, format_type)
+            self._note(OUTCOME_REVALIDATED, source)
+            cache_path = self._get_cache_path(format_type)
+            # Not modified: reset the cache age and keep the validators
+            os.utime(cache_path)
+            self._save_cache_metadata(
+                format_type,
+                response.headers.get("ETag") or metadata.get("etag"),
+                response.headers.get("Last-Modified") or metadata.get("last_modified"),
+                url,
+                metadata.get("sha256"),
+                metadata.get("size"),
+            )
+        self._record_snapshot(format_type)
+        return str(cache_path)
+
+    def _mirror_url(self, mirror: str, format_type: str) -> str:
+        """Return the archive URL of a format on a mirror."""
+        if "{format}" in mirror:
+            return mirror.replace("{format}", format_type)
+        return urllib.parse.urljoin(
+            mirror.rstrip("/") + "/", f"blz-aktuell-{format_type}-zip-data.zip"
+        )
+
+    def _is_mirror_url(self, url: str, format_type: str) -> bool:
+        return any(
+            self._mirror_url(mirror, format_type) == url
+            for mirror in self.mirrors
+            if mirror != self.OFFICIAL_SOURCE
+        )
+
+    def _candidates(
+        self, format_type: str, official: Union[str, Callable[[], str]]
+    ) -> List[Union[str, Callable[[], str]]]:
+        """Return the sources to try in order; official is the Bundesbank URL (or resolver)."""
+        if not self.mirrors:
+            return [official]
+        return [
+            official
+            if mirror == self.OFFICIAL_SOURCE
+            else self._mirror_url(mirror, format_type)
+            for mirror in self.mirrors
+        ]
+
+    def _request_any(
+        self,
+        candidates: List[Union[str, Callable[[], str]]],
+        headers_for: Callable[[str], Dict[str, str]],
+    ):
+        """Request the first source that answers, hedging over several sources."""
+        result = getattr(self._local, "result", None)
+
+        def traced(resolve: Callable[[], str]) -> Callable[[], str]:
+            # Resolvers run in worker threads; keep recording into this call's result
+            def run() -> str:
+                self._local.result = result
+                try:
+                    return resolve()
+                finally:
+                    self._local.result = None
+
+            return run
+
+        return hedged_request(
+            self.transport,
+            [c if isinstance(c, str) else traced(c) for c in candidates],
+            headers_for=headers_for,
+            timeout=self.timeout,
+            hedge_delay=self.hedge_delay if len(candidates) > 1 else None,
+        )
 
     def _resolve_url(self, format_type: str) -> str:
         """
@@ -187,8 +431,13 @@ class BundesbankDownloader:
             Exception: If URL resolution fails
         """
         try:
-            with urllib.request.urlopen(self.INDEX_URL, timeout=10) as resp:
-                html = resp.read().decode("utf-8", "ignore")
+            with self._phase("index"):
+                with self.transport.request(
+                    self.INDEX_URL, timeout=self.index_timeout
+                ) as resp:
+                    body = resp.read()
+            self._note(index=len(body))
+            html = body.decode("utf-8", "ignore")
 
             # Look for download links in the HTML
             pattern = rf"href=\"([^\"]+blz-aktuell-{format_type}-zip-data\.zip)\""
@@ -209,91 +458,259 @@ class BundesbankDownloader:
             if format_type in self.FALLBACK_URLS:
                 return self.FALLBACK_URLS[format_type]
             else:
-                raise Exception(f"Failed to resolve download URL: {e}")
+                raise Exception(f"Failed to resolve download URL: {e}") from e
 
-    def _download_and_extract(self, url: str, format_type: str) -> str:
+    def _load_partial_state(self, format_type: str) -> dict:
+        """Load the resume state of an unfinished download ({} if there is none)."""
+        if not self._get_partial_path(format_type).exists():
+            return {}
+        try:
+            with open(
+                self._get_partial_state_path(format_type), "r", encoding="utf-8"
+            ) as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _discard_partial(self, format_type: str) -> None:
+        """Remove an unfinished download and its resume state."""
+        for path in (
+            self._get_partial_path(format_type),
+            self._get_partial_state_path(format_type),
+        ):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _download_archive(self, url: str, format_type: str) -> str:
         """
-        Download and extract data file from Bundesbank.
+        Download the data archive from one URL into the cache.
 
         Args:
             url: Download URL
             format_type: File format (csv, txt, xml)
 
         Returns:
-            Path to the extracted file
+            Path to the cached ZIP archive
 
         Raises:
-            Exception: If download or extraction fails
+            Exception: If download or validation fails
         """
-        try:
-            # Create a temporary file for the zip download
-            with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as temp_zip:
-                temp_zip_path = temp_zip.name
+        return self._fetch_archive([url], format_type)
+
+    def _download_from_sources(self, format_type: str) -> str:
+        """Download the archive from the configured mirrors (or the resolved Bundesbank URL)."""
+        return self._fetch_archive(
+            self._candidates(format_type, lambda: self._resolve_url(format_type)),
+            format_type,
+        )
 
-            # Download the zip file and capture headers
-            etag = None
-            last_modified = None
+    def _fetch_archive(
+        self, candidates: List[Union[str, Callable[[], str]]], format_type: str
+    ) -> str:
+        """
+        Download the archive from the first source that answers.
+
+        If an unfinished download from one of the sources exists, it is resumed
+        with an HTTP Range request; If-Range makes the server send the full
+        archive instead when it changed in the meantime.
+        """
+        partial_path = self._get_partial_path(format_type)
+        state = self._load_partial_state(format_type)
+        offset = partial_path.stat().st_size if state else 0
+        validator = state.get("etag") or state.get("last_modified")
+        if not validator:
+            offset = 0
+
+        def headers_for(url: str) -> Dict[str, str]:
+            if offset and state.get("url") == url:
+                return {"Range": f"bytes={offset}-", "If-Range": validator}
+            return {}
+
+        try:
             try:
-                with urllib.request.urlopen(url, timeout=30) as response:
-                    etag = response.headers.get("ETag", "").strip('"')
-                    last_modified = response.headers.get("Last-Modified", "")
+                with self._phase("request"):
+                    url, response = self._request_any(candidates, headers_for)
+            except SourcesFailed as e:
+                if not offset or not any(
+                    isinstance(error, HTTPStatusError) and error.status == 416
+                    for _, error in e.errors
+                ):
+                    raise
+                # Range not satisfiable: the partial file is unusable, start over
+                self._discard_partial(format_type)
+                offset = 0
+                with self._phase("request"):
+                    url, response = self._request_any(candidates, headers_for)
+            self._note(source=url)
+            with response:
+                resume_from = offset if response.status == 206 else 0
+                return self._store_archive(response, url, format_type, resume_from)
+        except Exception as e:
+            raise Exception(f"Failed to download Bundesbank data: {e}") from e
+
+    @staticmethod
+    def _parse_content_range(value: Optional[str]):
+        """Parse 'bytes START-END/TOTAL' into (start, total); total may be None."""
+        match = re.match(r"bytes\s+(\d+)-\d+/(\d+|\*)", value or "")
+        if not match:
+            raise ValueError(f"Invalid Content-Range header: {value!r}")
+        total = match.group(2)
+        return int(match.group(1)), None if total == "*" else int(total)
+
+    def _store_archive(
+        self, response: Response, url: str, format_type: str, resume_from: int = 0
+    ) -> str:
+        """
+        Stream a downloaded archive into the cache together with its metadata.
 
-                    with open(temp_zip_path, "wb") as temp_file:
-                        temp_file.write(response.read())
-            except Exception:
-                # Fallback to simple download if headers fail
-                urllib.request.urlretrieve(url, temp_zip_path)
+        The body is written in chunks to a partial file next to the cache file
+        and hashed (SHA-256) as it arrives. Only a complete archive that
+        contains a data member of the requested format replaces the cached
+        file (atomic rename); a truncated transfer is kept for resuming.
 
-            # Extract the zip file
-            import zipfile
+        Args:
+            response: Open transport response with the archive (or the rest of it) as body
+            url: URL the archive was downloaded from (cached for revalidation)
+            format_type: File format (csv, txt, xml)
+            resume_from: Size of the partial file the Range request continued from
 
-            with zipfile.ZipFile(temp_zip_path, "r") as zip_ref:
-                # List all files in zip for debugging
+        Returns:
+            Path to the cached ZIP archive
+        """
+        cache_path = self._get_cache_path(format_type)
+        partial_path = self._get_partial_path(format_type)
+        hasher = hashlib.sha256()
+        status = response.status
+        state = {}
+
+        if resume_from and status == 206:
+            state = self._load_partial_state(format_type)
+            start, total = self._parse_content_range(
+                response.headers.get("Content-Range")
+            )
+            if start != resume_from:
+                raise ValueError(
+                    f"Server resumed at byte {start}, expected {resume_from}"
+                )
+            # Hash the bytes already on disk before appending the rest
+            with open(partial_path, "rb") as existing:
+                for chunk in iter(lambda: existing.read(self.CHUNK_SIZE), b""):
+                    hasher.update(chunk)
+            mode = "ab"
+        else:
+            resume_from = 0
+            length = response.headers.get("Content-Length")
+            total = int(length) if length and length.isdigit() else None
+            mode = "wb"
+            # Remember where the partial file comes from so it can be resumed
+            self._write_json_atomic(
+                self._get_partial_state_path(format_type),
+                {
+                    "url": url,
+                    "etag": response.headers.get("ETag") or None,
+                    "last_modified": response.headers.get("Last-Modified") or None,
+                },
+            )
+
+        received = resume_from
+        with self._phase("download"), open(partial_path, mode) as target:
+            try:
+                while True:
+                    chunk = response.read(self.CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    target.write(chunk)
+                    hasher.update(chunk)
+                    received += len(chunk)
+            except http.client.IncompleteRead as e:
+                target.write(e.partial)
+                received += len(e.partial)
+                total = total if total is not None else received + (e.expected or 0)
+        self._note(download=received - resume_from)
+
+        if total is not None and received != total:
+            raise ValueError(
+                f"Download truncated: received {received} of {total} bytes "
+                f"(partial file kept for resuming)"
+            )
+
+        # Make sure the archive contains a data file before caching it
+        try:
+            with self._phase("verify"), zipfile.ZipFile(partial_path, "r") as zip_ref:
                 all_files = zip_ref.namelist()
+        except zipfile.BadZipFile as e:
+            self._discard_partial(format_type)
+            raise ValueError(f"Downloaded archive is corrupt: {e}") from e
+        if not find_data_members(all_files, format_type):
+            self._discard_partial(format_type)
+            raise ValueError(
+                f"No {format_type} file found in downloaded archive. "
+                f"Available files: {', '.join(all_files)}"
+            )
+
+        os.replace(partial_path, cache_path)
+        self._discard_partial(format_type)
+
+        self._save_cache_metadata(
+            format_type,
+            response.headers.get("ETag") or state.get("etag"),
+            response.headers.get("Last-Modified") or state.get("last_modified"),
+            url,
+            hasher.hexdigest(),
+            received,
+        )
+        self._record_snapshot(format_type)
+        return str(cache_path)
+
+    def _record_snapshot(self, format_type: str) -> None:
+        """Add the cached archive to the snapshot store (best effort)."""
+        cache_path = self._get_cache_path(format_type)
+        metadata = self._load_cache_metadata(format_type)
+        try:
+            with self._phase("snapshot"):
+                self.snapshots.add(
+                    cache_path,
+                    format_type,
+                    sha256=metadata.get("sha256"),
+                    etag=metadata.get("etag"),
+                    last_modified=metadata.get("last_modified"),
+                    url=metadata.get("url"),
+                )
+        except OSError:
+            # The cache itself is complete; a missing snapshot only limits pinning
+            pass
 
-                # Find the data file in the zip - be flexible with extensions
-                data_files = []
-                for filename in all_files:
-                    # Check for exact extension match first
-                    if filename.lower().endswith(f".{format_type}"):
-                        data_files.append(filename)
-                    # Also check for files that contain the format type
-                    elif format_type in filename.lower() and (
-                        filename.lower().endswith(".txt")
-                        or filename.lower().endswith(".csv")
-                        or filename.lower().endswith(".xml")
-                    ):
-                        data_files.append(filename)
-
-                if not data_files:
-                    # If no files found, raise error with available files info
-                    raise ValueError(
-                        f"No {format_type} file found in downloaded archive. "
-                        f"Available files: {', '.join(all_files)}"
-                    )
-
-                # Extract the first matching file
-                data_file = data_files[0]
-                extracted_path = self.cache_dir / f"bundesbank_data.{format_type}"
-
-                with zip_ref.open(data_file) as source:
-                    with open(extracted_path, "wb") as target:
-                        target.write(source.read())
-
-            # Save metadata if we captured it
-            if etag or last_modified:
-                self._save_cache_metadata(format_type, etag, last_modified)
-
-            # Clean up temporary zip file
-            os.unlink(temp_zip_path)
-
-            return str(extracted_path)
+    def get_snapshot_file(self, format_type: str = "csv", version: str = "") -> str:
+        """
+        Get the archive of a stored version.
 
-        except Exception as e:
-            # Clean up on error
-            if "temp_zip_path" in locals() and os.path.exists(temp_zip_path):
-                os.unlink(temp_zip_path)
-            raise Exception(f"Failed to download Bundesbank data: {e}")
+        Args:
+            format_type: File format (csv, txt, xml)
+            version: Date the data must be valid on (YYYY-MM-DD) or a SHA-256
+                (prefix) of the archive
+
+        Returns:
+            Path to the stored ZIP archive
+
+        Raises:
+            ValueError: If no stored version matches
+        """
+        if parse_version_date(version) is not None:
+            snapshot = self.snapshots.select(format_type, valid_on=version)
+        else:
+            snapshot = self.snapshots.select(format_type, sha256=version)
+        if snapshot is None:
+            available = ", ".join(
+                f"{s.version_date.isoformat()} ({s.sha256[:12]})"
+                for s in self.snapshots.snapshots(format_type)
+            )
+            raise ValueError(
+                f"No stored {format_type} data version matches {version}. "
+                f"Available versions: {available or 'none'}"
+            )
+        return str(self.snapshots.archive_path(snapshot.sha256))
 
     def get_data_file(
         self,
@@ -301,50 +718,361 @@ class BundesbankDownloader:
         force_download: bool = False,
         max_cache_age_hours: int = 24,
         check_version: bool = True,
+        stale_while_revalidate_hours: float = 0,
+        background: str = "thread",
+        version: Optional[str] = None,
     ) -> str:
         """
         Get bank data file, downloading if necessary.
 
+        Timings and the cache outcome of the call are kept in last_result
+        (see fetch_data_file).
+
+        A cached archive younger than max_cache_age_hours is used as-is unless
+        check_version is set. Otherwise it is revalidated with one conditional
+        GET against the cached download URL; the Bundesbank index page is only
+        scraped when no URL is cached or the cached URL is gone.
+
+        With stale_while_revalidate_hours > 0, a cached archive that is at most
+        that much older than max_cache_age_hours is returned immediately and
+        refreshed in the background; the next call picks up the new archive.
+        Older archives (hard expiry) are still refreshed before returning.
+
+        With version, a stored release is returned instead (see
+        get_snapshot_file); the current release is fetched first only if no
+        stored version matches.
+
         Args:
             format_type: Preferred format (csv, txt, xml)
             force_download: Force re-download even if cache is valid
             max_cache_age_hours: Maximum age of cached file in hours
             check_version: Whether to check for newer versions online
+            stale_while_revalidate_hours: Grace period after max_cache_age_hours
+                during which stale data is served while refreshing in the background
+            background: "thread" to refresh in a thread of this process, or
+                "process" to refresh in a detached process that outlives it
+            version: Pin a stored release by validity date (YYYY-MM-DD) or
+                SHA-256 (prefix); None uses the current release
 
         Returns:
-            Path to the data file
+            Path to the cached ZIP archive containing the data file
 
         Raises:
             ValueError: If format_type is not supported
             Exception: If download fails
         """
+        return self.fetch_data_file(
+            format_type,
+            force_download,
+            max_cache_age_hours,
+            check_version,
+            stale_while_revalidate_hours,
+            background,
+            version,
+        ).path
+
+    def fetch_data_file(
+        self,
+        format_type: str = "csv",
+        force_download: bool = False,
+        max_cache_age_hours: int = 24,
+        check_version: bool = True,
+        stale_while_revalidate_hours: float = 0,
+        background: str = "thread",
+        version: Optional[str] = None,
+    ) -> DownloadResult:
+        """
+        Like get_data_file, but return a DownloadResult with the archive path,
+        the cache outcome (hit, stale, revalidated, updated, miss, ...), the
+        source URL, per-phase durations and byte counts.
+
+        The outcome is also counted in the cache statistics reported by
+        get_cache_info. Failures are counted as "error" and re-raised.
+        """
         if format_type not in ["csv", "txt", "xml"]:
             raise ValueError(
                 f"Unsupported format: {format_type}. Supported formats: csv, txt, xml"
             )
 
+        result = DownloadResult(format=format_type)
+        self._local.result = result
+        started = time.perf_counter()
+        try:
+            result.path = self._get_data_file(
+                format_type,
+                force_download,
+                max_cache_age_hours,
+                check_version,
+                stale_while_revalidate_hours,
+                background,
+                version,
+            )
+        except Exception:
+            result.outcome = OUTCOME_ERROR
+            raise
+        finally:
+            result.total_seconds = time.perf_counter() - started
+            self._local.result = None
+            self.last_result = result
+            try:
+                self.stats.record(format_type, result.outcome or OUTCOME_ERROR)
+            except OSError:
+                pass
+        return result
+
+    def _get_data_file(
+        self,
+        format_type: str,
+        force_download: bool,
+        max_cache_age_hours: int,
+        check_version: bool,
+        stale_while_revalidate_hours: float,
+        background: str,
+        version: Optional[str],
+    ) -> str:
+        if version:
+            try:
+                with self._phase("snapshot"):
+                    path = self.get_snapshot_file(format_type, version)
+            except ValueError:
+                # The requested version may be the current release
+                self._get_data_file(
+                    format_type,
+                    force_download,
+                    max_cache_age_hours,
+                    check_version,
+                    0,
+                    background,
+                    None,
+                )
+                with self._phase("snapshot"):
+                    path = self.get_snapshot_file(format_type, version)
+            self._note(OUTCOME_PINNED)
+            return path
+
         cache_path = self._get_cache_path(format_type)
+        fresh = self._is_cache_fresh(cache_path, max_cache_age_hours)
+
+        if not force_download and cache_path.exists():
+            if fresh and not check_version:
+                self._note(OUTCOME_HIT)
+                return str(cache_path)
+            # Expired but within the stale window: serve it, refresh later
+            if (
+                not fresh
+                and stale_while_revalidate_hours > 0
+                and self._is_cache_fresh(
+                    cache_path, max_cache_age_hours + stale_while_revalidate_hours
+                )
+            ):
+                self.refresh_in_background(format_type, detach=background == "process")
+                self._note(OUTCOME_STALE)
+                return str(cache_path)
+
+        return self._refresh_cache(
+            format_type, force_download=force_download, fresh=fresh, since=time.time()
+        )
+
+    def _validated_since(self, format_type: str, since: float) -> bool:
+        """True if the cached archive was downloaded or revalidated after since."""
+        if not self._get_cache_path(format_type).exists():
+            return False
+        timestamp = self._load_cache_metadata(format_type).get("timestamp")
+        return isinstance(timestamp, (int, float)) and timestamp >= since
 
-        # Check if we can use cached file
-        if not force_download and self._is_cache_valid(
-            cache_path, format_type, max_cache_age_hours, check_version
-        ):
-            return str(cache_path)
+    def _refresh_cache(
+        self,
+        format_type: str,
+        force_download: bool = False,
+        fresh: bool = False,
+        since: Optional[float] = None,
+        wait: bool = True,
+    ) -> Optional[str]:
+        """
+        Revalidate or download the archive while holding the cache lock.
+
+        Only one process refreshes a format at a time; processes that waited
+        for the lock reuse the archive if it was refreshed after since.
+
+        Args:
+            format_type: File format (csv, txt, xml)
+            force_download: Skip revalidation and download the archive
+            fresh: The cached archive may be used if the server is unreachable
+            since: Time the caller decided to refresh (for single-flight reuse)
+            wait: Wait for a running refresh; if False return None instead
+
+        Returns:
+            Path to the cached archive, or None if wait is False and another
+            process is refreshing
+        """
+        cache_path = self._get_cache_path(format_type)
+        lock = CacheLock(self._get_lock_path(format_type), timeout=self.LOCK_TIMEOUT)
+        try:
+            with self._phase("lock"):
+                acquired = lock.acquire(blocking=wait)
+            if not acquired:
+                return None
+        except CacheLockTimeout as e:
+            if fresh:
+                self._note(OUTCOME_FALLBACK)
+                return str(cache_path)
+            raise Exception(f"Failed to download Bundesbank data: {e}") from e
+
+        try:
+            # Someone else refreshed while we were waiting: reuse their result
+            if since is not None and self._validated_since(format_type, since):
+                self._note(OUTCOME_SHARED)
+                return str(cache_path)
+
+            if not force_download and cache_path.exists():
+                try:
+                    revalidated = self._revalidate(format_type)
+                except Exception as e:
+                    # Server unreachable: a fresh cache is still good enough
+                    if fresh:
+                        self._note(OUTCOME_FALLBACK)
+                        return str(cache_path)
+                    raise Exception(f"Failed to download Bundesbank data: {e}") from e
+                if revalidated:
+                    return revalidated
+
+            # Download fresh data
+            self._note(OUTCOME_UPDATED if cache_path.exists() else OUTCOME_MISS)
+            try:
+                return self._download_from_sources(format_type)
+            except Exception:
+                if fresh and not force_download:
+                    self._note(OUTCOME_FALLBACK)
+                    return str(cache_path)
+                raise
+        finally:
+            lock.release()
+
+    def refresh(self, format_type: str = "csv", wait: bool = True) -> Optional[str]:
+        """
+        Revalidate (and if needed download) the cached archive now.
+
+        Args:
+            format_type: File format (csv, txt, xml)
+            wait: Wait for a refresh running in another process; if False,
+                return None right away in that case
+
+        Returns:
+            Path to the cached archive, or None if skipped (see wait)
+        """
+        return self._refresh_cache(format_type, since=time.time(), wait=wait)
 
-        # Download fresh data
-        url = self._resolve_url(format_type)
-        return self._download_and_extract(url, format_type)
+    def refresh_in_background(
+        self, format_type: str = "csv", detach: bool = False
+    ) -> None:
+        """
+        Refresh the cached archive without blocking the caller.
+
+        Args:
+            format_type: File format (csv, txt, xml)
+            detach: Run the refresh in a detached process instead of a thread,
+                so it can finish after the calling process exits
+        """
+        if detach:
+            command = [
+                sys.executable,
+                "-m",
+                "gen_ibans.downloader",
+                "--refresh",
+                format_type,
+                "--cache-dir",
+                str(self.cache_dir),
+                "--timeout",
+                str(self.timeout),
+                "--index-timeout",
+                str(self.index_timeout),
+            ]
+            for mirror in self.mirrors:
+                command += ["--mirror", mirror]
+            if self.hedge_delay is not None:
+                command += ["--hedge-delay", str(self.hedge_delay)]
+            # The child prunes snapshots too; keep the configured retention
+            command += [
+                "--max-snapshots",
+                _format_limit(self.snapshots.max_snapshots),
+                "--max-snapshot-bytes",
+                _format_limit(self.snapshots.max_bytes),
+            ]
+            kwargs = {}
+            if os.name == "nt":
+                kwargs["creationflags"] = getattr(subprocess, "DETACHED_PROCESS", 0)
+            else:
+                kwargs["start_new_session"] = True
+            try:
+                subprocess.Popen(
+                    command,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    close_fds=True,
+                    **kwargs,
+                )
+            except OSError:
+                # Serving stale data is fine; the next run will try again
+                pass
+            return
+
+        with self._refresh_lock:
+            running = self._refresh_threads.get(format_type)
+            if running is not None and running.is_alive():
+                return
+            thread = threading.Thread(
+                target=self._refresh_quietly,
+                args=(format_type,),
+                name=f"bundesbank-refresh-{format_type}",
+            )
+            self._refresh_threads[format_type] = thread
+            thread.start()
+
+    def _refresh_quietly(self, format_type: str) -> None:
+        try:
+            # Another process already refreshing is as good as doing it here
+            self.refresh(format_type, wait=False)
+        except Exception:
+            # Serving stale data is fine; the next run will try again
+            pass
+
+    def wait_for_refresh(self, timeout: Optional[float] = None) -> None:
+        """Wait for background refresh threads started by this downloader."""
+        with self._refresh_lock:
+            threads = list(self._refresh_threads.values())
+        for thread in threads:
+            thread.join(timeout)
+
+    def close(self) -> None:
+        """Close persistent connections of the transport."""
+        self.transport.close()
 
     def clear_cache(self) -> None:
-        """Clear all cached data files."""
+        """Clear all cached data files and stored versions (lock files are kept for running processes)."""
         for file in self.cache_dir.glob("bundesbank_data.*"):
-            file.unlink()
+            if file.suffix != ".lock":
+                file.unlink()
+        self.snapshots.clear()
 
     def get_cache_info(self) -> dict:
-        """Get information about cached files."""
+        """Get information about cached files and all stored versions."""
         info = {}
         for format_type in ["csv", "txt", "xml"]:
             cache_path = self._get_cache_path(format_type)
+            versions = [
+                {
+                    "sha256": s.sha256,
+                    "valid_from": s.version_date.isoformat(),
+                    "etag": s.etag or "N/A",
+                    "size": s.size,
+                    "added": time.ctime(s.added),
+                    "last_used": time.ctime(s.last_used),
+                    "path": str(self.snapshots.archive_path(s.sha256)),
+                }
+                for s in self.snapshots.snapshots(format_type)
+            ]
+            stats = self.stats.summary(format_type)
             if cache_path.exists():
                 stat = cache_path.stat()
                 metadata = self._load_cache_metadata(format_type)
@@ -353,9 +1081,15 @@ class BundesbankDownloader:
                     "size": stat.st_size,
                     "modified": time.ctime(stat.st_mtime),
                     "age_hours": (time.time() - stat.st_mtime) / 3600,
+                    "url": metadata.get("url", "N/A"),
                     "etag": metadata.get("etag", "N/A"),
+                    "sha256": metadata.get("sha256", "N/A"),
                     "last_modified": metadata.get("last_modified", "N/A"),
+                    "versions": versions,
+                    "stats": stats,
                 }
+            elif versions or stats["requests"]:
+                info[format_type] = {"versions": versions, "stats": stats}
         return info
 
 
@@ -375,9 +1109,57 @@ def download_bundesbank_data(
         check_version: Whether to check for newer versions online
 
     Returns:
-        Path to the downloaded data file
+        Path to the cached ZIP archive containing the data file
     """
     downloader = BundesbankDownloader(cache_dir)
     return downloader.get_data_file(
         format_type, force_download, check_version=check_version
     )
+
+
+def _format_limit(value: Optional[int]) -> str:
+    return "none" if value is None else str(value)
+
+
+def _parse_limit(value: str) -> Optional[int]:
+    return None if value.lower() == "none" else int(value)
+
+
+def _main(argv=None) -> int:
+    """Entry point for detached background refreshes (python -m gen_ibans.downloader)."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Refresh cached Bundesbank data")
+    parser.add_argument("--refresh", choices=["csv", "txt", "xml"], default="csv")
+    parser.add_argument("--cache-dir", default=None)
+    parser.add_argument("--mirror", action="append", default=[])
+    parser.add_argument("--timeout", type=float, default=BundesbankDownloader.TIMEOUT)
+    parser.add_argument(
+        "--index-timeout", type=float, default=BundesbankDownloader.INDEX_TIMEOUT
+    )
+    parser.add_argument("--hedge-delay", type=float, default=None)
+    parser.add_argument(
+        "--max-snapshots", type=_parse_limit, default=BundesbankDownloader.MAX_SNAPSHOTS
+    )
+    parser.add_argument("--max-snapshot-bytes", type=_parse_limit, default=None)
+    args = parser.parse_args(argv)
+    downloader = BundesbankDownloader(
+        args.cache_dir,
+        mirrors=args.mirror,
+        timeout=args.timeout,
+        index_timeout=args.index_timeout,
+        hedge_delay=args.hedge_delay,
+        max_snapshots=args.max_snapshots,
+        max_snapshot_bytes=args.max_snapshot_bytes,
+    )
+    try:
+        downloader.refresh(args.refresh, wait=False)
+    except Exception:
+        return 1
+    finally:
+        downloader.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main())
@@ -27,12 +27,31 @@ SOFTWARE.
 
 import csv
 import random
-from typing import List, Optional, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Union
 from dataclasses import dataclass, field
 from datetime import date
 from faker import Faker
 from enum import Enum
 
+from .bank_index import BankIndex
+from .bank_updates import (
+    BankDelta,
+    active_banks,
+    apply_bank_update,
+    resolve_successor,
+    successor_map,
+)
+from .data_files import (
+    data_format,
+    is_zip_path,
+    iter_data_lines,
+    open_data_file,
+    resolve_zip_member,
+)
+
+if TYPE_CHECKING:  # pragma: no cover - imported for type hints only
+    from .bank_filter import BankFilter
+
 
 class EntityType(Enum):
     """Enum for entity types."""
@@ -60,6 +79,8 @@ class PersonalInfo:
     birth_date: date  # Birth date for natural persons
     wid: Optional[str] = None  # WID (only for economically active persons)
     is_economically_active: bool = False  # Whether person is economically active
+    # ID of the base person in the generator's person pool (shared by all variants)
+    person_id: Optional[int] = field(default=None, compare=False)
 
     def __post_init__(self):
         # Backward compatibility shim for older constructor order used in some tests
@@ -107,6 +128,8 @@ class LegalEntity:
     city: str
     postal_code: str
     wid: str
+    # Sequential ID assigned by the generator
+    entity_id: Optional[int] = field(default=None, compare=False)
 
     @property
     def full_address(self) -> str:
@@ -286,16 +309,60 @@ class GeneratorConfig:
         return 1  # fallback
 
 
+def _parse_change_fields(
+    record_number: Optional[str],
+    change_flag: Optional[str],
+    deletion: Optional[str],
+    successor: Optional[str],
+) -> dict:
+    """Normalize the Bundesbank change columns into BankInfo keyword arguments."""
+    record_number = (record_number or "").strip() or None
+    change_flag = (change_flag or "").strip().upper() or None
+    successor = (successor or "").strip()
+    return {
+        "record_number": record_number.zfill(6) if record_number else None,
+        "change_flag": change_flag,
+        "deleted": (deletion or "").strip() == "1",
+        # "00000000" means no successor
+        "successor_blz": successor if successor.strip("0") else None,
+    }
+
+
 class BankInfo:
     """Represents bank information from the CSV."""
 
-    def __init__(self, bankleitzahl: str, bic: str, name: str, method_code: Optional[str] = None):
+    def __init__(
+        self,
+        bankleitzahl: str,
+        bic: str,
+        name: str,
+        method_code: Optional[str] = None,
+        merkmal: Optional[str] = None,
+        postal_code: Optional[str] = None,
+        city: Optional[str] = None,
+        record_number: Optional[str] = None,
+        change_flag: Optional[str] = None,
+        deleted: bool = False,
+        successor_blz: Optional[str] = None,
+    ):
         self.bankleitzahl = bankleitzahl
         self.bic = bic
         self.name = name
         # Bundesbank Prüfzifferberechnungsmethode (account number check digit method)
         # String like "00", "01", ..., or other codes per Bundesbank spec
         self.method_code = method_code
+        # Merkmal: "1" for the bank itself, "2" for branches sharing the BLZ
+        self.merkmal = merkmal
+        self.postal_code = postal_code
+        self.city = city
+        # Datensatznummer: stable record ID across Bundesbank releases
+        self.record_number = record_number
+        # Änderungskennzeichen: A (added), D (deleted), M (modified), U (unchanged)
+        self.change_flag = change_flag
+        # Bankleitzahllöschung: BLZ is marked for deletion
+        self.deleted = deleted
+        # Nachfolge-Bankleitzahl: successor BLZ for deleted banks (None if not set)
+        self.successor_blz = successor_blz
 
     def __repr__(self):
         return (
@@ -310,9 +377,11 @@ class IBANGenerator:
 
     def __init__(
         self,
-        csv_path: str,
+        csv_path: Optional[str] = None,
         seed: Optional[int] = None,
         config: Optional[GeneratorConfig] = None,
+        banks: Optional[Sequence[BankInfo]] = None,
+        drop_deleted_banks: bool = False,
     ):
         """
         Initialize the IBAN generator.
@@ -321,8 +390,18 @@ class IBANGenerator:
             csv_path: Path to the Bundesbank CSV file
             seed: Optional PRNG seed for deterministic generation
             config: Optional configuration for probability distributions
+            banks: Already loaded bank table (e.g. an attached SharedBankTable);
+                used instead of parsing csv_path
+            drop_deleted_banks: Skip records flagged as deleted
+                (Bankleitzahllöschung) here and in update_banks(); their
+                successor BLZ is still known
+
+        Raises:
+            ValueError: If neither csv_path nor banks is given
         """
-        self.banks: List[BankInfo] = []
+        if csv_path is None and banks is None:
+            raise ValueError("Either csv_path or banks must be provided")
+        self.banks: Sequence[BankInfo] = []
         self.config = config or GeneratorConfig()
         # If no seed provided, generate one for reproducibility tracking
         if seed is None:
@@ -342,49 +421,157 @@ class IBANGenerator:
         self.person_pool: List[
             dict
         ] = []  # List of {base_person, max_uses, current_uses, variants}
+        # Last assigned base person / legal entity IDs (stable per seed)
+        self._last_person_id = 0
+        self._last_entity_id = 0
+
+        if banks is not None:
+            self.banks = banks
+        else:
+            self._load_banks(csv_path)
+        # Nachfolge-Bankleitzahl per BLZ, extended by update_banks()
+        self.successors: Dict[str, str] = successor_map(self.banks)
+        self.drop_deleted_banks = drop_deleted_banks
+        if drop_deleted_banks:
+            self.banks = active_banks(self.banks)
+        # Index over the full loaded table; bank filters are resolved and
+        # cached here, so the views survive filtered lists assigned to banks
+        self._source_index = BankIndex(self.banks)
+        # Lookup index over self.banks (rebuilt lazily if self.banks is replaced)
+        self._bank_index = self._source_index
+
+    @property
+    def bank_index(self) -> BankIndex:
+        """Return the lookup index for the current bank list.
+
+        Callers (e.g. CLI filters) may replace ``self.banks``; the index is
+        rebuilt on the next access in that case.
+        """
+        index = self._bank_index
+        if index.banks is not self.banks or len(index) != len(self.banks):
+            source = self._source_index
+            if source.banks is self.banks and len(source) == len(self.banks):
+                index = source
+            else:
+                index = BankIndex(self.banks)
+            self._bank_index = index
+        return index
+
+    @property
+    def source_index(self) -> BankIndex:
+        """Return the lookup index over the full loaded bank table.
+
+        Unlike ``bank_index`` it is not affected by assigning a filtered list
+        to ``self.banks``; it only changes with ``update_banks()``.
+        """
+        return self._source_index
+
+    def select_banks(self, bank_filter: "BankFilter") -> List[BankInfo]:
+        """Return the loaded banks matching a filter, in table order.
 
-        self._load_banks(csv_path)
+        The filter is always resolved against the full table and its result
+        is cached on ``source_index``, so repeating an equal filter is free
+        even after ``self.banks`` was replaced by a previous result.
+
+        Raises:
+            re.error: If one of the filter's regex patterns is invalid
+        """
+        return bank_filter.apply(self._source_index)
+
+    def get_bank_by_blz(self, bankleitzahl: str) -> Optional[BankInfo]:
+        """Return the bank for a BLZ, or None if it is not loaded."""
+        return self.bank_index.get_by_blz(bankleitzahl)
+
+    def get_banks_by_bic(self, bic: str) -> List[BankInfo]:
+        """Return all loaded banks with the given BIC (BIC8 or BIC11)."""
+        return self.bank_index.find_by_bic(bic)
+
+    def resolve_blz(self, bankleitzahl: str) -> str:
+        """Return the current BLZ for a possibly deleted BLZ (via Nachfolge-BLZ)."""
+        return resolve_successor(bankleitzahl.strip(), self.successors)
+
+    def get_current_bank(self, bankleitzahl: str) -> Optional[BankInfo]:
+        """Return the bank for a BLZ, following successors of deleted BLZs."""
+        return self.get_bank_by_blz(self.resolve_blz(bankleitzahl))
+
+    def update_banks(self, file_path: str) -> BankDelta:
+        """
+        Apply a new Bundesbank release as a delta to the loaded bank table.
+
+        Successor BLZs are remembered and unchanged records keep their
+        existing objects. Records flagged as deleted are kept, as in a full
+        load, unless the generator drops deleted banks. The delta
+        is applied to the full loaded table; bank filters applied before must
+        be re-applied by the caller.
+
+        Args:
+            file_path: New release (CSV, TXT, XML or ZIP archive)
+
+        Returns:
+            BankDelta describing added, deleted and modified BLZs
+        """
+        current = self._source_index.banks
+        self.banks = []
+        try:
+            self._load_banks(file_path)
+            update = self.banks
+        finally:
+            self.banks = current
+
+        banks, delta = apply_bank_update(
+            current, update, self.successors, drop_deleted=self.drop_deleted_banks
+        )
+        # A new table invalidates the lookup indexes and cached filter views
+        self.banks = banks
+        self._source_index = BankIndex(banks)
+        self.successors = delta.successors
+        return delta
 
     def _load_banks(self, file_path: str) -> None:
-        """Load bank data from CSV, TXT, or XML file."""
-        from pathlib import Path
+        """Load bank data from CSV, TXT, or XML file, or from a ZIP archive containing one.
 
-        file_extension = Path(file_path).suffix.lower()
+        ZIP members are decompressed while parsing; nothing is extracted to disk.
+        """
+        import zipfile
 
-        if file_extension == ".csv":
-            self._load_banks_csv(file_path)
-        elif file_extension == ".txt":
-            self._load_banks_txt(file_path)
-        elif file_extension == ".xml":
-            self._load_banks_xml(file_path)
+        member = None
+        if is_zip_path(file_path):
+            try:
+                member = resolve_zip_member(file_path)
+            except (OSError, zipfile.BadZipFile) as e:
+                raise ValueError(f"Error opening ZIP archive {file_path}: {e}") from e
+
+        file_extension = data_format(file_path, member)
+
+        if file_extension == "csv":
+            self._load_banks_csv(file_path, member)
+        elif file_extension == "txt":
+            self._load_banks_txt(file_path, member)
+        elif file_extension == "xml":
+            self._load_banks_xml(file_path, member)
         else:
             # Try to detect format by trying CSV first, then TXT
             try:
-                self._load_banks_csv(file_path)
+                self._load_banks_csv(file_path, member)
             except Exception:
                 try:
-                    self._load_banks_txt(file_path)
+                    self._load_banks_txt(file_path, member)
                 except Exception:
                     raise ValueError(
                         f"Unsupported file format or unable to parse file: {file_path}"
                     )
 
-    def _load_banks_csv(self, csv_path: str) -> None:
-        """Load bank data from CSV file."""
+    def _load_banks_csv(self, csv_path: str, member: Optional[str] = None) -> None:
+        """Load bank data from CSV file (or CSV member of a ZIP archive)."""
         # Try different encodings commonly used for German text files
         encodings = ["utf-8", "iso-8859-1", "windows-1252", "cp1252"]
+        loaded_before = len(self.banks)
 
         for encoding in encodings:
             try:
-                with open(csv_path, "r", encoding=encoding) as file:
-                    # Skip BOM if present
-                    content = file.read()
-                    if content.startswith("\ufeff"):
-                        content = content[1:]
-
-                    # Parse CSV
-                    lines = content.splitlines()
-                    reader = csv.reader(lines, delimiter=";")
+                with open_data_file(csv_path, encoding, member) as file:
+                    # Parse CSV line by line (BOM skipped by iter_data_lines)
+                    reader = csv.reader(iter_data_lines(file), delimiter=";")
 
                     # Read and analyze header
                     header = next(reader, None)
@@ -392,6 +579,13 @@ class IBANGenerator:
                     bic_idx = 7
                     name_idx = 2
                     blz_idx = 0
+                    merkmal_idx = None
+                    plz_idx = None
+                    ort_idx = None
+                    record_idx = None
+                    change_idx = None
+                    deletion_idx = None
+                    successor_idx = None
                     if header:
                         header_norm = [h.strip().strip('"').lower() for h in header]
                         # Common header name variants for the method column
@@ -427,11 +621,45 @@ class IBANGenerator:
                                     fallback_name_idx = i
                             elif col in ("bankleitzahl", "blz"):
                                 blz_idx = i
+                            elif col == "merkmal":
+                                merkmal_idx = i
+                            elif col == "plz":
+                                plz_idx = i
+                            elif col == "ort":
+                                ort_idx = i
+                            elif col in ("datensatznummer", "datensatz-nr", "dsnr"):
+                                record_idx = i
+                            elif col in (
+                                "änderungskennzeichen",
+                                "aenderungskennzeichen",
+                                "aenderungskennz",
+                            ):
+                                change_idx = i
+                            elif col in (
+                                "bankleitzahllöschung",
+                                "bankleitzahl-löschung",
+                                "bankleitzahlloeschung",
+                                "blzloesch",
+                            ):
+                                deletion_idx = i
+                            elif col in (
+                                "nachfolge-bankleitzahl",
+                                "nachfolgebankleitzahl",
+                                "nachfolge-blz",
+                                "nachfolgeblz",
+                            ):
+                                successor_idx = i
                         if bezeichnung_idx is not None:
                             name_idx = bezeichnung_idx
                         elif fallback_name_idx is not None:
                             name_idx = fallback_name_idx
 
+                    def _opt(row, idx):
+                        # Optional column value, None if missing or empty
+                        if idx is not None and len(row) > idx:
+                            return row[idx].strip('"').strip() or None
+                        return None
+
                     for row in reader:
                         if len(row) > max(bic_idx, name_idx, blz_idx):
                             bankleitzahl = row[blz_idx].strip('"')
@@ -443,13 +671,30 @@ class IBANGenerator:
 
                             # Only include banks with valid BIC codes
                             if bic and len(bic) >= 8:
-                                self.banks.append(BankInfo(bankleitzahl, bic, name, method_code))
+                                self.banks.append(
+                                    BankInfo(
+                                        bankleitzahl,
+                                        bic,
+                                        name,
+                                        method_code,
+                                        merkmal=_opt(row, merkmal_idx),
+                                        postal_code=_opt(row, plz_idx),
+                                        city=_opt(row, ort_idx),
+                                        **_parse_change_fields(
+                                            _opt(row, record_idx),
+                                            _opt(row, change_idx),
+                                            _opt(row, deletion_idx),
+                                            _opt(row, successor_idx),
+                                        ),
+                                    )
+                                )
 
                     # If we get here, the encoding worked
                     return
 
             except UnicodeDecodeError:
-                # Try next encoding
+                # Drop rows parsed before the decode error and try next encoding
+                del self.banks[loaded_before:]
                 continue
             except Exception as e:
                 raise ValueError(f"Error loading CSV file: {e}")
@@ -459,21 +704,16 @@ class IBANGenerator:
             f"Could not decode CSV file with any of the supported encodings: {encodings}"
         )
 
-    def _load_banks_txt(self, txt_path: str) -> None:
-        """Load bank data from TXT file (fixed-width format)."""
+    def _load_banks_txt(self, txt_path: str, member: Optional[str] = None) -> None:
+        """Load bank data from TXT file (fixed-width format), optionally a ZIP member."""
         # Try different encodings commonly used for German text files
         encodings = ["utf-8", "iso-8859-1", "windows-1252", "cp1252"]
+        loaded_before = len(self.banks)
 
         for encoding in encodings:
             try:
-                with open(txt_path, "r", encoding=encoding) as file:
-                    content = file.read()
-                    if content.startswith("\ufeff"):
-                        content = content[1:]
-
-                    lines = content.splitlines()
-
-                    for line in lines:
+                with open_data_file(txt_path, encoding, member) as file:
+                    for line in iter_data_lines(file):
                         if len(line) >= 139:  # Minimum length for a valid record
                             # Parse fixed-width format
                             # Positions based on analysis of the txt file:
@@ -485,7 +725,15 @@ class IBANGenerator:
                             # 139+: BIC code and possibly method
 
                             bankleitzahl = line[0:8].strip()
+                            merkmal = line[8:9].strip() or None
                             name = line[9:67].strip()
+                            # PLZ (5 digits) and Ort follow the name in the official layout
+                            postal_code = line[67:72]
+                            city = None
+                            if postal_code.isdigit():
+                                city = line[72:107].strip() or None
+                            else:
+                                postal_code = None
 
                             # Extract method if present (just before the tail fields, depends on variant)
                             method_code = None
@@ -497,6 +745,7 @@ class IBANGenerator:
                             # Look for BIC pattern (8 to 11 uppercase letters/digits)
                             import re
 
+                            change_fields = {}
                             bic_match = re.search(r"[A-Z0-9]{8,11}", remaining)
                             if bic_match:
                                 bic = bic_match.group()
@@ -505,6 +754,16 @@ class IBANGenerator:
                                 method_match = re.search(r"^(\d{2})", after_bic)
                                 if method_match:
                                     method_code = method_match.group(1)
+                                    # Tail: Datensatznummer, Änderungskennzeichen,
+                                    # Bankleitzahllöschung, Nachfolge-Bankleitzahl
+                                    tail_match = re.match(
+                                        r"(\d{5,6})([ADMU])([01])(\d{8})",
+                                        after_bic[method_match.end() :],
+                                    )
+                                    if tail_match:
+                                        change_fields = _parse_change_fields(
+                                            *tail_match.groups()
+                                        )
 
                             # Only include banks with valid BIC codes and bank codes
                             if (
@@ -514,13 +773,25 @@ class IBANGenerator:
                                 and bic
                                 and len(bic) >= 8
                             ):
-                                self.banks.append(BankInfo(bankleitzahl, bic, name, method_code))
+                                self.banks.append(
+                                    BankInfo(
+                                        bankleitzahl,
+                                        bic,
+                                        name,
+                                        method_code,
+                                        merkmal=merkmal,
+                                        postal_code=postal_code,
+                                        city=city,
+                                        **change_fields,
+                                    )
+                                )
 
                     # If we get here, the encoding worked
                     return
 
             except UnicodeDecodeError:
-                # Try next encoding
+                # Drop rows parsed before the decode error and try next encoding
+                del self.banks[loaded_before:]
                 continue
             except Exception as e:
                 raise ValueError(f"Error loading TXT file: {e}")
@@ -530,64 +801,90 @@ class IBANGenerator:
             f"Could not decode TXT file with any of the supported encodings: {encodings}"
         )
 
-    def _load_banks_xml(self, xml_path: str) -> None:
-        """Load bank data from XML file."""
+    def _load_banks_xml(self, xml_path: str, member: Optional[str] = None) -> None:
+        """Load bank data from XML file (or XML member of a ZIP archive)."""
         import xml.etree.ElementTree as ET
 
+        def _elem_text(elem) -> Optional[str]:
+            if elem is not None and elem.text:
+                return elem.text.strip() or None
+            return None
+
         # Try different encodings commonly used for German text files
         encodings = ["utf-8", "iso-8859-1", "windows-1252", "cp1252"]
+        loaded_before = len(self.banks)
+
+        # Define namespace for the XML
+        namespace = {"ns": "urn:BBk:BLZ:xsd:BLZDat"}
+        entry_tag = "{urn:BBk:BLZ:xsd:BLZDat}BLZEintrag"
 
         for encoding in encodings:
             try:
-                # Parse the XML file with explicit encoding
-                with open(xml_path, "r", encoding=encoding) as file:
-                    content = file.read()
-                    if content.startswith("\ufeff"):
-                        content = content[1:]
-
-                # Parse XML content
-                root = ET.fromstring(content)
-
-                # Define namespace for the XML
-                namespace = {"ns": "urn:BBk:BLZ:xsd:BLZDat"}
-
-                # Find all BLZEintrag elements (bank entries)
-                entries = root.findall(".//ns:BLZEintrag", namespace)
-
-                for entry in entries:
-                    # Extract bank data
-                    blz_elem = entry.find("ns:BLZ", namespace)
-                    name_elem = entry.find("ns:Bezeichnung", namespace)
-                    bic_elem = entry.find("ns:BIC", namespace)
-                    method_elem = entry.find("ns:PruefZiffMeth", namespace)
-
-                    if (
-                        blz_elem is not None
-                        and name_elem is not None
-                        and bic_elem is not None
-                    ):
-                        bankleitzahl = blz_elem.text.strip() if blz_elem.text else ""
-                        name = name_elem.text.strip() if name_elem.text else ""
-                        bic = bic_elem.text.strip() if bic_elem.text else ""
-                        method_code = (
-                            method_elem.text.strip() if method_elem is not None and method_elem.text else None
+                # Parse the XML stream incrementally with explicit encoding
+                with open_data_file(xml_path, encoding, member) as file:
+                    # Bank entries are handled as soon as they are complete
+                    # and cleared afterwards to keep memory flat
+                    for _, entry in ET.iterparse(file, events=("end",)):
+                        if entry.tag != entry_tag:
+                            continue
+
+                        # Extract bank data
+                        blz_elem = entry.find("ns:BLZ", namespace)
+                        name_elem = entry.find("ns:Bezeichnung", namespace)
+                        bic_elem = entry.find("ns:BIC", namespace)
+                        method_elem = entry.find("ns:PruefZiffMeth", namespace)
+                        merkmal_elem = entry.find("ns:Merkmal", namespace)
+                        plz_elem = entry.find("ns:PLZ", namespace)
+                        ort_elem = entry.find("ns:Ort", namespace)
+                        change_fields = _parse_change_fields(
+                            _elem_text(entry.find("ns:DsNr", namespace)),
+                            _elem_text(entry.find("ns:Aenderungskennz", namespace)),
+                            _elem_text(entry.find("ns:BLZLoesch", namespace)),
+                            _elem_text(entry.find("ns:NachfolgeBLZ", namespace)),
                         )
 
-                        # Only include banks with valid BIC codes and bank codes
                         if (
-                            bankleitzahl
-                            and len(bankleitzahl) == 8
-                            and bankleitzahl.isdigit()
-                            and bic
-                            and len(bic) >= 8
+                            blz_elem is not None
+                            and name_elem is not None
+                            and bic_elem is not None
                         ):
-                            self.banks.append(BankInfo(bankleitzahl, bic, name, method_code))
+                            bankleitzahl = (
+                                blz_elem.text.strip() if blz_elem.text else ""
+                            )
+                            name = name_elem.text.strip() if name_elem.text else ""
+                            bic = bic_elem.text.strip() if bic_elem.text else ""
+                            method_code = (
+                                method_elem.text.strip() if method_elem is not None and method_elem.text else None
+                            )
+
+                            # Only include banks with valid BIC codes and bank codes
+                            if (
+                                bankleitzahl
+                                and len(bankleitzahl) == 8
+                                and bankleitzahl.isdigit()
+                                and bic
+                                and len(bic) >= 8
+                            ):
+                                self.banks.append(
+                                    BankInfo(
+                                        bankleitzahl,
+                                        bic,
+                                        name,
+                                        method_code,
+                                        merkmal=_elem_text(merkmal_elem),
+                                        postal_code=_elem_text(plz_elem),
+                                        city=_elem_text(ort_elem),
+                                        **change_fields,
+                                    )
+                                )
+                        entry.clear()
 
                 # If we get here, the encoding worked
                 return
 
             except UnicodeDecodeError:
-                # Try next encoding
+                # Drop entries parsed before the decode error and try next encoding
+                del self.banks[loaded_before:]
                 continue
             except ET.ParseError as e:
                 raise ValueError(f"Error parsing XML file: {e}")
@@ -749,6 +1046,7 @@ class IBANGenerator:
             birth_date=base_person.birth_date,  # Birth date stays the same
             wid=wid,  # New WID for different economic activity
             is_economically_active=is_active,
+            person_id=base_person.person_id,
         )
 
     def _create_new_person_with_pool_entry(
@@ -777,6 +1075,8 @@ class IBANGenerator:
             wid=None,  # Will be determined per variant
             is_economically_active=False,  # Will be determined per variant
         )
+        self._last_person_id += 1
+        base_person.person_id = self._last_person_id
 
         # Add to person pool
         person_entry = {
@@ -802,13 +1102,16 @@ class IBANGenerator:
 
     def _generate_legal_entity(self) -> LegalEntity:
         """Generate legal entity information using Faker."""
-        return LegalEntity(
+        entity = LegalEntity(
             name=self.faker.company(),
             street_address=self.faker.street_address(),
             city=self.faker.city(),
             postal_code=self.faker.postcode(),
             wid=self._generate_wid(is_legal_entity=True),
         )
+        self._last_entity_id += 1
+        entity.entity_id = self._last_entity_id
+        return entity
 
     def _generate_account_holders(self) -> List[AccountHolder]:
         """Generate list of account holders based on configuration."""
@@ -843,18 +1146,22 @@ class IBANGenerator:
                 )
         return beneficiaries
 
-    def generate_iban(self) -> IBANRecord:
+    def generate_iban(self, bank: Optional[BankInfo] = None) -> IBANRecord:
         """
         Generate a single valid German IBAN with account holders and beneficial owners.
 
+        Args:
+            bank: Optional bank to use; if None, a bank is chosen randomly
+
         Returns:
             IBANRecord object containing IBAN, bank info, account holders, and beneficial owners
         """
-        if not self.banks:
-            raise ValueError("No valid banks loaded from CSV")
+        if bank is None:
+            if not self.banks:
+                raise ValueError("No valid banks loaded from CSV")
 
-        # Randomly select a bank
-        bank = self.rng.choice(self.banks)
+            # Randomly select a bank
+            bank = self.rng.choice(self.banks)
 
         # Generate account number valid per bank's check-digit method (if available)
         account_number = self._generate_account_number_for_bank(bank)
@@ -928,17 +1235,38 @@ class IBANGenerator:
 
         return ibans
 
+    def generate_iban_for_bic(self, bic: str) -> IBANRecord:
+        """
+        Generate a single IBAN for a bank with the given BIC.
+
+        Args:
+            bic: BIC8 or BIC11 of the target bank
+
+        Returns:
+            IBANRecord for one of the banks sharing this BIC
+
+        Raises:
+            ValueError: If no loaded bank has this BIC
+        """
+        banks = self.get_banks_by_bic(bic)
+        if not banks:
+            raise ValueError(f"No bank loaded for BIC: {bic}")
+        bank = banks[0] if len(banks) == 1 else self.rng.choice(banks)
+        return self.generate_iban(bank)
+
     def get_bank_count(self) -> int:
         """Return the number of loaded banks."""
         return len(self.banks)
 
 
-def validate_iban(iban: str) -> bool:
+def validate_iban(iban: str, bank_index: Optional[BankIndex] = None) -> bool:
     """
     Validate a German IBAN using the MOD-97 algorithm.
 
     Args:
         iban: The IBAN string to validate
+        bank_index: Optional bank index; if given, the BLZ must be known and the
+            account number must pass the bank's check-digit method
 
     Returns:
         True if valid, False otherwise
@@ -967,7 +1295,18 @@ def validate_iban(iban: str) -> bool:
         # Calculate MOD-97
         remainder = int(rearranged) % 97
 
-        return remainder == 1
+        if remainder != 1:
+            return False
+
+        if bank_index is not None:
+            bank = bank_index.get_by_blz(bankleitzahl)
+            if bank is None:
+                return False
+            from .methods import get_validator
+
+            return get_validator(bank.method_code)(bankleitzahl, account_number)
+
+        return True
 
     except (ValueError, IndexError):
         return False
@@ -36,6 +36,16 @@ def get_validator(method_code: Optional[str]) -> Validator:
     return lambda blz, acc: len(acc) == 10 and acc.isdigit()
 
 
+def is_implemented(method_code: Optional[str]) -> bool:
+    """Return True if a dedicated validator is registered for the method code."""
+    return bool(method_code) and method_code in _registry
+
+
+def implemented_methods() -> list[str]:
+    """Return the sorted list of method codes with a registered validator."""
+    return sorted(_registry)
+
+
 def generate_valid_account(blz: str, rng: random.Random, method_code: Optional[str]) -> str:
     """Generate a valid 10-digit account number according to the bank's method.
 
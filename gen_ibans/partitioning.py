@@ -0,0 +1,280 @@
+"""
+Partitioned output
+
+Routes each record to one of several output files by BLZ, BIC or
+check-digit method while streaming, with a bounded number of open files.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import re
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Type, Union
+
+from .compression import CompressedFile
+from .iban_generator import IBANRecord
+from .splitting import split_name
+from .writers import RecordWriter, Sink
+
+PARTITION_KEYS: Dict[str, Callable[[IBANRecord], Optional[str]]] = {
+    "blz": lambda record: record.bank.bankleitzahl,
+    "bic": lambda record: record.bank.bic,
+    "method": lambda record: record.bank.method_code,
+}
+
+# Pending bytes per partition before they are written to its file.
+PARTITION_BUFFER_SIZE = 1 << 16
+# Partition files kept open at the same time.
+DEFAULT_MAX_OPEN_PARTITIONS = 64
+
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+class PartitionFileSink(Sink):
+    """Buffered file sink that can release its handle and reopen later.
+
+    The file is created on the first write and reopened in append mode
+    after :meth:`suspend`, so a partition's document continues where it
+    stopped. ``on_open`` is called whenever the file is (re)opened.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        buffer_size: int = PARTITION_BUFFER_SIZE,
+        *,
+        on_open: Optional[Callable[["PartitionFileSink"], None]] = None,
+        compression: Optional[str] = None,
+        compress_level: Optional[int] = None,
+        compress_threads: int = 0,
+    ):
+        super().__init__(buffer_size)
+        self.path = Path(path)
+        self.compression = compression
+        self.compress_level = compress_level
+        self.compress_threads = compress_threads
+        self._on_open = on_open
+        self._fp = None
+        self._created = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._fp is not None
+
+    def _open(self) -> None:
+        if self.compression:
+            self._fp = CompressedFile(
+                self.path,
+                self.compression,
+                self.compress_level,
+                self.compress_threads,
+                append=self._created,
+            )
+        else:
+            self._fp = open(self.path, "ab" if self._created else "wb", buffering=0)
+        self._created = True
+        if self._on_open is not None:
+            self._on_open(self)
+
+    def _write_raw(self, data: bytes) -> None:
+        if self._fp is None:
+            self._open()
+        self._fp.write(data)
+
+    def suspend(self) -> None:
+        """Write pending bytes and close the file handle."""
+        self.flush()
+        if self._fp is not None:
+            fp, self._fp = self._fp, None
+            fp.close()
+
+    def close(self) -> None:
+        if not self._created and not self._pending:
+            self._open()  # Empty partitions still get a file
+        self.suspend()
+
+
+class PartitionWriter:
+    """Writes each record to the partition file selected by a bank key.
+
+    With ``partitions`` the key is hashed (CRC-32, stable across runs) into
+    that many files named ``<name>-<by>-bucket-0000<suffix>``; otherwise
+    there is one file per key value, ``<name>-<by>-<key><suffix>``. Every
+    partition gets one document (header and footer included), but at most
+    ``max_open`` partitions have a live writer with a buffer and an open
+    file. The least recently used one is suspended: its buffered output is
+    written, the file is closed and the writer dropped. A new writer
+    continues the document in append mode when the partition receives more
+    data. Writers that cannot be resumed (Parquet) are kept with their row
+    group flushed.
+    """
+
+    def __init__(
+        self,
+        writer_cls: Type[RecordWriter],
+        output: Union[str, Path],
+        *,
+        by: str,
+        partitions: Optional[int] = None,
+        max_open: int = DEFAULT_MAX_OPEN_PARTITIONS,
+        buffer_size: int = PARTITION_BUFFER_SIZE,
+        compression: Optional[str] = None,
+        compress_level: Optional[int] = None,
+        compress_threads: int = 0,
+        **kwargs,
+    ):
+        if writer_cls.directory or not writer_cls.uses_sinks:
+            raise ValueError(
+                f"Partitioning is not supported for {writer_cls.name} output"
+            )
+        if by not in PARTITION_KEYS:
+            raise ValueError(
+                f"Unsupported partition key: {by} "
+                f"(supported: {', '.join(PARTITION_KEYS)})"
+            )
+        if partitions is not None and partitions < 1:
+            raise ValueError("partitions must be a positive integer")
+        if max_open < 1:
+            raise ValueError("max_open must be a positive integer")
+        self.writer_cls = writer_cls
+        self.label = writer_cls.label
+        self.output = Path(output)
+        self.by = by
+        self.partitions = partitions
+        self.max_open = max_open
+        self.buffer_size = buffer_size
+        self.sink_options = {
+            "compression": compression,
+            "compress_level": compress_level,
+            "compress_threads": compress_threads,
+        }
+        self.writer_kwargs = kwargs
+        self.count = 0
+        # Live writers in LRU order; the oldest is suspended beyond max_open
+        self.writers: "OrderedDict[object, RecordWriter]" = OrderedDict()
+        # Every partition's file and its record count, live or suspended
+        self.sinks: Dict[object, PartitionFileSink] = {}
+        self._counts: Dict[object, int] = {}
+        # Suspended writers that cannot be recreated (see RecordWriter.resumable)
+        self._parked: Dict[object, RecordWriter] = {}
+        self._key = PARTITION_KEYS[by]
+        self._closed = False
+
+    def partition_path(self, partition) -> Path:
+        base, suffix = split_name(self.output)
+        if self.partitions is not None:
+            name = f"bucket-{partition:04d}"
+        else:
+            name = _UNSAFE_CHARS.sub("_", partition) if partition else "none"
+        return self.output.with_name(f"{base}-{self.by}-{name}{suffix}")
+
+    @property
+    def paths(self) -> List[Path]:
+        return [sink.path for sink in self.sinks.values()]
+
+    def _writer(self, partition) -> RecordWriter:
+        writer = self._parked.pop(partition, None)
+        if writer is None:
+            writer = self._new_writer(partition)
+        self.writers[partition] = writer
+        while len(self.writers) > self.max_open:
+            self._suspend(*self.writers.popitem(last=False))
+        return writer
+
+    def _new_writer(self, partition) -> RecordWriter:
+        sink = self.sinks.get(partition)
+        if sink is not None:
+            writer = self.writer_cls([sink], **self.writer_kwargs)
+            return writer.resume(self._counts[partition])
+        sink = PartitionFileSink(
+            self.partition_path(partition), self.buffer_size, **self.sink_options
+        )
+        self.sinks[partition] = sink
+        return self.writer_cls([sink], **self.writer_kwargs).open()
+
+    def _suspend(self, partition, writer: RecordWriter) -> None:
+        writer.suspend()
+        writer.sinks[0].suspend()
+        self._counts[partition] = writer.count
+        if not writer.resumable:
+            self._parked[partition] = writer
+
+    def open(self) -> "PartitionWriter":
+        return self
+
+    def write(self, record: IBANRecord) -> None:
+        partition = self._key(record) or ""
+        if self.partitions is not None:
+            partition = zlib.crc32(partition.encode("utf-8")) % self.partitions
+        writer = self.writers.get(partition)
+        if writer is None:
+            writer = self._writer(partition)
+        else:
+            self.writers.move_to_end(partition)
+        writer.write(record)
+        self.count += 1
+
+    def write_all(self, records) -> None:
+        for record in records:
+            self.write(record)
+
+    def close(self) -> None:
+        """Write every partition's footer and close its file."""
+        if self._closed:
+            return
+        self._closed = True
+        partitions = list(self.sinks)
+        if self.partitions is not None:
+            partitions += [b for b in range(self.partitions) if b not in self.sinks]
+        try:
+            for partition in partitions:
+                writer = self.writers.pop(partition, None)
+                if writer is None:
+                    writer = self._parked.pop(partition, None)
+                if writer is None:
+                    writer = self._new_writer(partition)
+                writer.close()
+        finally:
+            self._abort_writers()
+
+    def _abort_writers(self) -> None:
+        for writer in list(self.writers.values()) + list(self._parked.values()):
+            writer.abort()
+        self.writers.clear()
+        self._parked.clear()
+
+    def abort(self) -> None:
+        """Close all partition files without footers (used on errors)."""
+        if self._closed:
+            return
+        self._closed = True
+        self._abort_writers()
+
+    def __enter__(self) -> "PartitionWriter":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
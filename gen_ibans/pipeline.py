@@ -0,0 +1,147 @@
+"""
+Background writing
+
+Hands generated records to a record writer running on a background thread,
+in batches over a bounded queue.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import queue
+import threading
+from typing import Iterable, List, Optional
+
+from .iban_generator import IBANRecord
+
+DEFAULT_WRITE_BATCH_SIZE = 1000
+DEFAULT_WRITE_QUEUE_DEPTH = 8
+
+
+class BackgroundWriter:
+    """Runs a record writer on a background thread.
+
+    Records are collected into batches of ``batch_size`` on the producing
+    thread. Full batches go through a queue holding at most ``queue_depth``
+    batches to a worker thread, which serializes and writes them in order.
+    While one batch is written, the next is filled. When the writer falls
+    behind, ``write`` blocks on the full queue, so memory stays bounded.
+    Errors raised by the writer are re-raised on the producing thread by
+    the next ``write`` or by ``close``.
+
+    The wrapped writer must not be used directly until ``close`` or
+    ``abort`` returns.
+    """
+
+    def __init__(
+        self,
+        writer,
+        *,
+        batch_size: int = DEFAULT_WRITE_BATCH_SIZE,
+        queue_depth: int = DEFAULT_WRITE_QUEUE_DEPTH,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        if queue_depth < 1:
+            raise ValueError("queue_depth must be a positive integer")
+        self.writer = writer
+        self.batch_size = batch_size
+        self.count = 0
+        self._batch: List[IBANRecord] = []
+        self._queue: "queue.Queue[Optional[List[IBANRecord]]]" = queue.Queue(
+            maxsize=queue_depth
+        )
+        self._error: Optional[BaseException] = None
+        self._cancelled = False
+        self._thread: Optional[threading.Thread] = None
+
+    def open(self) -> "BackgroundWriter":
+        if self._thread is None:
+            self.writer.open()
+            self._thread = threading.Thread(
+                target=self._run, name="gen-ibans-writer", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        write = self.writer.write
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                return
+            if self._error is not None or self._cancelled:
+                continue  # Keep draining so that the producer never blocks
+            try:
+                for record in batch:
+                    write(record)
+            except BaseException as e:  # Re-raised on the producing thread
+                self._error = e
+
+    def _check(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def write(self, record: IBANRecord) -> None:
+        batch = self._batch
+        batch.append(record)
+        self.count += 1
+        if len(batch) >= self.batch_size:
+            self._check()
+            if self._thread is None:
+                self.open()
+            self._batch = []
+            self._queue.put(batch)
+
+    def write_all(self, records: Iterable[IBANRecord]) -> None:
+        for record in records:
+            self.write(record)
+
+    def _stop(self) -> None:
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def close(self) -> None:
+        """Write the remaining records, stop the thread and close the writer."""
+        self.open()
+        if self._batch:
+            batch, self._batch = self._batch, []
+            self._queue.put(batch)
+        self._stop()
+        self._check()
+        self.writer.close()
+
+    def abort(self) -> None:
+        """Discard queued records, stop the thread and abort the writer."""
+        self._cancelled = True
+        self._batch = []
+        self._stop()
+        self.writer.abort()
+
+    def __enter__(self) -> "BackgroundWriter":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
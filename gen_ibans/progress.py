@@ -0,0 +1,178 @@
+"""
+Progress reporting
+
+Throttled progress bar for interactive terminals and JSON progress events
+for orchestration tools.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import json
+import math
+import time
+from typing import Optional, TextIO
+
+# Seconds between progress updates (10 Hz).
+DEFAULT_PROGRESS_INTERVAL = 0.1
+
+# Dot-style spinner frames (braille dots)
+SPINNER_FRAMES = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
+BAR_WIDTH = 24
+
+
+def format_eta(seconds: Optional[float]) -> str:
+    """Format remaining seconds as ``MM:SS`` or ``HH:MM:SS``."""
+    if seconds is None or math.isnan(seconds) or seconds == float("inf"):
+        return "--:--"
+    seconds = max(0, int(seconds))
+    h = seconds // 3600
+    m = (seconds % 3600) // 60
+    s = seconds % 60
+    if h > 0:
+        return f"{h:02d}:{m:02d}:{s:02d}"
+    return f"{m:02d}:{s:02d}"
+
+
+class ProgressReporter:
+    """Reports generation progress at a bounded rate.
+
+    ``update`` is called once per record but only does work when an update
+    is due: every ``every`` records if given, otherwise at most once per
+    ``interval`` seconds. In time mode the clock is read only every few
+    records; the stride follows the measured rate so that it is checked
+    about ten times per interval.
+
+    ``bar`` receives an animated progress bar (an interactive stderr) and
+    ``events`` one JSON object per line: a ``start`` event, ``progress``
+    events with ``done``, ``total``, ``rate`` (records per second),
+    ``elapsed`` and ``eta`` (seconds, null while unknown) and a final
+    ``done`` event.
+    """
+
+    def __init__(
+        self,
+        total: int,
+        *,
+        bar: Optional[TextIO] = None,
+        events: Optional[TextIO] = None,
+        interval: float = DEFAULT_PROGRESS_INTERVAL,
+        every: Optional[int] = None,
+    ):
+        self.total = total
+        self.bar = bar
+        self.events = events
+        self.interval = interval
+        self.every = every
+        self.done = 0
+        self._started = time.monotonic()
+        self._next_time = self._started + interval
+        self._next_check = every or 1
+        self._stride = every or 1
+        self._frame = 0
+        self._last_msg_len = 0
+        self._emit({"event": "start", "total": total})
+
+    @property
+    def enabled(self) -> bool:
+        return self.bar is not None or self.events is not None
+
+    def update(self, done: int) -> None:
+        """Record that ``done`` records are finished; report if an update is due."""
+        if done < self._next_check:
+            return
+        self._next_check = done + self._stride
+        if self.every:
+            self._report(done, time.monotonic())
+            return
+        now = time.monotonic()
+        if now >= self._next_time:
+            self._report(done, now)
+            self._next_time = now + self.interval
+        # Check the clock about ten times per interval at the current rate;
+        # the stride at most doubles per check so early estimates cannot
+        # overshoot
+        rate = done / max(now - self._started, 1e-6)
+        target = int(rate * self.interval / 10)
+        self._stride = max(1, min(self._stride * 2, target))
+        self._next_check = done + self._stride
+
+    def _stats(self, done: int, now: float):
+        elapsed = max(1e-6, now - self._started)
+        rate = done / elapsed
+        remaining = (self.total - done) / rate if rate > 0 else None
+        return elapsed, rate, remaining
+
+    def _report(self, done: int, now: float) -> None:
+        self.done = done
+        elapsed, rate, remaining = self._stats(done, now)
+        if self.bar is not None:
+            self._draw_bar(done, remaining)
+        if self.events is not None:
+            self._emit(
+                {
+                    "event": "progress",
+                    "done": done,
+                    "total": self.total,
+                    "rate": round(rate, 1),
+                    "elapsed": round(elapsed, 3),
+                    "eta": round(remaining, 1) if remaining is not None else None,
+                }
+            )
+
+    def _draw_bar(self, done: int, remaining: Optional[float]) -> None:
+        total = max(self.total, 1)
+        percent = int(done * 100 / total)
+        filled = int(BAR_WIDTH * done / total)
+        bar = "#" * filled + "-" * (BAR_WIDTH - filled)
+        frame = SPINNER_FRAMES[self._frame % len(SPINNER_FRAMES)]
+        self._frame += 1
+        msg = (
+            f"{frame} [{bar}] {percent:3d}% {done}/{self.total} "
+            f"ETA: {format_eta(remaining)}"
+        )
+        self.bar.write("\r" + msg)
+        if len(msg) < self._last_msg_len:
+            self.bar.write(" " * (self._last_msg_len - len(msg)))
+        self.bar.flush()
+        self._last_msg_len = len(msg)
+
+    def _emit(self, event: dict) -> None:
+        if self.events is not None:
+            self.events.write(json.dumps(event) + "\n")
+            self.events.flush()
+
+    def finish(self, done: Optional[int] = None) -> None:
+        """Clear the progress bar and emit the final ``done`` event."""
+        done = self.done if done is None else done
+        if self.bar is not None:
+            self.bar.write("\r" + " " * self._last_msg_len + "\r")
+            self.bar.flush()
+            self._last_msg_len = 0
+        elapsed, rate, _ = self._stats(done, time.monotonic())
+        self._emit(
+            {
+                "event": "done",
+                "done": done,
+                "total": self.total,
+                "rate": round(rate, 1),
+                "elapsed": round(elapsed, 3),
+            }
+        )
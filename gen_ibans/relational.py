@@ -0,0 +1,236 @@
+"""
+Relational record model
+
+Splits generated IBAN records into normalized tables (accounts, persons,
+legal entities and the holder/beneficiary link tables) with stable IDs.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from .iban_generator import IBANRecord, LegalEntity
+
+#: Columns of the normalized tables, in output order
+TABLES: Dict[str, Tuple[str, ...]] = {
+    "accounts": ("account_id", "iban", "bank_code", "bic", "bank_name"),
+    "persons": (
+        "person_id",
+        "first_name",
+        "last_name",
+        "birth_date",
+        "tax_id",
+        "street_address",
+        "city",
+        "postal_code",
+    ),
+    "legal_entities": (
+        "legal_entity_id",
+        "name",
+        "wid",
+        "street_address",
+        "city",
+        "postal_code",
+    ),
+    "account_holders": (
+        "account_id",
+        "position",
+        "entity_type",
+        "person_id",
+        "legal_entity_id",
+        "wid",
+    ),
+    "beneficiaries": (
+        "account_id",
+        "position",
+        "entity_type",
+        "person_id",
+        "legal_entity_id",
+        "wid",
+    ),
+}
+
+#: Tables linking accounts to persons and legal entities
+LINK_TABLES = ("account_holders", "beneficiaries")
+
+#: SQL column types; the first column of the entity tables is the primary key
+COLUMN_TYPES: Dict[str, str] = {
+    "account_id": "INTEGER",
+    "person_id": "INTEGER",
+    "legal_entity_id": "INTEGER",
+    "position": "INTEGER",
+}
+
+#: Indexes created after a bulk load: (name, table, columns, unique)
+INDEXES: Tuple[Tuple[str, str, Tuple[str, ...], bool], ...] = (
+    ("ix_accounts_iban", "accounts", ("iban",), False),
+    ("ix_accounts_bank_code", "accounts", ("bank_code",), False),
+    ("ix_persons_tax_id", "persons", ("tax_id",), False),
+    ("ix_legal_entities_wid", "legal_entities", ("wid",), False),
+    ("ux_account_holders", "account_holders", ("account_id", "position"), True),
+    ("ix_account_holders_person", "account_holders", ("person_id",), False),
+    ("ix_account_holders_entity", "account_holders", ("legal_entity_id",), False),
+    ("ux_beneficiaries", "beneficiaries", ("account_id", "position"), True),
+    ("ix_beneficiaries_person", "beneficiaries", ("person_id",), False),
+    ("ix_beneficiaries_entity", "beneficiaries", ("legal_entity_id",), False),
+)
+
+Row = Tuple[Optional[object], ...]
+
+
+def create_table_sql(table: str) -> str:
+    """Return the CREATE TABLE statement for a normalized table.
+
+    Entity tables use their ID as ``INTEGER PRIMARY KEY`` (the rowid, so no
+    separate index is maintained while loading); link tables get no keys.
+    """
+    columns = TABLES[table]
+    definitions = []
+    for index, column in enumerate(columns):
+        definition = f"{column} {COLUMN_TYPES.get(column, 'TEXT')}"
+        if index == 0 and table not in LINK_TABLES:
+            definition += " PRIMARY KEY"
+        definitions.append(definition)
+    return f"CREATE TABLE {table} ({', '.join(definitions)})"
+
+
+class RelationalMapper:
+    """Split records into rows of the normalized tables.
+
+    Accounts are numbered in stream order. Natural persons are identified by
+    the ``person_id`` of their base person in the generator's person pool, so
+    all variants of a reused person share one ``persons`` row; the variant's
+    WID is kept on the link row. Legal entities use their ``entity_id``.
+
+    Pool IDs grow in the order persons first appear in the record stream, so
+    a person row is emitted when its ID exceeds the highest one seen so far
+    and memory stays constant. Records built without pool IDs fall back to
+    IDs keyed by Tax-ID (persons) or WID (legal entities).
+    """
+
+    def __init__(self):
+        self.accounts = 0
+        self._last_person_id = 0
+        self._last_entity_id = 0
+        self._person_keys: Dict[str, int] = {}
+        self._entity_keys: Dict[str, int] = {}
+
+    def rows(self, record: IBANRecord) -> List[Tuple[str, Row]]:
+        """Return ``(table, row)`` pairs for one record.
+
+        New person and legal entity rows precede the link rows that use them.
+        """
+        self.accounts += 1
+        account_id = self.accounts
+        bank = record.bank
+        rows: List[Tuple[str, Row]] = [
+            (
+                "accounts",
+                (account_id, record.iban, bank.bankleitzahl, bank.bic, bank.name),
+            )
+        ]
+        for table, parties in (
+            ("account_holders", record.account_holders),
+            ("beneficiaries", record.beneficiaries),
+        ):
+            for position, party in enumerate(parties, 1):
+                if isinstance(party, LegalEntity):
+                    entity_id = self._entity_id(party, rows)
+                    rows.append(
+                        (
+                            table,
+                            (
+                                account_id,
+                                position,
+                                "legal_entity",
+                                None,
+                                entity_id,
+                                party.wid,
+                            ),
+                        )
+                    )
+                else:
+                    person_id = self._person_id(party, rows)
+                    rows.append(
+                        (
+                            table,
+                            (
+                                account_id,
+                                position,
+                                "natural_person",
+                                person_id,
+                                None,
+                                getattr(party, "wid", None) or None,
+                            ),
+                        )
+                    )
+        return rows
+
+    def _person_id(self, person, rows: List[Tuple[str, Row]]) -> int:
+        person_id = getattr(person, "person_id", None)
+        if person_id is None:
+            person_id = self._person_keys.get(person.tax_id)
+            if person_id is None:
+                person_id = self._person_keys[person.tax_id] = self._last_person_id + 1
+        if person_id > self._last_person_id:
+            self._last_person_id = person_id
+            birth_date = person.birth_date
+            rows.append(
+                (
+                    "persons",
+                    (
+                        person_id,
+                        person.first_name,
+                        person.last_name,
+                        birth_date.isoformat()
+                        if hasattr(birth_date, "isoformat")
+                        else birth_date,
+                        person.tax_id,
+                        person.street_address,
+                        person.city,
+                        person.postal_code,
+                    ),
+                )
+            )
+        return person_id
+
+    def _entity_id(self, entity: LegalEntity, rows: List[Tuple[str, Row]]) -> int:
+        entity_id = getattr(entity, "entity_id", None)
+        if entity_id is None:
+            entity_id = self._entity_keys.get(entity.wid)
+            if entity_id is None:
+                entity_id = self._entity_keys[entity.wid] = self._last_entity_id + 1
+        if entity_id > self._last_entity_id:
+            self._last_entity_id = entity_id
+            rows.append(
+                (
+                    "legal_entities",
+                    (
+                        entity_id,
+                        entity.name,
+                        entity.wid,
+                        entity.street_address,
+                        entity.city,
+                        entity.postal_code,
+                    ),
+                )
+            )
+        return entity_id
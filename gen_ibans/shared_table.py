@@ -0,0 +1,344 @@
+"""
+Shared Bank Table Module
+
+This module publishes a loaded bank table once as fixed-width columns into an
+mmap'ed file or a ``multiprocessing.shared_memory`` segment. Other processes
+attach to it read-only without re-parsing the Bundesbank file; rows are
+decoded into ``BankInfo`` objects only when accessed.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import functools
+import json
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Sequence as SequenceABC
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover - imported for type hints only
+    from .iban_generator import BankInfo
+
+
+# File/segment layout: prefix (magic, version, header length), JSON header, columns
+_MAGIC = b"GIBT"
+_VERSION = 1
+_PREFIX = struct.Struct("<4sHI")
+# Column blocks start on this boundary
+_ALIGN = 8
+
+# Stored BankInfo attributes, in column order
+COLUMNS = (
+    "bankleitzahl",
+    "bic",
+    "name",
+    "method_code",
+    "merkmal",
+    "postal_code",
+    "city",
+    "record_number",
+    "change_flag",
+    "deleted",
+    "successor_blz",
+)
+
+# Attributes decoded as "" instead of None when empty
+_REQUIRED = ("bankleitzahl", "bic", "name")
+
+# Decoded BankInfo objects kept per attached table (least recently used rows
+# are decoded again); the generator picks the same banks over and over
+ROW_CACHE_SIZE = 1 << 12
+
+# Segments created by this process (still tracked for cleanup at exit)
+_published_segments = set()
+
+
+def _encode(bank: "BankInfo", column: str) -> bytes:
+    value = getattr(bank, column, None)
+    if column == "deleted":
+        return b"1" if value else b""
+    return (value or "").encode("utf-8")
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _build_layout(
+    encoded: Dict[str, List[bytes]], rows: int
+) -> Tuple[bytes, List[Tuple[str, int, int]], int]:
+    """Return (header bytes, [(column, width, offset)], total size)."""
+    widths = {
+        name: max((len(v) for v in values), default=0)
+        for name, values in encoded.items()
+    }
+    # Column offsets are stored in the header, so iterate until its length is stable
+    data_start = 0
+    while True:
+        layout = []
+        offset = data_start
+        for name in COLUMNS:
+            layout.append((name, widths[name], offset))
+            offset = _align(offset + widths[name] * rows)
+        header = json.dumps(
+            {"rows": rows, "columns": layout}, separators=(",", ":")
+        ).encode("ascii")
+        start = _align(_PREFIX.size + len(header))
+        if start == data_start:
+            return header, layout, max(offset, data_start + 1)
+        data_start = start
+
+
+class SharedBankTable(SequenceABC):
+    """Read-only, zero-copy bank table backed by shared memory or an mmap'ed file.
+
+    The table behaves like a sequence of ``BankInfo`` and can be passed to
+    ``IBANGenerator(banks=...)``. Use :meth:`publish` in the parent process
+    and :meth:`attach` in workers; only the publisher should call
+    :meth:`unlink`. Up to ``row_cache_size`` decoded rows are memoized, so
+    repeated access to a row returns the same ``BankInfo`` object.
+    """
+
+    def __init__(
+        self,
+        buffer: memoryview,
+        backing,
+        owner: bool,
+        path=None,
+        name=None,
+        row_cache_size: int = ROW_CACHE_SIZE,
+    ):
+        self._buffer = buffer
+        self._backing = backing
+        self._owner = owner
+        self.path = path
+        self.name = name
+
+        if len(buffer) < _PREFIX.size:
+            raise ValueError("Not a shared bank table (file too short)")
+        magic, version, header_len = _PREFIX.unpack_from(buffer, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Not a shared bank table (bad magic or version)")
+        header = json.loads(bytes(buffer[_PREFIX.size : _PREFIX.size + header_len]))
+        self._rows: int = header["rows"]
+        self._layout: List[Tuple[str, int, int]] = [
+            (col, width, offset) for col, width, offset in header["columns"]
+        ]
+        self._row = functools.lru_cache(maxsize=row_cache_size)(self._decode_row)
+
+    # Construction
+
+    @classmethod
+    def publish(
+        cls,
+        banks: Iterable["BankInfo"],
+        path: Optional[str] = None,
+        name: Optional[str] = None,
+    ) -> "SharedBankTable":
+        """
+        Publish a bank table for other processes.
+
+        Args:
+            banks: Loaded banks (e.g. ``IBANGenerator.banks``)
+            path: Write the table to this file and map it (persistent until removed)
+            name: Shared memory segment name (auto-generated if neither path nor name is set)
+
+        Returns:
+            The published table, readable by the calling process as well
+        """
+        banks = list(banks)
+        rows = len(banks)
+        encoded = {column: [_encode(b, column) for b in banks] for column in COLUMNS}
+        header, layout, size = _build_layout(encoded, rows)
+
+        def _fill(buf) -> None:
+            _PREFIX.pack_into(buf, 0, _MAGIC, _VERSION, len(header))
+            buf[_PREFIX.size : _PREFIX.size + len(header)] = header
+            for column, width, offset in layout:
+                if not width:
+                    continue
+                block = b"".join(v.ljust(width, b"\0") for v in encoded[column])
+                buf[offset : offset + len(block)] = block
+
+        if path is not None:
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w+b") as f:
+                f.truncate(size)
+                with mmap.mmap(f.fileno(), size) as mm:
+                    _fill(mm)
+                    mm.flush()
+            os.replace(tmp_path, path)
+            table = cls.attach(path=path)
+            table._owner = True
+            return table
+
+        from multiprocessing import shared_memory
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _fill(shm.buf)
+        _published_segments.add(shm.name)
+        return cls(shm.buf.toreadonly(), shm, True, name=shm.name)
+
+    @classmethod
+    def attach(
+        cls,
+        path: Optional[str] = None,
+        name: Optional[str] = None,
+        row_cache_size: int = ROW_CACHE_SIZE,
+    ) -> "SharedBankTable":
+        """
+        Attach read-only to a published table by file path or segment name.
+
+        ``row_cache_size`` bounds the decoded rows memoized by this process.
+
+        Raises:
+            ValueError: If neither path nor name is given or the data is not a bank table
+            FileNotFoundError: If the file or segment does not exist
+        """
+        if path is not None:
+            with open(path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return cls._attach(
+                memoryview(mm), mm, path=path, row_cache_size=row_cache_size
+            )
+        if name is None:
+            raise ValueError("Either path or name is required to attach a bank table")
+
+        from multiprocessing import shared_memory
+
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+            # Attaching processes must not remove the segment on exit
+            # (the resource tracker is shared with the publisher in-process)
+            if name in _published_segments:
+                return cls._attach(
+                    shm.buf.toreadonly(), shm, name=name, row_cache_size=row_cache_size
+                )
+            try:
+                from multiprocessing import resource_tracker
+
+                resource_tracker.unregister(shm._name, "shared_memory")
+            except Exception:
+                pass
+        return cls._attach(
+            shm.buf.toreadonly(), shm, name=name, row_cache_size=row_cache_size
+        )
+
+    @classmethod
+    def _attach(cls, buffer: memoryview, backing, **kwargs) -> "SharedBankTable":
+        # Release the mapping if it does not hold a bank table
+        try:
+            return cls(buffer, backing, False, **kwargs)
+        except Exception:
+            buffer.release()
+            backing.close()
+            raise
+
+    # Sequence protocol
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(self._rows))]
+        if index < 0:
+            index += self._rows
+        if not 0 <= index < self._rows:
+            raise IndexError("bank table index out of range")
+        return self._row(index)
+
+    def _decode_row(self, index: int) -> "BankInfo":
+        # Memoized per table as self._row
+        from .iban_generator import BankInfo
+
+        values = {}
+        buf = self._buffer
+        for column, width, offset in self._layout:
+            start = offset + index * width
+            raw = bytes(buf[start : start + width]).rstrip(b"\0") if width else b""
+            values[column] = raw.decode("utf-8") or (
+                "" if column in _REQUIRED else None
+            )
+        values["deleted"] = values["deleted"] == "1"
+        return BankInfo(
+            values.pop("bankleitzahl"),
+            values.pop("bic"),
+            values.pop("name"),
+            values.pop("method_code"),
+            **values,
+        )
+
+    def column(self, column: str) -> Tuple[int, memoryview]:
+        """Return (width, raw read-only view) of a fixed-width column."""
+        for name, width, offset in self._layout:
+            if name == column:
+                return width, self._buffer[offset : offset + width * self._rows]
+        raise ValueError(f"Unknown column: {column}. Supported: {', '.join(COLUMNS)}")
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the shared table in bytes."""
+        return len(self._buffer)
+
+    # Lifecycle
+
+    def close(self) -> None:
+        """Detach from the table (the data stays available to other processes).
+
+        Views returned by :meth:`column` must be released before closing.
+        """
+        if self._backing is None:
+            return
+        self._row.cache_clear()
+        self._buffer.release()
+        self._backing.close()
+        self._backing = None
+
+    def unlink(self) -> None:
+        """Remove the published table; only the publishing process should call this."""
+        backing = self._backing
+        if self._owner and self.path is None and backing is not None:
+            backing.unlink()
+            _published_segments.discard(self.name)
+        self.close()
+        if self._owner and self.path is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self) -> "SharedBankTable":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._owner:
+            self.unlink()
+        else:
+            self.close()
+
+    def __repr__(self) -> str:
+        where = f"path={self.path!r}" if self.path else f"name={self.name!r}"
+        return f"SharedBankTable({where}, rows={self._rows})"
@@ -0,0 +1,377 @@
+"""
+Snapshot Store Module
+
+This module keeps every downloaded Bundesbank archive as a content-addressed
+snapshot (by SHA-256) together with a manifest of its validity date, ETag and
+hash, so runs can be pinned to a specific release. Old snapshots are
+evicted least-recently-used first by count or total size.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from .cache_lock import CacheLock
+from .data_files import find_data_members
+
+# Dates like 20250609 in member names of the Bundesbank archives
+_MEMBER_DATE = re.compile(r"(?<!\d)(20\d{2})(\d{2})(\d{2})(?!\d)")
+
+
+def file_sha256(path: Union[str, Path], chunk_size: int = 64 * 1024) -> str:
+    """Return the SHA-256 hex digest of a file."""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def parse_version_date(value: Union[str, date, None]) -> Optional[date]:
+    """Parse an ISO date (YYYY-MM-DD or YYYYMMDD); None if value is not a date."""
+    if value is None or isinstance(value, date):
+        return value
+    text = value.strip()
+    for fmt in ("%Y-%m-%d", "%Y%m%d"):
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def detect_validity(
+    zip_path: Union[str, Path], format_type: Optional[str] = None
+) -> Optional[str]:
+    """
+    Detect the first day of validity (Gültig ab) of a Bundesbank archive.
+
+    Reads ValidFrom from the FileHdr of XML releases; otherwise looks for a
+    date in the data member name. Returns an ISO date string or None.
+    """
+    try:
+        with zipfile.ZipFile(zip_path, "r") as zf:
+            members = find_data_members(zf.namelist(), format_type)
+            for member in members:
+                if member.lower().endswith(".xml"):
+                    with zf.open(member) as raw:
+                        for _, elem in ET.iterparse(raw, events=("end",)):
+                            tag = elem.tag.rsplit("}", 1)[-1]
+                            if tag == "ValidFrom" and elem.text:
+                                valid = parse_version_date(elem.text)
+                                if valid:
+                                    return valid.isoformat()
+                            if tag in ("FileHdr", "BLZEintrag"):
+                                break
+                match = _MEMBER_DATE.search(Path(member).name)
+                if match:
+                    valid = parse_version_date("".join(match.groups()))
+                    if valid:
+                        return valid.isoformat()
+    except (OSError, zipfile.BadZipFile, ET.ParseError):
+        return None
+    return None
+
+
+@dataclass
+class Snapshot:
+    """Manifest entry of a stored archive."""
+
+    sha256: str
+    format: str
+    size: int
+    valid_from: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    url: Optional[str] = None
+    added: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+
+    @property
+    def version_date(self) -> date:
+        """Date used to order versions: validity date, else Last-Modified, else download date."""
+        valid = parse_version_date(self.valid_from)
+        if valid:
+            return valid
+        if self.last_modified:
+            try:
+                return parsedate_to_datetime(self.last_modified).date()
+            except (TypeError, ValueError):
+                pass
+        return datetime.fromtimestamp(self.added).date()
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Snapshot":
+        known = {name: data[name] for name in cls.__dataclass_fields__ if name in data}
+        return cls(**known)
+
+
+class SnapshotStore:
+    """Content-addressed store of downloaded archives with a JSON manifest.
+
+    Layout below the store root::
+
+        manifest.json           list of Snapshot entries
+        archives/<sha256>.zip   archives as downloaded
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        max_snapshots: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Args:
+            root: Store directory (created if missing)
+            max_snapshots: Keep at most this many snapshots (None: unlimited)
+            max_bytes: Keep archives below this total size (None: unlimited)
+        """
+        self.root = Path(root)
+        self.max_snapshots = max_snapshots
+        self.max_bytes = max_bytes
+
+    # Paths
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / "manifest.json"
+
+    def archive_path(self, sha256: str) -> Path:
+        """Path of the stored archive for a snapshot hash."""
+        return self.root / "archives" / f"{sha256}.zip"
+
+    def _lock(self) -> CacheLock:
+        # The store is created with its first snapshot
+        (self.root / "archives").mkdir(parents=True, exist_ok=True)
+        return CacheLock(self.root / "manifest.lock", timeout=60)
+
+    # Manifest
+
+    def _read_manifest(self) -> Dict[str, Snapshot]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        snapshots = {}
+        for entry in data.get("snapshots", []):
+            try:
+                snapshot = Snapshot.from_dict(entry)
+            except TypeError:
+                continue
+            if self.archive_path(snapshot.sha256).exists():
+                snapshots[snapshot.sha256] = snapshot
+        return snapshots
+
+    def _write_manifest(self, snapshots: Dict[str, Snapshot]) -> None:
+        data = {
+            "snapshots": [
+                asdict(s) for s in sorted(snapshots.values(), key=lambda s: s.added)
+            ]
+        }
+        with tempfile.NamedTemporaryFile(
+            "w",
+            encoding="utf-8",
+            dir=self.root,
+            prefix="manifest.json.",
+            suffix=".tmp",
+            delete=False,
+        ) as f:
+            json.dump(data, f, indent=2)
+            temp_path = f.name
+        os.replace(temp_path, self.manifest_path)
+
+    def snapshots(self, format_type: Optional[str] = None) -> List[Snapshot]:
+        """Return all snapshots (optionally of one format), newest version first."""
+        snapshots = [
+            s
+            for s in self._read_manifest().values()
+            if format_type is None or s.format == format_type
+        ]
+        return sorted(snapshots, key=lambda s: (s.version_date, s.added), reverse=True)
+
+    # Adding and selecting
+
+    def add(
+        self,
+        archive: Union[str, Path],
+        format_type: str,
+        sha256: Optional[str] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        url: Optional[str] = None,
+    ) -> Snapshot:
+        """
+        Add an archive to the store (no-op for content that is already stored).
+
+        The archive is hard-linked into the store when possible, so keeping
+        the current cache file and its snapshot costs no extra space.
+        """
+        sha256 = sha256 or file_sha256(archive)
+        target = self.archive_path(sha256)
+        with self._lock():
+            snapshots = self._read_manifest()
+            snapshot = snapshots.get(sha256)
+            if not target.exists():
+                temp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+                try:
+                    os.link(archive, temp_path)
+                except OSError:
+                    shutil.copyfile(archive, temp_path)
+                os.replace(temp_path, target)
+            now = time.time()
+            if snapshot is None:
+                snapshot = Snapshot(
+                    sha256=sha256,
+                    format=format_type,
+                    size=target.stat().st_size,
+                    valid_from=detect_validity(target, format_type),
+                    etag=etag,
+                    last_modified=last_modified,
+                    url=url,
+                    added=now,
+                    last_used=now,
+                )
+            else:
+                snapshot.last_used = now
+                snapshot.etag = etag or snapshot.etag
+                snapshot.last_modified = last_modified or snapshot.last_modified
+            snapshots[sha256] = snapshot
+            self._evict(snapshots, keep={sha256})
+            self._write_manifest(snapshots)
+        return snapshot
+
+    def select(
+        self,
+        format_type: Optional[str] = None,
+        valid_on: Union[str, date, None] = None,
+        sha256: Optional[str] = None,
+    ) -> Optional[Snapshot]:
+        """
+        Select a snapshot by hash (prefix) or by the date it must be valid on.
+
+        Without a hash or date the newest version is returned. For a date,
+        the newest version whose validity date is on or before it is chosen.
+
+        Raises:
+            ValueError: If the hash prefix is ambiguous or the date is invalid
+        """
+        candidates = self.snapshots(format_type)
+        if sha256:
+            prefix = sha256.strip().lower()
+            matches = [s for s in candidates if s.sha256.startswith(prefix)]
+            if len(matches) > 1:
+                raise ValueError(f"Ambiguous snapshot hash prefix: {sha256}")
+            chosen = matches[0] if matches else None
+        elif valid_on is not None:
+            day = parse_version_date(valid_on)
+            if day is None:
+                raise ValueError(
+                    f"Invalid snapshot date: {valid_on} (expected YYYY-MM-DD)"
+                )
+            chosen = next((s for s in candidates if s.version_date <= day), None)
+        else:
+            chosen = candidates[0] if candidates else None
+        if chosen is not None:
+            self._touch(chosen.sha256)
+        return chosen
+
+    def _touch(self, sha256: str) -> None:
+        with self._lock():
+            snapshots = self._read_manifest()
+            if sha256 in snapshots:
+                snapshots[sha256].last_used = time.time()
+                self._write_manifest(snapshots)
+
+    # Eviction
+
+    def _snapshot_bytes(self, sha256: str) -> int:
+        try:
+            return self.archive_path(sha256).stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _remove_files(self, sha256: str) -> None:
+        try:
+            self.archive_path(sha256).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _evict(
+        self, snapshots: Dict[str, Snapshot], keep: Iterable[str] = ()
+    ) -> List[str]:
+        keep = set(keep)
+        removed = []
+        by_age = sorted(snapshots.values(), key=lambda s: s.last_used)
+        total = sum(self._snapshot_bytes(s.sha256) for s in by_age)
+        for snapshot in by_age:
+            over_count = (
+                self.max_snapshots is not None and len(snapshots) > self.max_snapshots
+            )
+            over_size = self.max_bytes is not None and total > self.max_bytes
+            if not (over_count or over_size):
+                break
+            if snapshot.sha256 in keep:
+                continue
+            total -= self._snapshot_bytes(snapshot.sha256)
+            self._remove_files(snapshot.sha256)
+            del snapshots[snapshot.sha256]
+            removed.append(snapshot.sha256)
+        return removed
+
+    def evict(self, keep: Iterable[str] = ()) -> List[str]:
+        """Apply the retention limits now; returns the hashes of removed snapshots."""
+        if not self.root.exists():
+            return []
+        with self._lock():
+            snapshots = self._read_manifest()
+            removed = self._evict(snapshots, keep)
+            if removed:
+                self._write_manifest(snapshots)
+        return removed
+
+    def clear(self) -> None:
+        """Remove all snapshots and the manifest."""
+        if not self.root.exists():
+            return
+        with self._lock():
+            for sha256 in list(self._read_manifest()):
+                self._remove_files(sha256)
+            for path in (self.root / "archives").glob("*"):
+                path.unlink()
+            try:
+                self.manifest_path.unlink()
+            except FileNotFoundError:
+                pass
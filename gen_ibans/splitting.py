@@ -0,0 +1,233 @@
+"""
+Split output
+
+Rotates the output of a record writer across numbered part files, each a
+complete document with its own header and footer, and describes the parts
+in a JSON manifest.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+
+from .compression import compression_from_path
+from .iban_generator import IBANRecord
+from .writers import FileSink, RecordWriter
+
+_SIZE_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([a-z]*)\s*$", re.IGNORECASE)
+# Like GNU split: K/M/G/T and KiB/... are powers of 1024, KB/MB/... of 1000.
+_SIZE_UNITS = {
+    "": 1,
+    "b": 1,
+    "k": 1 << 10,
+    "kib": 1 << 10,
+    "kb": 10**3,
+    "m": 1 << 20,
+    "mib": 1 << 20,
+    "mb": 10**6,
+    "g": 1 << 30,
+    "gib": 1 << 30,
+    "gb": 10**9,
+    "t": 1 << 40,
+    "tib": 1 << 40,
+    "tb": 10**12,
+}
+
+
+def parse_size(value: Union[str, int]) -> int:
+    """Parse a byte size such as ``1GB``, ``512MiB``, ``100k`` or ``4096``."""
+    if isinstance(value, int):
+        size = value
+    else:
+        match = _SIZE_PATTERN.match(value)
+        unit = match.group(2).lower() if match else None
+        if unit not in _SIZE_UNITS:
+            raise ValueError(f"Invalid size: {value!r} (e.g. 500MB, 1GiB, 100000)")
+        size = int(float(match.group(1)) * _SIZE_UNITS[unit])
+    if size < 1:
+        raise ValueError(f"Size must be positive: {value!r}")
+    return size
+
+
+def split_name(output: Path) -> Tuple[str, str]:
+    """Split a file name into base and suffix, keeping ``.csv.gz`` together."""
+    suffix = output.suffix
+    if compression_from_path(output):
+        suffix = Path(output.stem).suffix + suffix
+    name = output.name
+    return (name[: -len(suffix)] if suffix else name), suffix
+
+
+def part_path(output: Union[str, Path], index: int) -> Path:
+    """Path of part ``index`` (1-based): ``ibans.csv.gz`` -> ``ibans-00001.csv.gz``."""
+    output = Path(output)
+    base, suffix = split_name(output)
+    return output.with_name(f"{base}-{index:05d}{suffix}")
+
+
+def manifest_path(output: Union[str, Path]) -> Path:
+    """Path of the manifest for split ``output``: ``ibans.manifest.json``."""
+    output = Path(output)
+    base, _ = split_name(output)
+    return output.with_name(f"{base}.manifest.json")
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SplitWriter:
+    """Writes records to a sequence of part files instead of one output.
+
+    A part is closed after ``max_records`` records or once ``max_bytes``
+    serialized (uncompressed) bytes have been written, whichever comes
+    first; records are never split across parts. Each part is produced by
+    its own ``writer_cls`` instance, so every part carries the format's
+    header and footer. SHA-256 checksums are computed while writing. On
+    ``close`` the manifest lists every part with its 1-based record range,
+    size on disk and checksum.
+    """
+
+    def __init__(
+        self,
+        writer_cls: Type[RecordWriter],
+        output: Union[str, Path],
+        *,
+        max_records: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        **kwargs,
+    ):
+        if writer_cls.directory:
+            raise ValueError(f"Splitting is not supported for {writer_cls.name} output")
+        if not (max_records or max_bytes):
+            raise ValueError("max_records or max_bytes is required for splitting")
+        self.writer_cls = writer_cls
+        self.label = writer_cls.label
+        self.output = Path(output)
+        self.manifest_path = manifest_path(self.output)
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.compression = kwargs.get("compression")
+        self.writer_kwargs = kwargs
+        self.count = 0
+        self.parts: List[Dict[str, Any]] = []
+        self._part: Optional[RecordWriter] = None
+        self._part_path: Optional[Path] = None
+        self._part_sink: Optional[FileSink] = None
+        self._closed = False
+
+    def _open_part(self) -> RecordWriter:
+        path = part_path(self.output, len(self.parts) + 1)
+        part = self.writer_cls.create(path, checksum=True, **self.writer_kwargs)
+        sink = next((s for s in part.sinks if isinstance(s, FileSink)), None)
+        if self.max_bytes and sink is None:
+            part.abort()
+            raise ValueError(
+                f"Size-based splitting is not supported for {self.writer_cls.name} "
+                "output; split by record count instead"
+            )
+        part.open()
+        self._part, self._part_path, self._part_sink = part, path, sink
+        return part
+
+    def _close_part(self) -> None:
+        part, path, sink = self._part, self._part_path, self._part_sink
+        self._part = self._part_path = self._part_sink = None
+        part.close()
+        first = self.count - part.count + 1
+        self.parts.append(
+            {
+                "file": path.name,
+                "first_record": first if part.count else None,
+                "last_record": self.count if part.count else None,
+                "records": part.count,
+                "bytes": os.path.getsize(path),
+                "sha256": (sink.sha256() if sink else None) or _file_sha256(path),
+            }
+        )
+
+    def open(self) -> "SplitWriter":
+        return self
+
+    def write(self, record: IBANRecord) -> None:
+        part = self._part
+        if part is None:
+            part = self._open_part()
+        part.write(record)
+        self.count += 1
+        if (self.max_records and part.count >= self.max_records) or (
+            self.max_bytes and self._part_sink.bytes_written >= self.max_bytes
+        ):
+            self._close_part()
+
+    def write_all(self, records) -> None:
+        for record in records:
+            self.write(record)
+
+    def close(self) -> None:
+        """Close the last part and write the manifest."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._part is None and not self.parts:
+            self._open_part()  # An empty run still yields one valid document
+        if self._part is not None:
+            self._close_part()
+        manifest = {
+            "format": self.writer_cls.name,
+            "compression": self.compression,
+            "records": self.count,
+            "split_every": self.max_records,
+            "split_size": self.max_bytes,
+            "parts": self.parts,
+        }
+        tmp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+            f.write("\n")
+        os.replace(tmp_path, self.manifest_path)
+
+    def abort(self) -> None:
+        """Abort the current part without writing a manifest."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._part is not None:
+            self._part.abort()
+            self._part = None
+
+    def __enter__(self) -> "SplitWriter":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
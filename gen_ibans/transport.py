@@ -0,0 +1,473 @@
+"""
+Download Transport Module
+
+This module provides the transports used by the Bundesbank downloader: HTTP(S)
+with one persistent connection pool per host, file:// URLs (for mirrors on a
+local or network file system), and hedged requests over an ordered list of
+mirrors.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import email.utils
+import http.client
+import os
+import queue
+import threading
+import urllib.parse
+import urllib.request
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+# Redirect statuses followed by the HTTP transport
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 5
+
+# A candidate URL, or a callable resolving it lazily (e.g. by scraping an index page)
+Candidate = Union[str, Callable[[], str]]
+
+
+class TransportError(Exception):
+    """Raised when a request fails."""
+
+
+class HTTPStatusError(TransportError):
+    """Raised for HTTP error statuses (4xx/5xx)."""
+
+    def __init__(self, url: str, status: int, reason: str = ""):
+        detail = f": {reason}" if reason else ""
+        super().__init__(f"HTTP Error {status}{detail} ({url})")
+        self.url = url
+        self.status = status
+
+
+class SourcesFailed(TransportError):
+    """Raised when every candidate of a hedged request failed."""
+
+    def __init__(self, errors: List[Tuple[str, Exception]]):
+        details = "; ".join(f"{url}: {error}" for url, error in errors)
+        super().__init__(
+            f"All sources failed: {details}" if errors else "No sources configured"
+        )
+        self.errors = errors
+
+    @property
+    def gone(self) -> bool:
+        """True if every source answered 404 Not Found or 410 Gone."""
+        return bool(self.errors) and all(
+            isinstance(error, HTTPStatusError) and error.status in (404, 410)
+            for _, error in self.errors
+        )
+
+
+class Response:
+    """Response of a transport request.
+
+    Attributes:
+        url: Final URL (after redirects)
+        status: Status code (200, 206, 304, ...)
+        headers: Case-insensitive response headers
+    """
+
+    def __init__(self, url: str, status: int, headers, fp, on_close=None):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self._fp = fp
+        self._on_close = on_close
+        self._closed = False
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        return self._fp.read(amt) if amt is not None else self._fp.read()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._on_close is not None:
+            self._on_close(self)
+        else:
+            self._fp.close()
+
+    def __enter__(self) -> "Response":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class Transport:
+    """Base class of download transports.
+
+    Subclasses implement request(); responses with an error status raise
+    HTTPStatusError, all other failures raise TransportError or OSError.
+    """
+
+    def request(
+        self,
+        url: str,
+        method: str = "GET",
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> Response:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release pooled connections."""
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class HTTPTransport(Transport):
+    """HTTP(S) transport keeping persistent connections per host.
+
+    Idle connections are pooled per (scheme, host, port) and reused by later
+    requests, so the index page and the archive are fetched over one
+    connection. A connection is only returned to the pool once its response
+    was read completely. Proxies from the environment (http_proxy,
+    https_proxy, no_proxy) are honored.
+    """
+
+    # Idle connections kept per host
+    MAX_IDLE = 4
+
+    def __init__(self, user_agent: Optional[str] = None):
+        self.user_agent = user_agent or "gen-ibans"
+        self._idle: Dict[tuple, List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+
+    def _pool_key(self, parts: urllib.parse.SplitResult) -> tuple:
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        return (parts.scheme, parts.hostname, port)
+
+    @staticmethod
+    def _proxy_for(key: tuple) -> Optional[str]:
+        scheme, host, _ = key
+        if urllib.request.proxy_bypass(host):
+            return None
+        return urllib.request.getproxies().get(scheme)
+
+    def _new_connection(self, key: tuple, timeout: Optional[float]):
+        scheme, host, port = key
+        proxy = self._proxy_for(key)
+        if proxy:
+            proxy_parts = urllib.parse.urlsplit(proxy)
+            proxy_host = proxy_parts.hostname
+            proxy_port = proxy_parts.port or 8080
+            if scheme == "https":
+                conn = http.client.HTTPSConnection(
+                    proxy_host, proxy_port, timeout=timeout
+                )
+                conn.set_tunnel(host, port)
+            else:
+                conn = http.client.HTTPConnection(
+                    proxy_host, proxy_port, timeout=timeout
+                )
+        elif scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, timeout=timeout)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        self.connections_opened += 1
+        return conn
+
+    def _checkout(self, key: tuple, timeout: Optional[float]):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return self._new_connection(key, timeout), False
+
+    def _checkin(self, key: tuple, conn) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.MAX_IDLE:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def request(
+        self,
+        url: str,
+        method: str = "GET",
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> Response:
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self._request_once(url, method, headers, timeout)
+            if response.status not in REDIRECT_STATUSES:
+                return response
+            location = response.headers.get("Location")
+            # Drain the redirect body so the connection can be reused
+            response.read()
+            response.close()
+            if not location:
+                raise TransportError(f"Redirect without Location header ({url})")
+            url = urllib.parse.urljoin(url, location)
+            if response.status == 303:
+                method = "GET"
+        raise TransportError(f"Too many redirects ({url})")
+
+    def _request_once(self, url, method, headers, timeout) -> Response:
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise TransportError(f"Unsupported URL scheme for HTTP transport: {url}")
+        key = self._pool_key(parts)
+        if parts.scheme == "http" and self._proxy_for(key):
+            # Plain HTTP proxies expect the absolute URL
+            target = url
+        else:
+            target = urllib.parse.urlunsplit(
+                ("", "", parts.path or "/", parts.query, "")
+            )
+        all_headers = {"User-Agent": self.user_agent, "Accept-Encoding": "identity"}
+        all_headers.update(headers or {})
+
+        while True:
+            conn, reused = self._checkout(key, timeout)
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            try:
+                conn.request(method, target, headers=all_headers)
+                raw = conn.getresponse()
+            except (
+                http.client.RemoteDisconnected,
+                ConnectionResetError,
+                BrokenPipeError,
+            ):
+                conn.close()
+                # An idle connection closed by the server: retry on a new one
+                if reused:
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            break
+
+        def release(response: Response, conn=conn, raw=raw) -> None:
+            # Fully read responses leave the connection ready for the next request
+            if raw.isclosed() and not raw.will_close and conn.sock is not None:
+                self._checkin(key, conn)
+            else:
+                raw.close()
+                conn.close()
+
+        if method == "HEAD" or raw.status in (204, 304):
+            raw.read()
+        response = Response(url, raw.status, raw.headers, raw, on_close=release)
+        if raw.status >= 400:
+            response.read()
+            response.close()
+            raise HTTPStatusError(url, raw.status, raw.reason)
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+
+class FileTransport(Transport):
+    """Transport for file:// URLs (mirrors on a local or network file system).
+
+    Answers like a simple HTTP server: Last-Modified and an ETag derived from
+    size and modification time, 304 for matching conditional requests and
+    404 for missing files.
+    """
+
+    @staticmethod
+    def _etag(stat: os.stat_result) -> str:
+        return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+    def request(
+        self,
+        url: str,
+        method: str = "GET",
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> Response:
+        path = Path(urllib.request.url2pathname(urllib.parse.urlsplit(url).path))
+        try:
+            stat = path.stat()
+        except FileNotFoundError as e:
+            raise HTTPStatusError(url, 404, "Not Found") from e
+        if not path.is_file():
+            raise HTTPStatusError(url, 404, "Not Found")
+
+        response_headers = http.client.HTTPMessage()
+        response_headers["Content-Length"] = str(stat.st_size)
+        response_headers["Last-Modified"] = email.utils.formatdate(
+            stat.st_mtime, usegmt=True
+        )
+        response_headers["ETag"] = self._etag(stat)
+
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        if self._not_modified(stat, headers):
+            return Response(url, 304, response_headers, _EmptyBody())
+        if method == "HEAD":
+            return Response(url, 200, response_headers, _EmptyBody())
+        return Response(url, 200, response_headers, open(path, "rb"))
+
+    def _not_modified(self, stat: os.stat_result, headers: Dict[str, str]) -> bool:
+        if "if-none-match" in headers:
+            return headers["if-none-match"] == self._etag(stat)
+        since = headers.get("if-modified-since")
+        if since:
+            try:
+                return (
+                    int(stat.st_mtime)
+                    <= email.utils.parsedate_to_datetime(since).timestamp()
+                )
+            except (TypeError, ValueError):
+                return False
+        return False
+
+
+class _EmptyBody:
+    def read(self, amt: Optional[int] = None) -> bytes:
+        return b""
+
+    def close(self) -> None:
+        pass
+
+
+class DefaultTransport(Transport):
+    """Dispatches http(s):// URLs to HTTPTransport and file:// URLs to FileTransport."""
+
+    def __init__(self):
+        self.http = HTTPTransport()
+        self.file = FileTransport()
+
+    def request(
+        self,
+        url: str,
+        method: str = "GET",
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> Response:
+        scheme = urllib.parse.urlsplit(url).scheme.lower()
+        if scheme == "file":
+            return self.file.request(url, method, headers, timeout)
+        if scheme in ("http", "https"):
+            return self.http.request(url, method, headers, timeout)
+        raise TransportError(f"Unsupported URL scheme: {url}")
+
+    def close(self) -> None:
+        self.http.close()
+
+
+def hedged_request(
+    transport: Transport,
+    candidates: Sequence[Candidate],
+    headers_for: Optional[Callable[[str], Dict[str, str]]] = None,
+    timeout: Optional[float] = None,
+    hedge_delay: Optional[float] = None,
+) -> Tuple[str, Response]:
+    """
+    Request the first candidate that answers, in order, with hedged failover.
+
+    The first candidate is requested right away. The next one is started when
+    the previous one failed, or when it has not answered within hedge_delay
+    seconds (a hedge); the first successful response wins and responses of
+    slower candidates are closed. Error statuses count as failures.
+
+    Args:
+        transport: Transport used for all requests
+        candidates: URLs in order of preference (callables are resolved lazily)
+        headers_for: Returns the request headers for a URL (e.g. validators)
+        timeout: Per-request timeout in seconds
+        hedge_delay: Seconds to wait before hedging with the next candidate;
+            None waits for each candidate to succeed or fail
+
+    Returns:
+        The URL of the winning candidate and its response
+
+    Raises:
+        SourcesFailed: If every candidate failed
+    """
+    results: "queue.Queue" = queue.Queue()
+    done = threading.Event()
+    lock = threading.Lock()
+    errors: List[Tuple[str, Exception]] = []
+
+    def attempt(candidate: Candidate) -> None:
+        url = candidate if isinstance(candidate, str) else "<unresolved>"
+        try:
+            if not isinstance(candidate, str):
+                url = candidate()
+            response = transport.request(
+                url, headers=headers_for(url) if headers_for else None, timeout=timeout
+            )
+        except Exception as e:
+            results.put((url, None, e))
+            return
+        with lock:
+            if not done.is_set():
+                results.put((url, response, None))
+                return
+        # Another candidate already won
+        response.close()
+
+    pending = list(candidates)
+    running = 0
+    winner: Optional[Tuple[str, Response]] = None
+    while winner is None and (pending or running):
+        if pending and running == 0:
+            threading.Thread(
+                target=attempt, args=(pending.pop(0),), daemon=True
+            ).start()
+            running += 1
+        try:
+            wait = hedge_delay if pending else None
+            url, response, error = results.get(timeout=wait)
+        except queue.Empty:
+            # Too slow: hedge with the next candidate, keep the running ones
+            threading.Thread(
+                target=attempt, args=(pending.pop(0),), daemon=True
+            ).start()
+            running += 1
+            continue
+        running -= 1
+        if error is not None:
+            errors.append((url, error))
+        else:
+            winner = (url, response)
+    with lock:
+        done.set()
+    # Responses that arrived before done was set but were not picked
+    while True:
+        try:
+            _, response, _ = results.get_nowait()
+        except queue.Empty:
+            break
+        if response is not None:
+            response.close()
+    if winner is None:
+        raise SourcesFailed(errors)
+    return winner
@@ -0,0 +1,1260 @@
+"""
+Streaming record writers
+
+Serializes generated IBAN records per output format and fans the bytes out
+to one or more buffered sinks (stdout, files).
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import codecs
+import csv
+import hashlib
+import io
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+from datetime import date
+from operator import attrgetter
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+from .compression import COMPRESSION_BLOCK_SIZE, CompressedFile, compression_suffix
+from .iban_generator import IBANRecord, LegalEntity
+from .relational import INDEXES, TABLES, RelationalMapper, create_table_sql
+
+try:  # Optional fast JSON serializer
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - depends on environment
+    _orjson = None
+
+# Bytes collected per sink before they are handed to the OS.
+DEFAULT_BUFFER_SIZE = 1 << 20
+# Serialized fragments kept per writer before the least recently used one is
+# evicted: enough for every bank in the Bundesbank file, while pooled persons
+# are reused within a few records.
+BANK_FRAGMENT_CACHE_SIZE = 1 << 14
+PERSON_FRAGMENT_CACHE_SIZE = 1 << 10
+
+CSV_HEADER = [
+    "IBAN",
+    "Account Holders",
+    "Beneficial Owners",
+    "Bank Name",
+    "BIC",
+    "Bank Code",
+]
+
+
+def _holders_inline(record: IBANRecord) -> str:
+    return "; ".join([_format_person_short(h) for h in record.account_holders])
+
+
+def _beneficiaries_inline(record: IBANRecord) -> str:
+    return "; ".join([_format_person_short(b) for b in record.beneficiaries]) or "None"
+
+
+def _entity_type(record: IBANRecord) -> str:
+    holders = record.account_holders
+    if not holders:
+        return ""
+    if any(isinstance(h, LegalEntity) for h in holders):
+        return "legal_entity"
+    return "natural_person"
+
+
+def _birth_dates(record: IBANRecord) -> str:
+    # Birth dates of the natural-person holders, in holder order
+    return "; ".join(
+        [
+            str(h.birth_date)
+            for h in record.account_holders
+            if not isinstance(h, LegalEntity) and h.birth_date
+        ]
+    )
+
+
+def _wids(record: IBANRecord) -> str:
+    return "; ".join([h.wid for h in record.account_holders if h.wid])
+
+
+# Catalogue of --fields: canonical name -> getter returning the value as str
+FIELDS: Dict[str, Callable[[IBANRecord], str]] = {
+    "iban": attrgetter("iban"),
+    # DE IBAN: country code, check digits, 8-digit BLZ, 10-digit account number
+    "account_number": lambda record: record.iban[12:22],
+    "bank_name": lambda record: record.bank.name,
+    "bic": lambda record: record.bank.bic,
+    "blz": lambda record: record.bank.bankleitzahl,
+    "method": lambda record: record.bank.method_code or "",
+    "holders": _holders_inline,
+    "holder_count": lambda record: str(len(record.account_holders)),
+    "beneficiaries": _beneficiaries_inline,
+    "beneficiary_count": lambda record: str(len(record.beneficiaries)),
+    "entity_type": _entity_type,
+    "birth_dates": _birth_dates,
+    "wids": _wids,
+}
+
+FIELD_ALIASES = {
+    "bank-name": "bank_name",
+    "bank": "bank_name",
+    "bank_code": "blz",
+    "bankleitzahl": "blz",
+    "code": "blz",
+    "account": "account_number",
+    "kontonummer": "account_number",
+    "method_code": "method",
+}
+
+# --fields whose values are per-bank and therefore dictionary-encoded
+_BANK_FIELDS = {"bank_name", "bic", "blz", "method"}
+
+
+def canonical_field(field: str) -> Optional[str]:
+    """Return the catalogue name for a ``--fields`` entry, or None if unknown."""
+    name = field.strip().lower()
+    name = FIELD_ALIASES.get(name, name)
+    return name if name in FIELDS else None
+
+
+def compile_fields(fields: Sequence[str]) -> Tuple[Callable[[IBANRecord], str], ...]:
+    """Resolve ``--fields`` once into a tuple of getters.
+
+    Raises ValueError listing every unknown field.
+    """
+    names = [canonical_field(f) for f in fields]
+    unknown = [f for f, name in zip(fields, names) if name is None]
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s): {', '.join(unknown)} (supported: {', '.join(FIELDS)})"
+        )
+    return tuple(FIELDS[name] for name in names)
+
+
+def field_value(record: IBANRecord, field: str) -> str:
+    """Return the string value of a single ``--fields`` entry for a record.
+
+    Unknown fields yield an empty string; writers validate their fields
+    up front with :func:`compile_fields`.
+    """
+    name = canonical_field(field)
+    return FIELDS[name](record) if name is not None else ""
+
+
+def _format_person_short(person) -> str:
+    # Inline form used by --fields (no address for legal entities)
+    if isinstance(person, LegalEntity):
+        return f"{person.name} (Legal Entity, WID: {person.wid})"
+    wid = f", WID: {person.wid}" if getattr(person, "wid", None) else ""
+    return f"{person.full_name} (Tax-ID: {person.tax_id}{wid})"
+
+
+def _format_person_inline(person) -> str:
+    # Helper for txt/csv human-readable inline formatting
+    if isinstance(person, LegalEntity):
+        return f"{person.name} (Legal Entity, WID: {person.wid}), Address: {person.full_address}"
+    else:
+        ids_str = f"Tax-ID: {person.tax_id}"
+        if getattr(person, "wid", None):
+            ids_str += f", WID: {person.wid}"
+        return f"{person.full_name} ({ids_str})"
+
+
+# Key order of the JSON objects per person type; values are fetched in one
+# attrgetter call and zipped onto the precomputed keys.
+_LEGAL_ENTITY_KEYS = ("name", "wid", "street_address", "city", "postal_code")
+_NATURAL_PERSON_KEYS = (
+    "first_name",
+    "last_name",
+    "birth_date",
+    "tax_id",
+    "street_address",
+    "city",
+    "postal_code",
+)
+_legal_entity_values = attrgetter(*_LEGAL_ENTITY_KEYS)
+_natural_person_values = attrgetter(*_NATURAL_PERSON_KEYS)
+
+
+def _person_to_dict(person) -> dict:
+    # Helper for JSON formatting (birth_date stays a date for the serializer)
+    if isinstance(person, LegalEntity):
+        d = {"type": "legal_entity"}
+        d.update(zip(_LEGAL_ENTITY_KEYS, _legal_entity_values(person)))
+        return d
+    d = {"type": "natural_person"}
+    d.update(zip(_NATURAL_PERSON_KEYS, _natural_person_values(person)))
+    if getattr(person, "wid", None):
+        d["wid"] = person.wid
+    return d
+
+
+# XML is rendered from precompiled string templates instead of building an
+# ElementTree per record. The output is byte-identical to ``ET.tostring``:
+# text escapes only ``&``, ``<`` and ``>``, and empty or missing values
+# become self-closing ``<tag />`` elements.
+_XML_LEGAL_ENTITY_TAGS = ("name", "wid", "street_address", "city", "postal_code")
+_XML_NATURAL_PERSON_TAGS = ("first_name", "last_name", "birth_date", "tax_id")
+_XML_ADDRESS_TAGS = ("street_address", "city", "postal_code")
+_XML_NATURAL_PERSON_WID_TAGS = _XML_NATURAL_PERSON_TAGS + ("wid",) + _XML_ADDRESS_TAGS
+_XML_NATURAL_PERSON_NO_WID_TAGS = _XML_NATURAL_PERSON_TAGS + _XML_ADDRESS_TAGS
+_XML_BANK_TAGS = ("name", "bic", "code")
+_xml_natural_person_values = attrgetter("first_name", "last_name")
+_xml_address_values = attrgetter(*_XML_ADDRESS_TAGS)
+
+
+def _xml_template(tags: Sequence[str]) -> str:
+    return "".join(f"<{tag}>%s</{tag}>" for tag in tags)
+
+
+_XML_TEMPLATES = {
+    tags: _xml_template(tags)
+    for tags in (
+        _XML_LEGAL_ENTITY_TAGS,
+        _XML_NATURAL_PERSON_WID_TAGS,
+        _XML_NATURAL_PERSON_NO_WID_TAGS,
+        _XML_BANK_TAGS,
+    )
+}
+
+
+def _xml_escape(text: str) -> str:
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+def _xml_element(tag: str, text: Optional[str]) -> str:
+    if not text:
+        return f"<{tag} />"
+    return f"<{tag}>{_xml_escape(text)}</{tag}>"
+
+
+def _xml_fill(tags: Tuple[str, ...], values: Sequence[Optional[str]]) -> str:
+    # Fast path through the template; empty values need the self-closing form
+    if all(values):
+        return _XML_TEMPLATES[tags] % tuple(map(_xml_escape, values))
+    return "".join(map(_xml_element, tags, values))
+
+
+def _person_xml_body(person) -> str:
+    # Helper for XML formatting: content of a <holder>/<beneficiary> element
+    if isinstance(person, LegalEntity):
+        kind = "legal_entity"
+        body = _xml_fill(_XML_LEGAL_ENTITY_TAGS, _legal_entity_values(person))
+    else:
+        kind = "natural_person"
+        values = _xml_natural_person_values(person) + (
+            str(person.birth_date),
+            person.tax_id,
+        )
+        wid = getattr(person, "wid", None)
+        if wid:
+            tags = _XML_NATURAL_PERSON_WID_TAGS
+            values += (wid,)
+        else:
+            tags = _XML_NATURAL_PERSON_NO_WID_TAGS
+        body = _xml_fill(tags, values + _xml_address_values(person))
+    return f"<type>{kind}</type>{body}"
+
+
+class FragmentCache:
+    """Bounded LRU cache of serialized output fragments.
+
+    Banks repeat across the whole run and pooled persons reappear as
+    variants, so their formatted text is built once and looked up by key.
+    Beyond ``maxsize`` entries the least recently used one is dropped,
+    keeping memory flat on long runs. A ``maxsize`` of 0 disables caching.
+    """
+
+    def __init__(self, maxsize: int):
+        if maxsize < 0:
+            raise ValueError("maxsize must not be negative")
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Any, Any]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key, render: Callable[[Any], Any], value):
+        """Return the fragment for ``key``, rendering ``value`` on a miss."""
+        entries = self._entries
+        fragment = entries.get(key)
+        if fragment is not None:
+            entries.move_to_end(key)
+            return fragment
+        fragment = render(value)
+        if self.maxsize:
+            entries[key] = fragment
+            if len(entries) > self.maxsize:
+                entries.popitem(last=False)
+        return fragment
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Bank attributes written by the record formats, used as fragment cache key
+_bank_key = attrgetter("bankleitzahl", "bic", "name")
+
+
+def _bank_xml(bank) -> str:
+    values = (bank.name, bank.bic, bank.bankleitzahl)
+    return f"<bank>{_xml_fill(_XML_BANK_TAGS, values)}</bank>"
+
+
+def _record_to_dict(record: IBANRecord) -> dict:
+    return {
+        "iban": record.iban,
+        "account_holders": [_person_to_dict(h) for h in record.account_holders],
+        "beneficiaries": [_person_to_dict(b) for b in record.beneficiaries],
+        "bank": {
+            "name": record.bank.name,
+            "bic": record.bank.bic,
+            "code": record.bank.bankleitzahl,
+        },
+    }
+
+
+def _json_default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_json(obj) -> bytes:
+    """Serialize to compact UTF-8 JSON, using orjson when it is installed.
+
+    The ``json`` fallback produces the same bytes (no whitespace, non-ASCII
+    kept, dates as ISO strings), so output does not depend on the backend.
+    """
+    if _orjson is not None:
+        return _orjson.dumps(obj)
+    return json.dumps(
+        obj, ensure_ascii=False, separators=(",", ":"), default=_json_default
+    ).encode("utf-8")
+
+
+class Sink:
+    """Buffered binary destination for serialized output.
+
+    Chunks are collected until ``buffer_size`` bytes are pending and then
+    written with a single call. A ``buffer_size`` of 0 writes through.
+    """
+
+    def __init__(self, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self.buffer_size = buffer_size
+        self.bytes_written = 0
+        self._pending: List[bytes] = []
+        self._pending_size = 0
+
+    def write(self, data: bytes) -> None:
+        if not data:
+            return
+        self.bytes_written += len(data)
+        if self.buffer_size <= 0:
+            self._write_raw(data)
+            return
+        self._pending.append(data)
+        self._pending_size += len(data)
+        if self._pending_size >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            data = b"".join(self._pending)
+            self._pending = []
+            self._pending_size = 0
+            self._write_raw(data)
+
+    def close(self) -> None:
+        self.flush()
+
+    def _write_raw(self, data: bytes) -> None:
+        raise NotImplementedError
+
+
+class FileSink(Sink):
+    """Sink writing to a file that it opens and owns.
+
+    With ``compression`` (gzip, xz or zstd) the file is written through a
+    :class:`~gen_ibans.compression.CompressedFile`, which compresses large
+    blocks on a background thread; ``bytes_written`` still counts the
+    uncompressed bytes. With ``checksum`` a SHA-256 of the bytes stored on
+    disk is computed while writing.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        buffer_size: Optional[int] = None,
+        *,
+        compression: Optional[str] = None,
+        compress_level: Optional[int] = None,
+        compress_threads: int = 0,
+        checksum: bool = False,
+    ):
+        if buffer_size is None:
+            buffer_size = COMPRESSION_BLOCK_SIZE if compression else DEFAULT_BUFFER_SIZE
+        super().__init__(buffer_size)
+        self.path = Path(path)
+        self.compression = compression
+        self._digest = hashlib.sha256() if checksum else None
+        if compression:
+            self._fp = CompressedFile(
+                self.path,
+                compression,
+                compress_level,
+                compress_threads,
+                digest=self._digest,
+            )
+        else:
+            self._fp = open(self.path, "wb", buffering=0)
+
+    def sha256(self) -> Optional[str]:
+        """Hex SHA-256 of the file content (with ``checksum``, after close)."""
+        return self._digest.hexdigest() if self._digest is not None else None
+
+    def _write_raw(self, data: bytes) -> None:
+        self._fp.write(data)
+        if self._digest is not None and not self.compression:
+            self._digest.update(data)
+
+    def close(self) -> None:
+        if self._fp.closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._fp.close()
+
+
+class StreamSink(Sink):
+    """Sink writing to an already open text stream such as ``sys.stdout``.
+
+    UTF-8 streams are fed through their binary buffer; any other stream
+    receives decoded text so its own encoding applies. Interactive
+    terminals are written through so records appear as they are generated.
+    The stream itself is flushed but never closed.
+    """
+
+    def __init__(self, stream, buffer_size: Optional[int] = None):
+        if buffer_size is None:
+            isatty = getattr(stream, "isatty", None)
+            buffer_size = 0 if isatty and isatty() else DEFAULT_BUFFER_SIZE
+        super().__init__(buffer_size)
+        self.stream = stream
+        self._binary = None
+        binary = getattr(stream, "buffer", None)
+        if binary is not None and _is_utf8(getattr(stream, "encoding", None)):
+            # Anything already written through the text layer goes first
+            stream.flush()
+            self._binary = binary
+
+    def _write_raw(self, data: bytes) -> None:
+        if self._binary is not None:
+            self._binary.write(data)
+            if self.buffer_size <= 0:
+                self._binary.flush()
+        else:
+            self.stream.write(data.decode("utf-8"))
+
+    def close(self) -> None:
+        self.flush()
+        if self._binary is not None:
+            self._binary.flush()
+        else:
+            self.stream.flush()
+
+
+def _is_utf8(encoding: Optional[str]) -> bool:
+    if not encoding:
+        return False
+    try:
+        return codecs.lookup(encoding).name == "utf-8"
+    except LookupError:
+        return False
+
+
+class RecordWriter:
+    """Base class for streaming record serializers.
+
+    A writer serializes the header, each record and the footer exactly once
+    and hands the encoded bytes to every attached sink, so echoing to stdout
+    while writing a file costs no extra formatting. Subclasses implement
+    ``format_record`` and optionally ``header``/``footer``.
+    """
+
+    #: Name used for ``--format``
+    name = ""
+    #: Human-readable label for status messages (None for plain text)
+    label: Optional[str] = None
+    #: Binary formats are never echoed to stdout and require a file
+    binary = False
+    #: Writers producing several files take an output directory instead
+    directory = False
+    #: Format-specific keyword options accepted by the constructor
+    options: Tuple[str, ...] = ()
+    #: Output goes through sinks (False for writers that manage their own file)
+    uses_sinks = True
+    #: A new writer can continue a suspended document (see :meth:`resume`)
+    resumable = True
+
+    def __init__(
+        self,
+        sinks: Iterable[Sink],
+        *,
+        fields: Optional[Sequence[str]] = None,
+        include_personal_info: bool = True,
+        include_bank_info: bool = True,
+        fragment_cache_size: Optional[int] = None,
+    ):
+        self.sinks = list(sinks)
+        self.fields = list(fields) if fields else None
+        # --fields are resolved once; unknown names fail here, not per record
+        self._field_getters = compile_fields(self.fields) if self.fields else ()
+        self.include_personal_info = include_personal_info
+        self.include_bank_info = include_bank_info
+        # Formats with costly per-record rendering look their bank and person
+        # fragments up here; ``fragment_cache_size`` overrides both bounds
+        if fragment_cache_size is None:
+            bank_cache_size = BANK_FRAGMENT_CACHE_SIZE
+            person_cache_size = PERSON_FRAGMENT_CACHE_SIZE
+        else:
+            bank_cache_size = person_cache_size = fragment_cache_size
+        self._bank_fragments = FragmentCache(bank_cache_size)
+        self._person_fragments = FragmentCache(person_cache_size)
+        self.count = 0
+        self._opened = False
+        self._closed = False
+
+    @classmethod
+    def create(
+        cls,
+        output: Optional[Union[str, Path]] = None,
+        *,
+        echo=None,
+        compression: Optional[str] = None,
+        compress_level: Optional[int] = None,
+        compress_threads: int = 0,
+        checksum: bool = False,
+        **kwargs,
+    ) -> "RecordWriter":
+        """Create a writer for an output file and/or an echo text stream.
+
+        The echo stream is ignored for binary and multi-file formats. Only
+        the output file is compressed; the echo stays plain text.
+        """
+        sinks: List[Sink] = []
+        if echo is not None and not (cls.binary or cls.directory):
+            sinks.append(StreamSink(echo))
+        if output is not None:
+            sinks.append(
+                FileSink(
+                    output,
+                    compression=compression,
+                    compress_level=compress_level,
+                    compress_threads=compress_threads,
+                    checksum=checksum,
+                )
+            )
+        try:
+            return cls(sinks, **kwargs)
+        except Exception:
+            for sink in sinks:
+                if isinstance(sink, FileSink):
+                    sink.close()
+            raise
+
+    def field_values(self, record: IBANRecord) -> List[str]:
+        """Values of the selected ``fields`` for a record."""
+        return [get(record) for get in self._field_getters]
+
+    def bank_fragment(self, bank, render: Callable[[Any], Any]):
+        """``render(bank)``, computed once per bank.
+
+        Keyed by value rather than identity: a ``SharedBankTable`` may hand
+        out a fresh ``BankInfo`` for the same row.
+        """
+        return self._bank_fragments.get(_bank_key(bank), render, bank)
+
+    def person_fragment(self, person, render: Callable[[Any], Any]):
+        """``render(person)``, cached per pooled base person and variant WID.
+
+        Legal entities and persons without a ``person_id`` are not reused
+        by the generator and are rendered directly.
+        """
+        person_id = getattr(person, "person_id", None)
+        if person_id is None:
+            return render(person)
+        return self._person_fragments.get((person_id, person.wid), render, person)
+
+    def header(self) -> str:
+        return ""
+
+    def format_record(self, record: IBANRecord) -> Union[str, bytes]:
+        raise NotImplementedError
+
+    def footer(self) -> str:
+        return ""
+
+    def open(self) -> "RecordWriter":
+        if not self._opened:
+            self._opened = True
+            self._start()
+        return self
+
+    def write(self, record: IBANRecord) -> None:
+        if not self._opened:
+            self.open()
+        self._emit(self.format_record(record))
+        self.count += 1
+
+    def write_all(self, records: Iterable[IBANRecord]) -> None:
+        for record in records:
+            self.write(record)
+
+    def suspend(self) -> None:
+        """Write out buffered records without finishing the document."""
+        for sink in self.sinks:
+            sink.flush()
+
+    def resume(self, count: int) -> "RecordWriter":
+        """Continue a document whose header and first ``count`` records were
+        written to the same sinks by a suspended writer."""
+        self._opened = True
+        self.count = count
+        return self
+
+    def close(self) -> None:
+        """Write the footer and flush/close all sinks."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self.open()
+            self._finish()
+        finally:
+            for sink in self.sinks:
+                sink.close()
+
+    def abort(self) -> None:
+        """Close all sinks without writing a footer (used on errors)."""
+        if self._closed:
+            return
+        self._closed = True
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception:
+                pass
+
+    def _start(self) -> None:
+        self._emit(self.header())
+
+    def _finish(self) -> None:
+        self._emit(self.footer())
+
+    def _emit(self, text: Union[str, bytes]) -> None:
+        if text:
+            if isinstance(text, str):
+                text = text.encode("utf-8")
+            self._emit_bytes(text)
+
+    def _emit_bytes(self, data: bytes) -> None:
+        for sink in self.sinks:
+            sink.write(data)
+
+    def __enter__(self) -> "RecordWriter":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class TxtWriter(RecordWriter):
+    """One ``|``-separated line per record; honours the include flags."""
+
+    name = "txt"
+
+    def format_record(self, record: IBANRecord) -> str:
+        if self.fields:
+            return " | ".join(self.field_values(record)) + "\n"
+        bank = record.bank
+        if not self.include_personal_info:
+            if self.include_bank_info:
+                return (
+                    f"{record.iban} | {bank.name} | {bank.bic} | {bank.bankleitzahl}\n"
+                )
+            return record.iban + "\n"
+        holders = "; ".join(_format_person_inline(h) for h in record.account_holders)
+        beneficiaries = (
+            "; ".join(_format_person_inline(b) for b in record.beneficiaries) or "None"
+        )
+        line = f"{record.iban} | Holders: {holders} | Beneficiaries: {beneficiaries}"
+        if self.include_bank_info:
+            line += f" | {bank.name} | {bank.bic} | {bank.bankleitzahl}"
+        return line + "\n"
+
+
+class _CsvLines:
+    """Formats single CSV rows with the csv module's quoting rules."""
+
+    def __init__(self, lineterminator: str = "\r\n"):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator=lineterminator)
+
+    def row(self, values: Sequence) -> str:
+        self._writer.writerow(values)
+        text = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate(0)
+        return text
+
+
+class CsvWriter(RecordWriter):
+    """RFC 4180 CSV with a header row."""
+
+    name = "csv"
+    label = "CSV"
+
+    def __init__(self, sinks: Iterable[Sink], **kwargs):
+        super().__init__(sinks, **kwargs)
+        self._row = _CsvLines().row
+
+    def header(self) -> str:
+        return self._row(self.fields or CSV_HEADER)
+
+    def format_record(self, record: IBANRecord) -> str:
+        if self.fields:
+            return self._row(self.field_values(record))
+        return self._row(
+            [
+                record.iban,
+                "; ".join(_format_person_inline(h) for h in record.account_holders),
+                "; ".join(_format_person_inline(b) for b in record.beneficiaries)
+                or "None",
+                record.bank.name,
+                record.bank.bic,
+                record.bank.bankleitzahl,
+            ]
+        )
+
+
+class RelationalCsvWriter(RecordWriter):
+    """Normalized CSV tables in an output directory, ready for bulk loading.
+
+    Writes ``accounts.csv``, ``persons.csv``, ``legal_entities.csv``,
+    ``account_holders.csv`` and ``beneficiaries.csv`` (see
+    ``relational.TABLES``) with a header row, ``\\n`` line endings, ISO
+    dates and empty unquoted fields for NULL, as expected by PostgreSQL
+    ``COPY ... (FORMAT csv, HEADER)`` and similar loaders. Each base person
+    is written once. The include flags do not apply.
+    With ``compression`` each table file gets the matching suffix, e.g.
+    ``accounts.csv.gz``.
+    """
+
+    name = "csv-relational"
+    label = "relational CSV"
+    directory = True
+
+    def __init__(self, sinks: Dict[str, Sink], **kwargs):
+        if kwargs.get("fields"):
+            raise ValueError(f"--fields is not supported by {self.name} output")
+        missing = set(TABLES) - set(sinks)
+        if missing:
+            raise ValueError(f"Missing sinks for tables: {', '.join(sorted(missing))}")
+        super().__init__(sinks.values(), **kwargs)
+        self.table_sinks = dict(sinks)
+        self.mapper = RelationalMapper()
+        self._row = _CsvLines(lineterminator="\n").row
+
+    @classmethod
+    def create(
+        cls,
+        output=None,
+        *,
+        echo=None,
+        compression: Optional[str] = None,
+        compress_level: Optional[int] = None,
+        compress_threads: int = 0,
+        **kwargs,
+    ) -> "RelationalCsvWriter":
+        if output is None:
+            raise ValueError(f"{cls.name} output requires an output directory")
+        directory = Path(output)
+        directory.mkdir(parents=True, exist_ok=True)
+        suffix = compression_suffix(compression)
+        sinks: Dict[str, Sink] = {}
+        try:
+            for table in TABLES:
+                sinks[table] = FileSink(
+                    directory / f"{table}.csv{suffix}",
+                    compression=compression,
+                    compress_level=compress_level,
+                    compress_threads=compress_threads,
+                )
+            return cls(sinks, **kwargs)
+        except Exception:
+            for sink in sinks.values():
+                sink.close()
+            raise
+
+    def _start(self) -> None:
+        for table, columns in TABLES.items():
+            self.table_sinks[table].write(self._row(columns).encode("utf-8"))
+
+    def write(self, record: IBANRecord) -> None:
+        if not self._opened:
+            self.open()
+        for table, row in self.mapper.rows(record):
+            self.table_sinks[table].write(self._row(row).encode("utf-8"))
+        self.count += 1
+
+
+class SqliteWriter(RecordWriter):
+    """Normalized SQLite database loaded in batched transactions.
+
+    Uses the tables of ``csv-relational``. Rows are collected per table and
+    inserted with ``executemany`` every ``batch_size`` records, one
+    transaction per batch, with journaling and fsync relaxed for the load.
+    Secondary indexes are created after all rows are inserted. An existing
+    database file is replaced.
+    """
+
+    name = "sqlite"
+    label = "SQLite"
+    binary = True
+    uses_sinks = False
+
+    DEFAULT_BATCH_SIZE = 50_000
+    LOAD_PRAGMAS = (
+        "PRAGMA journal_mode = OFF",
+        "PRAGMA synchronous = OFF",
+        "PRAGMA temp_store = MEMORY",
+        "PRAGMA cache_size = -65536",
+    )
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        *,
+        batch_size: Optional[int] = None,
+        **kwargs,
+    ):
+        if kwargs.get("fields"):
+            raise ValueError(f"--fields is not supported by {self.name} output")
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        super().__init__([], **kwargs)
+        self.path = Path(path)
+        self.batch_size = batch_size or self.DEFAULT_BATCH_SIZE
+        self.mapper = RelationalMapper()
+        self._rows: Dict[str, List[tuple]] = {table: [] for table in TABLES}
+        self._insert_sql = {
+            table: f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))})"
+            for table, columns in TABLES.items()
+        }
+        self._pending = 0
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @classmethod
+    def create(
+        cls, output=None, *, echo=None, checksum=False, **kwargs
+    ) -> "SqliteWriter":
+        if output is None:
+            raise ValueError(f"{cls.name} output requires a database file")
+        return cls(output, **kwargs)
+
+    def _start(self) -> None:
+        for suffix in ("", "-journal", "-wal", "-shm"):
+            try:
+                os.remove(f"{self.path}{suffix}")
+            except FileNotFoundError:
+                pass
+        # The connection may be handed to a background writer thread; it is
+        # only ever used by one thread at a time.
+        connection = sqlite3.connect(
+            str(self.path), isolation_level=None, check_same_thread=False
+        )
+        self._connection = connection
+        for pragma in self.LOAD_PRAGMAS:
+            connection.execute(pragma)
+        connection.execute("BEGIN")
+        for table in TABLES:
+            connection.execute(create_table_sql(table))
+        connection.execute("COMMIT")
+
+    def write(self, record: IBANRecord) -> None:
+        if not self._opened:
+            self.open()
+        rows = self._rows
+        for table, row in self.mapper.rows(record):
+            rows[table].append(row)
+        self.count += 1
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self._flush_batch()
+
+    def _flush_batch(self) -> None:
+        if not self._pending:
+            return
+        connection = self._connection
+        connection.execute("BEGIN")
+        try:
+            for table, rows in self._rows.items():
+                if rows:
+                    connection.executemany(self._insert_sql[table], rows)
+                    self._rows[table] = []
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        self._pending = 0
+
+    def _finish(self) -> None:
+        self._flush_batch()
+        connection = self._connection
+        connection.execute("BEGIN")
+        for name, table, columns, unique in INDEXES:
+            kind = "UNIQUE INDEX" if unique else "INDEX"
+            connection.execute(
+                f"CREATE {kind} {name} ON {table} ({', '.join(columns)})"
+            )
+        connection.execute("COMMIT")
+        connection.execute("ANALYZE")
+        connection.close()
+        self._connection = None
+
+    def abort(self) -> None:
+        super().abort()
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            finally:
+                self._connection = None
+
+
+class _JsonRecordWriter(RecordWriter):
+    def record_object(self, record: IBANRecord) -> dict:
+        if self.fields:
+            return dict(zip(self.fields, self.field_values(record)))
+        return _record_to_dict(record)
+
+
+class JsonWriter(_JsonRecordWriter):
+    """A JSON array with one compact object per line."""
+
+    name = "json"
+    label = "JSON"
+
+    def header(self) -> str:
+        return "["
+
+    def format_record(self, record: IBANRecord) -> bytes:
+        separator = b",\n" if self.count else b"\n"
+        return separator + dumps_json(self.record_object(record))
+
+    def footer(self) -> str:
+        return "\n]\n" if self.count else "]\n"
+
+
+class JsonlWriter(_JsonRecordWriter):
+    """JSON Lines: one self-contained object per line, no enclosing array."""
+
+    name = "jsonl"
+    label = "JSON Lines"
+
+    def format_record(self, record: IBANRecord) -> bytes:
+        return dumps_json(self.record_object(record)) + b"\n"
+
+
+class XmlWriter(RecordWriter):
+    """An ``<accounts>`` document with one ``<account>`` element per record."""
+
+    name = "xml"
+    label = "XML"
+
+    def header(self) -> str:
+        return '<?xml version="1.0" encoding="UTF-8"?>\n<accounts>\n'
+
+    def format_record(self, record: IBANRecord) -> str:
+        if self.fields:
+            body = "".join(map(_xml_element, self.fields, self.field_values(record)))
+        else:
+            body = "".join(
+                (
+                    _xml_element("iban", record.iban),
+                    self._xml_list("account_holders", "holder", record.account_holders),
+                    self._xml_list(
+                        "beneficiaries", "beneficiary", record.beneficiaries
+                    ),
+                    self.bank_fragment(record.bank, _bank_xml),
+                )
+            )
+        return f"  <account>{body}</account>\n"
+
+    def _xml_list(self, tag: str, item_tag: str, people) -> str:
+        if not people:
+            return f"<{tag} />"
+        fragment = self.person_fragment
+        items = "".join(
+            [
+                f"<{item_tag}>{fragment(p, _person_xml_body)}</{item_tag}>"
+                for p in people
+            ]
+        )
+        return f"<{tag}>{items}</{tag}>"
+
+    def footer(self) -> str:
+        return "</accounts>\n"
+
+
+class _SinkStream(io.RawIOBase):
+    """Write-only file object forwarding to a writer's sinks (for pyarrow)."""
+
+    def __init__(self, writer: RecordWriter):
+        super().__init__()
+        self._writer = writer
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._writer._emit_bytes(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+
+class ParquetWriter(RecordWriter):
+    """Apache Parquet file written in row groups (requires ``pyarrow``).
+
+    Records are buffered column-wise and flushed as one row group every
+    ``row_group_size`` records. Holders and beneficiaries are nested
+    ``list<struct>`` columns and the bank columns are dictionary-encoded.
+    With ``fields`` every selected field becomes a string column.
+    """
+
+    name = "parquet"
+    label = "Parquet"
+    binary = True
+    options = ("row_group_size",)
+    # The file footer is built from state kept by the pyarrow writer
+    resumable = False
+
+    DEFAULT_ROW_GROUP_SIZE = 100_000
+
+    def __init__(
+        self,
+        sinks: Iterable[Sink],
+        *,
+        row_group_size: Optional[int] = None,
+        **kwargs,
+    ):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError(
+                "Parquet output requires pyarrow; install it with "
+                "'pip install gen-ibans[parquet]'"
+            ) from None
+        super().__init__(sinks, **kwargs)
+        if row_group_size is not None and row_group_size < 1:
+            raise ValueError("row_group_size must be a positive integer")
+        self.row_group_size = row_group_size or self.DEFAULT_ROW_GROUP_SIZE
+        self._pa = pa
+        self._pq = pq
+        self.schema = self._build_schema()
+        self._columns: Dict[str, List[Any]] = {n: [] for n in self.schema.names}
+        self._pending = 0
+        self._parquet = None
+
+    def _build_schema(self):
+        pa = self._pa
+        text = pa.string()
+        bank_text = pa.dictionary(pa.int32(), pa.string())
+        if self.fields:
+            return pa.schema(
+                [
+                    (f, bank_text if canonical_field(f) in _BANK_FIELDS else text)
+                    for f in self.fields
+                ]
+            )
+        person = pa.struct(
+            [
+                ("type", text),
+                ("name", text),
+                ("first_name", text),
+                ("last_name", text),
+                ("birth_date", pa.date32()),
+                ("tax_id", text),
+                ("wid", text),
+                ("street_address", text),
+                ("city", text),
+                ("postal_code", text),
+            ]
+        )
+        return pa.schema(
+            [
+                ("iban", text),
+                ("account_holders", pa.list_(person)),
+                ("beneficiaries", pa.list_(person)),
+                ("bank_name", bank_text),
+                ("bic", bank_text),
+                ("bank_code", bank_text),
+            ]
+        )
+
+    @staticmethod
+    def _person_row(person) -> dict:
+        if isinstance(person, LegalEntity):
+            return {
+                "type": "legal_entity",
+                "name": person.name,
+                "wid": person.wid,
+                "street_address": person.street_address,
+                "city": person.city,
+                "postal_code": person.postal_code,
+            }
+        return {
+            "type": "natural_person",
+            "first_name": person.first_name,
+            "last_name": person.last_name,
+            "birth_date": person.birth_date,
+            "tax_id": person.tax_id,
+            "wid": getattr(person, "wid", None),
+            "street_address": person.street_address,
+            "city": person.city,
+            "postal_code": person.postal_code,
+        }
+
+    def _start(self) -> None:
+        self._parquet = self._pq.ParquetWriter(_SinkStream(self), self.schema)
+
+    def write(self, record: IBANRecord) -> None:
+        if not self._opened:
+            self.open()
+        columns = self._columns
+        if self.fields:
+            for f, value in zip(self.fields, self.field_values(record)):
+                columns[f].append(value)
+        else:
+            columns["iban"].append(record.iban)
+            columns["account_holders"].append(
+                [self._person_row(h) for h in record.account_holders]
+            )
+            columns["beneficiaries"].append(
+                [self._person_row(b) for b in record.beneficiaries]
+            )
+            columns["bank_name"].append(record.bank.name)
+            columns["bic"].append(record.bank.bic)
+            columns["bank_code"].append(record.bank.bankleitzahl)
+        self.count += 1
+        self._pending += 1
+        if self._pending >= self.row_group_size:
+            self._flush_row_group()
+
+    def _flush_row_group(self) -> None:
+        if not self._pending:
+            return
+        pa = self._pa
+        arrays = []
+        for field in self.schema:
+            values = self._columns[field.name]
+            if pa.types.is_dictionary(field.type):
+                arrays.append(pa.array(values, pa.string()).dictionary_encode())
+            else:
+                arrays.append(pa.array(values, field.type))
+            self._columns[field.name] = []
+        self._pending = 0
+        table = pa.Table.from_arrays(arrays, schema=self.schema)
+        self._parquet.write_table(table, row_group_size=self.row_group_size)
+
+    def suspend(self) -> None:
+        if self._parquet is not None:
+            self._flush_row_group()
+        super().suspend()
+
+    def _finish(self) -> None:
+        self._flush_row_group()
+        self._parquet.close()
+
+
+#: Registered writers by ``--format`` name
+WRITERS: Dict[str, Type[RecordWriter]] = {}
+
+
+def register_writer(cls: Type[RecordWriter]) -> Type[RecordWriter]:
+    """Register a writer class under its ``name`` (usable as a decorator)."""
+    if not cls.name:
+        raise ValueError(f"Writer {cls.__name__} has no format name")
+    WRITERS[cls.name] = cls
+    return cls
+
+
+for _cls in (
+    TxtWriter,
+    CsvWriter,
+    RelationalCsvWriter,
+    SqliteWriter,
+    XmlWriter,
+    JsonWriter,
+    JsonlWriter,
+    ParquetWriter,
+):
+    register_writer(_cls)
+
+
+def get_writer_class(name: Optional[str]) -> Type[RecordWriter]:
+    """Return the writer class for a format name (plain text when None)."""
+    if name is None:
+        return TxtWriter
+    try:
+        return WRITERS[name]
+    except KeyError:
+        raise ValueError(f"Unsupported format: {name}") from None
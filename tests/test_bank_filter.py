@@ -0,0 +1,145 @@
+"""
+Tests for the indexed bank filter engine.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import re
+import unittest
+
+from gen_ibans.bank_filter import BankFilter, FilterTerm
+from gen_ibans.bank_index import BankIndex
+from gen_ibans.iban_generator import BankInfo, IBANGenerator
+
+
+class TestFilterTerm(unittest.TestCase):
+    """Test parsing of filter terms."""
+
+    def test_parse_exact_and_prefix(self):
+        self.assertEqual(
+            FilterTerm.parse("blz:37040044"), FilterTerm("blz", "37040044")
+        )
+        self.assertEqual(
+            FilterTerm.parse("BIC=COBADE*"), FilterTerm("bic", "COBADE", True)
+        )
+        self.assertEqual(FilterTerm.parse("city:Köln").field, "ort")
+
+    def test_parse_invalid(self):
+        with self.assertRaises(ValueError):
+            FilterTerm.parse("blz")
+        with self.assertRaises(ValueError):
+            FilterTerm.parse("name:Sparkasse")
+
+
+class TestBankFilter(unittest.TestCase):
+    """Test set algebra and caching of bank filters."""
+
+    def setUp(self):
+        self.banks = [
+            BankInfo(
+                "10000000", "MARKDEF1100", "Bundesbank", "09", "1", "10591", "Berlin"
+            ),
+            BankInfo(
+                "10010010", "PBNKDEFFXXX", "Postbank", "24", "1", "10559", "Berlin"
+            ),
+            BankInfo(
+                "37040044", "COBADEFFXXX", "Commerzbank", "13", "1", "50667", "Köln"
+            ),
+            BankInfo(
+                "37040044", "COBADEFFXXX", "Commerzbank", "13", "2", "50999", "Köln"
+            ),
+            BankInfo(
+                "37050198",
+                "COLSDE33XXX",
+                "Sparkasse KölnBonn",
+                "A1",
+                "1",
+                "50667",
+                "Köln",
+            ),
+        ]
+        self.index = BankIndex(self.banks)
+
+    def _names(self, bank_filter):
+        return [(b.bankleitzahl, b.merkmal) for b in bank_filter.apply(self.index)]
+
+    def test_empty_filter_keeps_all(self):
+        self.assertTrue(BankFilter().is_empty)
+        self.assertEqual(len(BankFilter().apply(self.index)), 5)
+
+    def test_same_field_or_different_fields_and(self):
+        bank_filter = BankFilter.from_options(
+            include=["region:1", "region:3", "merkmal:1", "ort:köln"]
+        )
+        self.assertEqual(
+            self._names(bank_filter), [("37040044", "1"), ("37050198", "1")]
+        )
+
+    def test_prefix_and_exclude(self):
+        bank_filter = BankFilter.from_options(
+            include=["plz:50*"], exclude=["bic:COBADE*"]
+        )
+        self.assertEqual(self._names(bank_filter), [("37050198", "1")])
+
+    def test_implemented_methods_only(self):
+        bank_filter = BankFilter.from_options(implemented_methods_only=True)
+        self.assertNotIn(
+            "37050198", [b.bankleitzahl for b in bank_filter.apply(self.index)]
+        )
+
+    def test_regex_applied_to_candidates(self):
+        bank_filter = BankFilter.from_options(include=["region:3"], name_regex="spark")
+        self.assertEqual(self._names(bank_filter), [("37050198", "1")])
+        with self.assertRaises(re.error):
+            BankFilter.from_options(bic_regex="(").apply(self.index)
+
+    def test_equal_expressions_share_cached_result(self):
+        first = BankFilter.from_options(include=["method:13", "method:09"])
+        second = BankFilter.from_options(include=["method:09", "method:13"])
+        self.assertEqual(first, second)
+        self.assertEqual(self._names(first), self._names(second))
+        # The second call is served from the index without rebuilding
+        self.assertEqual(
+            self.index.cached_view(("bank_filter", second), self.fail),
+            first.apply(self.index),
+        )
+
+    def test_cache_survives_filtered_banks_assignment(self):
+        generator = IBANGenerator(banks=self.banks, seed=1)
+        bank_filter = BankFilter.from_options(include=["ort:köln"])
+        generator.banks = generator.select_banks(bank_filter)
+        self.assertEqual(len(generator.banks), 3)
+        self.assertEqual(len(generator.bank_index), 3)
+
+        # Re-filtering starts from the full table and hits the cached view
+        again = BankFilter.from_options(include=["ort:köln"])
+        self.assertIs(generator.source_index.banks, self.banks)
+        self.assertEqual(
+            generator.source_index.cached_view(("bank_filter", again), self.fail),
+            generator.banks,
+        )
+        self.assertEqual(generator.select_banks(again), generator.banks)
+        berlin = generator.select_banks(BankFilter.from_options(include=["ort:berlin"]))
+        self.assertEqual([b.bankleitzahl for b in berlin], ["10000000", "10010010"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+Tests for the bank lookup index.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import os
+import tempfile
+import unittest
+
+from gen_ibans.bank_index import BankIndex, normalize_bic
+from gen_ibans.iban_generator import BankInfo, IBANGenerator, validate_iban
+
+
+CSV_CONTENT = """Bankleitzahl;Merkmal;Bezeichnung;PLZ;Ort;Kurzbezeichnung;PAN;BIC;Prüfzifferberechnungsmethode;Datensatznummer;Änderungskennzeichen;Bankleitzahllöschung;Nachfolge-Bankleitzahl
+"10000000";"1";"Bundesbank";"10591";"Berlin";"BBk Berlin";"20100";"MARKDEF1100";"09";"011380";"U";"0";"00000000"
+"10010010";"1";"Postbank";"10559";"Berlin";"Postbank Berlin";"10010";"PBNKDEFFXXX";"24";"000538";"U";"0";"00000000"
+"37040044";"1";"Commerzbank";"50667";"Köln";"Commerzbank Köln";"24100";"COBADEFFXXX";"13";"024463";"U";"0";"00000000"
+"""
+
+
+class TestBankIndex(unittest.TestCase):
+    """Test BankIndex lookups."""
+
+    def setUp(self):
+        self.banks = [
+            BankInfo("10000000", "MARKDEF1100", "Bundesbank", "09"),
+            BankInfo("10010010", "PBNKDEFFXXX", "Postbank", "24"),
+            BankInfo("37040044", "COBADEFFXXX", "Commerzbank", "13"),
+            BankInfo("37040044", "COBADEFFXXX", "Commerzbank Filiale", "13"),
+        ]
+        self.index = BankIndex(self.banks)
+
+    def test_normalize_bic(self):
+        self.assertEqual(normalize_bic("cobadeff"), "COBADEFFXXX")
+        self.assertEqual(normalize_bic(" COBADEFF370 "), "COBADEFF370")
+        self.assertEqual(normalize_bic(None), "")
+
+    def test_lookup_by_blz(self):
+        self.assertEqual(self.index.get_by_blz("10010010").name, "Postbank")
+        self.assertEqual(len(self.index.find_by_blz("37040044")), 2)
+        self.assertIsNone(self.index.get_by_blz("99999999"))
+        self.assertTrue(self.index.has_blz("10000000"))
+
+    def test_lookup_by_bic_accepts_bic8(self):
+        self.assertEqual(self.index.ids_by_bic("COBADEFF"), [2, 3])
+        self.assertEqual(self.index.find_by_bic("markdef1100")[0].name, "Bundesbank")
+        self.assertEqual(self.index.find_by_bic("NOPEDEFF"), [])
+
+    def test_returned_ids_are_copies(self):
+        self.index.ids_by_bic("COBADEFF").append(0)
+        self.index.ids("blz", "37040044").clear()
+        self.assertEqual(self.index.ids_by_bic("COBADEFF"), [2, 3])
+        self.assertEqual(len(self.index.find_by_blz("37040044")), 2)
+
+    def test_lookup_by_method_and_region(self):
+        self.assertEqual(
+            [b.name for b in self.index.find_by_method("24")], ["Postbank"]
+        )
+        self.assertEqual(len(self.index.find_by_region(1)), 2)
+        self.assertEqual(len(self.index.find_by_region("3")), 2)
+        self.assertEqual(self.index.method_codes, ["09", "13", "24"])
+        self.assertEqual(self.index.regions, ["1", "3"])
+
+
+class TestGeneratorIndexIntegration(unittest.TestCase):
+    """Test the generator's use of the bank index."""
+
+    def setUp(self):
+        self.temp_csv = tempfile.NamedTemporaryFile(
+            mode="w", delete=False, suffix=".csv", encoding="utf-8"
+        )
+        self.temp_csv.write(CSV_CONTENT)
+        self.temp_csv.close()
+        self.generator = IBANGenerator(self.temp_csv.name, seed=7)
+
+    def tearDown(self):
+        if os.path.exists(self.temp_csv.name):
+            os.unlink(self.temp_csv.name)
+
+    def test_csv_columns_indexed(self):
+        bank = self.generator.banks[2]
+        self.assertEqual(
+            (bank.merkmal, bank.postal_code, bank.city), ("1", "50667", "Köln")
+        )
+        self.assertEqual(
+            sorted(self.generator.bank_index.ids("plz", "105", prefix=True)), [0, 1]
+        )
+        self.assertEqual(self.generator.bank_index.ids("ort", "KÖLN"), [2])
+
+    def test_get_bank_by_blz(self):
+        self.assertEqual(self.generator.get_bank_by_blz("37040044").bic, "COBADEFFXXX")
+
+    def test_index_rebuilt_after_banks_replaced(self):
+        self.generator.banks = [
+            b for b in self.generator.banks if b.method_code == "09"
+        ]
+        self.assertEqual(len(self.generator.bank_index), 1)
+        self.assertIsNone(self.generator.get_bank_by_blz("37040044"))
+
+    def test_generate_iban_for_bic(self):
+        record = self.generator.generate_iban_for_bic("PBNKDEFF")
+        self.assertEqual(record.bank.bankleitzahl, "10010010")
+        self.assertTrue(validate_iban(record.iban, self.generator.bank_index))
+        with self.assertRaises(ValueError):
+            self.generator.generate_iban_for_bic("NOPEDEFFXXX")
+
+    def test_validate_iban_with_index_requires_known_blz(self):
+        index = self.generator.bank_index
+        # Valid checksum but BLZ 12030000 is not in the loaded table
+        self.assertTrue(validate_iban("DE02120300000000202051"))
+        self.assertFalse(validate_iban("DE02120300000000202051", index))
+        self.assertTrue(validate_iban("DE89370400440532013000", index))
+
+
+if __name__ == "__main__":
+    unittest.main()
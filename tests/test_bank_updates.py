@@ -0,0 +1,251 @@
+"""
+Tests for incremental bank data updates.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import os
+import tempfile
+import unittest
+
+from gen_ibans.bank_updates import (
+    BankDelta,
+    apply_bank_update,
+    resolve_successor,
+    successor_map,
+)
+from gen_ibans.iban_generator import BankInfo, IBANGenerator
+
+
+HEADER = "Bankleitzahl;Merkmal;Bezeichnung;PLZ;Ort;Kurzbezeichnung;PAN;BIC;Prüfzifferberechnungsmethode;Datensatznummer;Änderungskennzeichen;Bankleitzahllöschung;Nachfolge-Bankleitzahl\n"
+
+RELEASE_1 = HEADER + (
+    '"10000000";"1";"Bundesbank";"10591";"Berlin";"BBk Berlin";"20100";"MARKDEF1100";"09";"011380";"U";"0";"00000000"\n'
+    '"10010010";"1";"Postbank";"10559";"Berlin";"Postbank Berlin";"10010";"PBNKDEFFXXX";"24";"000538";"U";"0";"00000000"\n'
+    '"37040044";"1";"Commerzbank";"50667";"Köln";"Commerzbank Köln";"24100";"COBADEFFXXX";"13";"024463";"U";"0";"00000000"\n'
+)
+
+# Postbank deleted (successor Commerzbank), Commerzbank renamed, new bank added
+RELEASE_2 = HEADER + (
+    '"10000000";"1";"Bundesbank";"10591";"Berlin";"BBk Berlin";"20100";"MARKDEF1100";"09";"011380";"U";"0";"00000000"\n'
+    '"10010010";"1";"Postbank";"10559";"Berlin";"Postbank Berlin";"10010";"PBNKDEFFXXX";"24";"000538";"D";"1";"37040044"\n'
+    '"37040044";"1";"Commerzbank AG";"50667";"Köln";"Commerzbank Köln";"24100";"COBADEFFXXX";"13";"024463";"M";"0";"00000000"\n'
+    '"50050000";"1";"Landesbank";"60311";"Frankfurt";"Helaba";"50050";"HELADEFFXXX";"01";"030001";"A";"0";"00000000"\n'
+)
+
+
+class TestApplyBankUpdate(unittest.TestCase):
+    """Test delta application on plain bank lists."""
+
+    def _bank(self, blz, name, record, flag="U", successor=None, deleted=False):
+        return BankInfo(
+            blz,
+            "COBADEFFXXX",
+            name,
+            "13",
+            merkmal="1",
+            record_number=record,
+            change_flag=flag,
+            deleted=deleted,
+            successor_blz=successor,
+        )
+
+    def test_added_deleted_modified(self):
+        old = [
+            self._bank("10000000", "A", "000001"),
+            self._bank("20000000", "B", "000002"),
+            self._bank("30000000", "C", "000003"),
+        ]
+        update = [
+            self._bank("10000000", "A", "000001"),
+            self._bank("20000000", "B", "000002", "D", "30000000", True),
+            self._bank("30000000", "C neu", "000003", "M"),
+            self._bank("40000000", "D", "000004", "A"),
+        ]
+
+        banks, delta = apply_bank_update(old, update, drop_deleted=True)
+
+        self.assertEqual(
+            [b.bankleitzahl for b in banks], ["10000000", "30000000", "40000000"]
+        )
+        self.assertEqual(delta.added, ("40000000",))
+        self.assertEqual(delta.deleted, ("20000000",))
+        self.assertEqual(delta.modified, ("30000000",))
+        self.assertEqual(delta.unchanged_records, 1)
+        self.assertEqual(delta.successors, {"20000000": "30000000"})
+        # Unchanged records keep their objects
+        self.assertIs(banks[0], old[0])
+
+    def test_deleted_records_are_kept_by_default(self):
+        old = [self._bank("10000000", "A", "000001")]
+        update = [self._bank("10000000", "A", "000001", "D", "20000000", True)]
+
+        banks, delta = apply_bank_update(old, update)
+
+        self.assertEqual(len(banks), 1)
+        self.assertTrue(banks[0].deleted)
+        self.assertEqual(delta.deleted, ())
+        self.assertEqual(delta.modified, ("10000000",))
+        self.assertEqual(delta.successors, {"10000000": "20000000"})
+
+    def test_missing_records_are_deleted(self):
+        old = [
+            self._bank("10000000", "A", "000001"),
+            self._bank("20000000", "B", "000002"),
+        ]
+        banks, delta = apply_bank_update(old, [self._bank("10000000", "A", "000001")])
+
+        self.assertEqual(len(banks), 1)
+        self.assertEqual(delta.deleted, ("20000000",))
+
+    def test_branch_change_marks_blz_modified(self):
+        old = [self._bank("10000000", "Main", "000001")]
+        branch = self._bank("10000000", "Branch", "000002", "A")
+        branch.merkmal = "2"
+
+        banks, delta = apply_bank_update(old, old + [branch])
+
+        self.assertEqual(len(banks), 2)
+        self.assertEqual(delta.added, ())
+        self.assertEqual(delta.modified, ("10000000",))
+
+    def test_identical_release_is_empty(self):
+        old = [self._bank("10000000", "A", "000001")]
+        banks, delta = apply_bank_update(old, [self._bank("10000000", "A", "000001")])
+
+        self.assertTrue(delta.is_empty)
+        self.assertIsInstance(delta, BankDelta)
+        self.assertIn("0 added", str(delta))
+
+    def test_resolve_successor_chain_and_cycle(self):
+        successors = {"1": "2", "2": "3", "7": "8", "8": "7"}
+        self.assertEqual(resolve_successor("1", successors), "3")
+        self.assertEqual(resolve_successor("5", successors), "5")
+        self.assertEqual(resolve_successor("7", successors), "8")
+
+    def test_successor_map_ignores_empty(self):
+        banks = [
+            self._bank("10000000", "A", "000001"),
+            self._bank("20000000", "B", "000002", "D", "10000000", True),
+        ]
+        self.assertEqual(successor_map(banks), {"20000000": "10000000"})
+
+
+class TestGeneratorUpdate(unittest.TestCase):
+    """Test IBANGenerator.update_banks with release files."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def test_change_columns_are_parsed(self):
+        generator = IBANGenerator(self._write("r2.csv", RELEASE_2), seed=1)
+        commerzbank = generator.get_bank_by_blz("37040044")
+
+        self.assertEqual(commerzbank.record_number, "024463")
+        self.assertEqual(commerzbank.change_flag, "M")
+        self.assertFalse(commerzbank.deleted)
+        self.assertIsNone(commerzbank.successor_blz)
+        postbank = generator.get_bank_by_blz("10010010")
+        self.assertTrue(postbank.deleted)
+        self.assertEqual(postbank.successor_blz, "37040044")
+        self.assertEqual(generator.successors, {"10010010": "37040044"})
+
+    def test_deleted_banks_can_be_dropped(self):
+        generator = IBANGenerator(
+            self._write("r2.csv", RELEASE_2), seed=1, drop_deleted_banks=True
+        )
+
+        self.assertEqual(generator.get_bank_count(), 3)
+        self.assertIsNone(generator.get_bank_by_blz("10010010"))
+        self.assertEqual(generator.successors, {"10010010": "37040044"})
+
+    def test_deletion_flags_do_not_change_seeded_output(self):
+        unflagged = RELEASE_2.replace('"D";"1";"37040044"', '"U";"0";"00000000"')
+        flagged = IBANGenerator(self._write("r2.csv", RELEASE_2), seed=5)
+        plain = IBANGenerator(self._write("plain.csv", unflagged), seed=5)
+
+        ibans = [flagged.generate_iban().iban for _ in range(50)]
+        self.assertEqual(ibans, [plain.generate_iban().iban for _ in range(50)])
+        self.assertTrue(any(iban[4:12] == "10010010" for iban in ibans))
+
+    def test_full_load_matches_applied_delta(self):
+        release_1 = self._write("r1.csv", RELEASE_1)
+        release_2 = self._write("r2.csv", RELEASE_2)
+
+        def table(generator):
+            return [
+                (bank.record_number, bank.bankleitzahl, bank.name)
+                for bank in generator.banks
+            ]
+
+        for drop in (False, True):
+            with self.subTest(drop_deleted_banks=drop):
+                loaded = IBANGenerator(release_2, seed=1, drop_deleted_banks=drop)
+                updated = IBANGenerator(release_1, seed=1, drop_deleted_banks=drop)
+                updated.update_banks(release_2)
+
+                self.assertEqual(table(loaded), table(updated))
+                self.assertEqual(len(loaded.banks), 3 if drop else 4)
+                self.assertEqual(loaded.successors, updated.successors)
+
+    def test_update_banks_applies_delta(self):
+        generator = IBANGenerator(
+            self._write("r1.csv", RELEASE_1), seed=1, drop_deleted_banks=True
+        )
+        bundesbank = generator.get_bank_by_blz("10000000")
+
+        delta = generator.update_banks(self._write("r2.csv", RELEASE_2))
+
+        self.assertEqual(delta.added, ("50050000",))
+        self.assertEqual(delta.deleted, ("10010010",))
+        self.assertEqual(delta.modified, ("37040044",))
+        self.assertEqual(generator.get_bank_count(), 3)
+        self.assertIs(generator.get_bank_by_blz("10000000"), bundesbank)
+        self.assertIsNone(generator.get_bank_by_blz("10010010"))
+
+        # Deleted BLZ resolves to its successor
+        self.assertEqual(generator.resolve_blz("10010010"), "37040044")
+        self.assertEqual(generator.get_current_bank("10010010").name, "Commerzbank AG")
+
+        # Generation only uses the active banks afterwards
+        for _ in range(20):
+            self.assertNotEqual(generator.generate_iban().bank.bankleitzahl, "10010010")
+
+    def test_failed_update_keeps_table(self):
+        generator = IBANGenerator(self._write("r1.csv", RELEASE_1), seed=1)
+        banks = generator.banks
+
+        with self.assertRaises(ValueError):
+            generator.update_banks(os.path.join(self.tmp.name, "missing.csv"))
+
+        self.assertIs(generator.banks, banks)
+        self.assertEqual(generator.get_bank_count(), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -26,6 +26,7 @@ import unittest
 import tempfile
 import os
 import csv
+import json
 from unittest.mock import patch
 from io import StringIO
 from click.testing import CliRunner
@@ -421,6 +422,243 @@ class TestMainFunction(unittest.TestCase):
             if os.path.exists(output_path):
                 os.unlink(output_path)
 
+    def test_main_echo_matches_file_output(self):
+        """Stdout echo and file receive the same serialized document."""
+        with tempfile.TemporaryDirectory() as tmp:
+            for fmt in ("csv", "json", "jsonl", "xml"):
+                output_path = os.path.join(tmp, f"out.{fmt}")
+                result = CliRunner().invoke(
+                    main,
+                    [
+                        self.temp_csv.name,
+                        "--count",
+                        "3",
+                        "--seed",
+                        "7",
+                        "--format",
+                        fmt,
+                        "--output",
+                        output_path,
+                        "--clean",
+                    ],
+                )
+                self.assertEqual(result.exit_code, 0, result.output)
+                with open(output_path, "rb") as f:
+                    self.assertEqual(result.stdout_bytes, f.read())
+
+    def test_main_compressed_output(self):
+        """Compression follows the extension or --compress; echo stays plain."""
+        import gzip
+        import lzma
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, extra, opener in (
+                ("out.csv.gz", [], gzip.open),
+                ("out.csv", ["--compress", "xz", "--compress-level", "1"], lzma.open),
+            ):
+                output_path = os.path.join(tmp, name)
+                result = CliRunner().invoke(
+                    main,
+                    [
+                        self.temp_csv.name,
+                        "--count",
+                        "5",
+                        "--seed",
+                        "7",
+                        "--format",
+                        "csv",
+                        "--output",
+                        output_path,
+                        "--clean",
+                    ]
+                    + extra,
+                )
+                self.assertEqual(result.exit_code, 0, result.output)
+                with opener(output_path, "rb") as f:
+                    self.assertEqual(f.read(), result.stdout_bytes)
+
+            result = CliRunner().invoke(
+                main,
+                [
+                    self.temp_csv.name,
+                    "--format",
+                    "parquet",
+                    "--output",
+                    os.path.join(tmp, "out.parquet"),
+                    "--compress",
+                    "gzip",
+                ],
+            )
+            self.assertNotEqual(result.exit_code, 0)
+            self.assertIn(
+                "--compress is not supported for --format parquet", result.output
+            )
+
+    def test_main_split_output(self):
+        """--split-every writes numbered parts and a manifest instead of --output."""
+        with tempfile.TemporaryDirectory() as tmp:
+            output_path = os.path.join(tmp, "out.jsonl")
+            result = CliRunner().invoke(
+                main,
+                [
+                    self.temp_csv.name,
+                    "--count",
+                    "5",
+                    "--format",
+                    "jsonl",
+                    "--output",
+                    output_path,
+                    "--split-every",
+                    "2",
+                ],
+            )
+            self.assertEqual(result.exit_code, 0, result.output)
+            self.assertNotIn('{"iban"', result.stdout)
+            self.assertIn("3 parts", result.output)
+            with open(os.path.join(tmp, "out.manifest.json"), encoding="utf-8") as f:
+                manifest = json.load(f)
+            self.assertEqual([p["records"] for p in manifest["parts"]], [2, 2, 1])
+            self.assertTrue(os.path.exists(os.path.join(tmp, "out-00003.jsonl")))
+
+            result = CliRunner().invoke(
+                main, [self.temp_csv.name, "--format", "csv", "--split-size", "1MB"]
+            )
+            self.assertNotEqual(result.exit_code, 0)
+            self.assertIn("require --output", result.output)
+
+    def test_main_partitioned_output(self):
+        """--partition-by routes records to per-bucket files next to --output."""
+        with tempfile.TemporaryDirectory() as tmp:
+            result = CliRunner().invoke(
+                main,
+                [
+                    self.temp_csv.name,
+                    "--count",
+                    "20",
+                    "--format",
+                    "csv",
+                    "--output",
+                    os.path.join(tmp, "out.csv"),
+                    "--partition-by",
+                    "blz",
+                    "--partitions",
+                    "3",
+                ],
+            )
+            self.assertEqual(result.exit_code, 0, result.output)
+            files = sorted(
+                f for f in os.listdir(tmp) if f.startswith("out-blz-bucket-")
+            )
+            self.assertEqual(len(files), 3)
+            rows = 0
+            for name in files:
+                with open(os.path.join(tmp, name), newline="", encoding="utf-8") as f:
+                    rows += len(list(csv.reader(f))) - 1
+            self.assertEqual(rows, 20)
+
+    def test_main_progress_file(self):
+        """--progress-file receives JSON progress events."""
+        with tempfile.TemporaryDirectory() as tmp:
+            progress_path = os.path.join(tmp, "progress.jsonl")
+            result = CliRunner().invoke(
+                main,
+                [
+                    self.temp_csv.name,
+                    "--count",
+                    "6",
+                    "--clean",
+                    "--progress-file",
+                    progress_path,
+                    "--progress-every",
+                    "3",
+                ],
+            )
+            self.assertEqual(result.exit_code, 0, result.output)
+            with open(progress_path, encoding="utf-8") as f:
+                events = [json.loads(line) for line in f]
+            self.assertEqual(
+                [e["event"] for e in events], ["start", "progress", "progress", "done"]
+            )
+            self.assertEqual(events[-1]["done"], 6)
+            self.assertIn("rate", events[1])
+            self.assertIn("eta", events[1])
+
+    def test_main_rejects_unknown_fields(self):
+        """Unknown --fields entries fail before any data is loaded."""
+        with patch("gen_ibans.cli._determine_data_file_path") as determine:
+            result = CliRunner().invoke(
+                main, [self.temp_csv.name, "--fields", "iban,holder_count,colour"]
+            )
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("Unknown field(s): colour", result.output)
+        determine.assert_not_called()
+
+    def test_main_parquet_requires_output(self):
+        """Binary formats are never written to stdout."""
+        result = CliRunner().invoke(
+            main, [self.temp_csv.name, "--count", "1", "--format", "parquet"]
+        )
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("--format parquet requires --output", result.output)
+
+    def test_main_parquet_output(self):
+        """Parquet is written in row groups of --row-group-size records."""
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            self.skipTest("pyarrow not installed")
+        with tempfile.TemporaryDirectory() as tmp:
+            output_path = os.path.join(tmp, "out.parquet")
+            result = CliRunner().invoke(
+                main,
+                [
+                    self.temp_csv.name,
+                    "--count",
+                    "5",
+                    "--seed",
+                    "3",
+                    "--format",
+                    "parquet",
+                    "--output",
+                    output_path,
+                    "--row-group-size",
+                    "2",
+                ],
+            )
+            self.assertEqual(result.exit_code, 0, result.output)
+            self.assertNotIn("PAR1", result.stdout)
+            self.assertIn(f"IBANs written to Parquet: {output_path}", result.output)
+            metadata = pq.ParquetFile(output_path).metadata
+            self.assertEqual(metadata.num_rows, 5)
+            self.assertEqual(metadata.num_row_groups, 3)
+
+    def test_main_sqlite_output(self):
+        """--format sqlite loads the normalized tables into a database file."""
+        import sqlite3
+
+        with tempfile.TemporaryDirectory() as tmp:
+            output_path = os.path.join(tmp, "fixtures.db")
+            result = CliRunner().invoke(
+                main,
+                [
+                    self.temp_csv.name,
+                    "--count",
+                    "4",
+                    "--format",
+                    "sqlite",
+                    "--output",
+                    output_path,
+                ],
+            )
+            self.assertEqual(result.exit_code, 0, result.output)
+            self.assertIn(f"IBANs written to SQLite: {output_path}", result.output)
+            connection = sqlite3.connect(output_path)
+            try:
+                count = connection.execute("SELECT COUNT(*) FROM accounts").fetchone()
+            finally:
+                connection.close()
+            self.assertEqual(count, (4,))
+
     def test_main_file_not_found_error(self):
         """Test main function error handling for missing file."""
         runner = CliRunner()
@@ -451,6 +689,69 @@ class TestMainFunction(unittest.TestCase):
         finally:
             os.unlink(temp_csv_no_bic.name)
 
+    def test_main_stale_while_revalidate_passed_to_downloader(self):
+        """Test that --stale-while-revalidate reaches the downloader."""
+        with patch("gen_ibans.cli.BundesbankDownloader") as downloader_cls:
+            downloader_cls.return_value.get_data_file.return_value = self.temp_csv.name
+            runner = CliRunner()
+            result = runner.invoke(
+                main, ["--count", "1", "--stale-while-revalidate", "12", "--clean"]
+            )
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        kwargs = downloader_cls.return_value.get_data_file.call_args.kwargs
+        self.assertEqual(kwargs["stale_while_revalidate_hours"], 12)
+        self.assertEqual(kwargs["background"], "process")
+
+    def test_main_data_version_passed_to_downloader(self):
+        """Test that --data-version pins the downloader to a stored release."""
+        with patch("gen_ibans.cli.BundesbankDownloader") as downloader_cls:
+            downloader_cls.return_value.get_data_file.return_value = self.temp_csv.name
+            runner = CliRunner()
+            result = runner.invoke(
+                main, ["--count", "1", "--data-version", "2025-03-03", "--clean"]
+            )
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        kwargs = downloader_cls.return_value.get_data_file.call_args.kwargs
+        self.assertEqual(kwargs["version"], "2025-03-03")
+
+    def test_main_mirrors_passed_to_downloader(self):
+        """Test that repeated --mirror options keep their order."""
+        with patch("gen_ibans.cli.BundesbankDownloader") as downloader_cls:
+            downloader_cls.return_value.get_data_file.return_value = self.temp_csv.name
+            runner = CliRunner()
+            result = runner.invoke(
+                main,
+                [
+                    "--count",
+                    "1",
+                    "--mirror",
+                    "https://mirror.example/bundesbank/",
+                    "--mirror",
+                    "bundesbank",
+                    "--clean",
+                ],
+            )
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(
+            downloader_cls.call_args.kwargs["mirrors"],
+            ["https://mirror.example/bundesbank/", "bundesbank"],
+        )
+
+    def test_main_timings(self):
+        """Test that --timings reports the loading phases on stderr."""
+        runner = CliRunner()
+        result = runner.invoke(
+            main, [self.temp_csv.name, "--count", "1", "--clean", "--timings"]
+        )
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("Timings:", result.output)
+        self.assertIn("Bank data: local file", result.output)
+        self.assertIn("parse", result.output)
+
 
 if __name__ == "__main__":
     unittest.main()
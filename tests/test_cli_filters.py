@@ -115,3 +115,44 @@ class TestCLIFilters(unittest.TestCase):
             )
             self.assertEqual(result.exit_code, 0, msg=result.output)
             self.assertIn("Loaded 1 banks", result.output)
+
+    def test_indexed_filter_terms(self):
+        # Include by clearing area 1 but exclude the Bundesbank BIC by prefix
+        result = self._run(
+            self.temp_csv.name,
+            "--count",
+            "1",
+            "--seed",
+            "4",
+            "--filter",
+            "region:1",
+            "--filter",
+            "region:3",
+            "--filter-exclude",
+            "bic:MARK*",
+        )
+        self.assertEqual(result.exit_code, 0, msg=result.output)
+        self.assertIn("Loaded 1 banks", result.output)
+        self.assertIn("COBADEFFXXX", result.output)
+
+    def test_drop_deleted_banks(self):
+        # Bundesbank flagged for deletion with Commerzbank as successor
+        flagged = CSV_TWO_BANKS.replace(
+            '"U";"0";"00000000"\n', '"D";"1";"37040044"\n', 1
+        )
+        with open(self.temp_csv.name, "w") as f:
+            f.write(flagged)
+        result = self._run(self.temp_csv.name, "--count", "1", "--seed", "1")
+        self.assertEqual(result.exit_code, 0, msg=result.output)
+        self.assertIn("Loaded 2 banks", result.output)
+
+        result = self._run(
+            self.temp_csv.name, "--count", "1", "--seed", "1", "--drop-deleted-banks"
+        )
+        self.assertEqual(result.exit_code, 0, msg=result.output)
+        self.assertIn("Loaded 1 banks", result.output)
+
+    def test_invalid_filter_term_raises(self):
+        result = self._run(self.temp_csv.name, "--filter", "nofield:1")
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("Invalid bank filter", result.output)
@@ -0,0 +1,130 @@
+"""
+Tests for streaming output compression.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import gzip
+import lzma
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from gen_ibans.compression import (
+    CompressedFile,
+    compression_from_path,
+    compression_suffix,
+)
+from gen_ibans.writers import CsvWriter, FileSink
+
+
+class TestCompressedFile(unittest.TestCase):
+    """Background compression of output files."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_round_trip(self):
+        data = b"".join(b"DE%020d;Bank %d\n" % (i, i % 7) for i in range(50_000))
+        for compression, opener in (("gzip", gzip.open), ("xz", lzma.open)):
+            path = self.path(f"out.{compression}")
+            sink = FileSink(path, buffer_size=1 << 16, compression=compression)
+            for offset in range(0, len(data), 1000):
+                sink.write(data[offset : offset + 1000])
+            sink.close()
+            with opener(path, "rb") as f:
+                self.assertEqual(f.read(), data)
+            self.assertEqual(sink.bytes_written, len(data))
+            self.assertEqual(sink._fp.compressed_bytes, os.path.getsize(path))
+            self.assertLess(os.path.getsize(path), len(data) // 4)
+
+    def test_gzip_output_is_reproducible(self):
+        contents = []
+        for name in ("a.gz", "b.gz"):
+            sink = FileSink(self.path(name), compression="gzip")
+            sink.write(b"same content\n")
+            sink.close()
+            with open(self.path(name), "rb") as f:
+                contents.append(f.read())
+        self.assertEqual(contents[0], contents[1])
+
+    def test_writer_output_is_compressed(self):
+        path = self.path("ibans.csv.gz")
+        CsvWriter.create(path, compression="gzip", compress_level=1).close()
+        with gzip.open(path, "rt", encoding="utf-8", newline="") as f:
+            self.assertTrue(f.read().startswith("IBAN,Account Holders"))
+
+    def test_invalid_settings_are_rejected(self):
+        with self.assertRaises(ValueError):
+            CompressedFile(self.path("x"), "bzip2")
+        with self.assertRaises(ValueError):
+            CompressedFile(self.path("x"), "gzip", level=10)
+
+    def test_missing_zstandard(self):
+        with patch.dict(sys.modules, {"zstandard": None}):
+            with self.assertRaises(RuntimeError) as ctx:
+                CompressedFile(self.path("x.zst"), "zstd")
+        self.assertIn("gen-ibans[zstd]", str(ctx.exception))
+
+    def test_zstd_round_trip(self):
+        try:
+            import zstandard
+        except ImportError:
+            self.skipTest("zstandard not installed")
+        path = self.path("out.zst")
+        sink = FileSink(path, compression="zstd", compress_threads=2)
+        sink.write(b"x" * 100_000)
+        sink.close()
+        with open(path, "rb") as f:
+            reader = zstandard.ZstdDecompressor().stream_reader(f)
+            self.assertEqual(reader.read(), b"x" * 100_000)
+
+    def test_worker_errors_are_raised(self):
+        compressed = CompressedFile(self.path("x.gz"), "gzip")
+
+        class Broken:
+            def compress(self, data):
+                raise OSError("disk full")
+
+        compressed._compressor = Broken()
+        compressed.write(b"data")
+        with self.assertRaises(OSError):
+            compressed.close()
+        self.assertTrue(compressed.closed)
+
+    def test_compression_from_path(self):
+        self.assertEqual(compression_from_path("out.csv.gz"), "gzip")
+        self.assertEqual(compression_from_path("out.JSON.XZ"), "xz")
+        self.assertEqual(compression_from_path("out.jsonl.zst"), "zstd")
+        self.assertIsNone(compression_from_path("out.csv"))
+        self.assertIsNone(compression_from_path(None))
+        self.assertEqual(compression_suffix("zstd"), ".zst")
+        self.assertEqual(compression_suffix(None), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
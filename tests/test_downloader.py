@@ -0,0 +1,613 @@
+"""
+Tests for the Bundesbank downloader cache.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+import zipfile
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+from gen_ibans.downloader import (
+    BundesbankDownloader,
+    CacheLockTimeout,
+    CacheLock,
+    _main,
+)
+from gen_ibans.iban_generator import IBANGenerator
+
+
+CSV_CONTENT = """Bankleitzahl;Merkmal;Bezeichnung;PLZ;Ort;Kurzbezeichnung;PAN;BIC;Prüfzifferberechnungsmethode;Datensatznummer;Änderungskennzeichen;Bankleitzahllöschung;Nachfolge-Bankleitzahl
+"10000000";"1";"Bundesbank";"10591";"Berlin";"BBk Berlin";"20100";"MARKDEF1100";"09";"011380";"U";"0";"00000000"
+"37040044";"1";"Commerzbank";"50667";"Köln";"Commerzbank Köln";"24100";"COBADEFFXXX";"13";"024463";"U";"0";"00000000"
+"""
+
+
+class TestDownloaderArchiveCache(unittest.TestCase):
+    """Test that the downloader caches the compressed archive only."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.source_dir = Path(self.tmp.name) / "source"
+        self.source_dir.mkdir()
+        self.cache_dir = Path(self.tmp.name) / "cache"
+        self.downloader = BundesbankDownloader(str(self.cache_dir))
+
+    def _make_archive(self, members):
+        zip_path = self.source_dir / "blz-aktuell-csv-zip-data.zip"
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, content in members.items():
+                zf.writestr(name, content.encode("iso-8859-1"))
+        return zip_path.as_uri()
+
+    def test_download_keeps_only_archive(self):
+        url = self._make_archive({"blz-aktuell-csv-data.csv": CSV_CONTENT})
+
+        path = self.downloader._download_archive(url, "csv")
+
+        self.assertEqual(path, str(self.cache_dir / "bundesbank_data.csv.zip"))
+        self.assertTrue(zipfile.is_zipfile(path))
+        # No extracted data file and no leftover partial download
+        self.assertEqual(
+            sorted(os.listdir(self.cache_dir)),
+            ["bundesbank_data.csv.meta", "bundesbank_data.csv.zip", "snapshots"],
+        )
+
+        generator = IBANGenerator(path, seed=1)
+        self.assertEqual(generator.get_bank_count(), 2)
+        self.assertEqual(generator.get_bank_by_blz("37040044").name, "Commerzbank")
+
+    def test_archive_without_data_member_is_rejected(self):
+        url = self._make_archive({"readme.txt.pdf": "nothing"})
+
+        with self.assertRaises(Exception) as ctx:
+            self.downloader._download_archive(url, "csv")
+
+        self.assertIn("No csv file found", str(ctx.exception))
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_cached_archive_is_reused(self):
+        url = self._make_archive({"blz-aktuell-csv-data.csv": CSV_CONTENT})
+        path = self.downloader._download_archive(url, "csv")
+
+        cached = self.downloader.get_data_file("csv", check_version=False)
+
+        self.assertEqual(cached, path)
+        self.assertEqual(self.downloader.get_cache_info()["csv"]["path"], path)
+
+
+def _archive_bytes(csv_content):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("blz-aktuell-csv-data.csv", csv_content.encode("iso-8859-1"))
+    return buf.getvalue()
+
+
+class ArchiveServer:
+    """Local stand-in for bundesbank.de serving an index page and one archive."""
+
+    ARCHIVE_PATH = "/resource/blz-aktuell-csv-zip-data.zip"
+
+    def __init__(self, archive, keep_alive=False):
+        self.archive = archive
+        self.etag = '"v1"'
+        self.last_modified = formatdate(usegmt=True)
+        self.requests = []
+        # Client address of each request (one entry per request, repeated on reuse)
+        self.clients = []
+        self.missing = set()
+        # Close the connection after this many body bytes (simulates a broken transfer)
+        self.truncate_after = None
+        # Seconds to wait before answering archive requests (simulates a slow server)
+        self.delay = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1" if keep_alive else "HTTP/1.0"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server.requests.append((self.command, self.path, dict(self.headers)))
+                server.clients.append(self.client_address)
+                if self.path in server.missing:
+                    self.send_error(404)
+                elif self.path == "/index.html":
+                    body = f'<a href="{server.ARCHIVE_PATH}">CSV</a>'.encode()
+                    self.send_response(200)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                elif self.path == server.ARCHIVE_PATH:
+                    if self.headers.get("If-None-Match") == server.etag:
+                        self.send_response(304)
+                        self.send_header("ETag", server.etag)
+                        self.end_headers()
+                        return
+                    self._send_archive()
+                else:
+                    self.send_error(404)
+
+            def _send_archive(self):
+                time.sleep(server.delay)
+                body = server.archive
+                start = 0
+                range_header = self.headers.get("Range")
+                if range_header and self.headers.get("If-Range") == server.etag:
+                    start = int(range_header.split("=")[1].rstrip("-"))
+                    if start >= len(body):
+                        self.send_error(416)
+                        return
+                    self.send_response(206)
+                    self.send_header(
+                        "Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}"
+                    )
+                else:
+                    self.send_response(200)
+                self.send_header("ETag", server.etag)
+                self.send_header("Last-Modified", server.last_modified)
+                self.send_header("Content-Length", str(len(body) - start))
+                self.end_headers()
+                payload = body[start:]
+                if server.truncate_after is not None:
+                    payload = payload[: server.truncate_after]
+                    server.truncate_after = None
+                    self.close_connection = True
+                self.wfile.write(payload)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        # Clients hanging up early (timeouts, hedging) are expected
+        self.httpd.handle_error = lambda request, client_address: None
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.httpd.server_port}{path}"
+
+    def paths(self):
+        return [path for _, path, _ in self.requests]
+
+
+class TestConditionalRevalidation(unittest.TestCase):
+    """Test single-request revalidation against a local HTTP server."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.server = ArchiveServer(_archive_bytes(CSV_CONTENT))
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__)
+        self.downloader = BundesbankDownloader(self.tmp.name)
+        self.downloader.INDEX_URL = self.server.url("/index.html")
+        self.downloader.FALLBACK_URLS = {}
+
+    def _initial_download(self):
+        path = self.downloader.get_data_file("csv")
+        self.server.requests.clear()
+        return path
+
+    def test_first_download_caches_resolved_url(self):
+        path = self.downloader.get_data_file("csv")
+
+        self.assertEqual(
+            self.server.paths(), ["/index.html", ArchiveServer.ARCHIVE_PATH]
+        )
+        metadata = self.downloader._load_cache_metadata("csv")
+        self.assertEqual(metadata["url"], self.server.url(ArchiveServer.ARCHIVE_PATH))
+        self.assertEqual(metadata["etag"], '"v1"')
+        self.assertEqual(
+            self.downloader.get_cache_info()["csv"]["url"], metadata["url"]
+        )
+        self.assertEqual(IBANGenerator(path, seed=1).get_bank_count(), 2)
+
+    def test_not_modified_is_single_conditional_get(self):
+        path = self._initial_download()
+
+        self.assertEqual(self.downloader.get_data_file("csv"), path)
+
+        self.assertEqual(len(self.server.requests), 1)
+        method, request_path, headers = self.server.requests[0]
+        self.assertEqual((method, request_path), ("GET", ArchiveServer.ARCHIVE_PATH))
+        self.assertEqual(headers["If-None-Match"], '"v1"')
+        self.assertEqual(headers["If-Modified-Since"], self.server.last_modified)
+
+    def test_expired_cache_revalidates_without_download(self):
+        path = self._initial_download()
+        old_time = time.time() - 48 * 3600
+        os.utime(path, (old_time, old_time))
+
+        self.downloader.get_data_file("csv", check_version=False)
+
+        self.assertEqual(self.server.paths(), [ArchiveServer.ARCHIVE_PATH])
+        self.assertGreater(os.path.getmtime(path), old_time + 3600)
+
+    def test_changed_archive_is_stored_from_same_request(self):
+        path = self._initial_download()
+        self.server.archive = _archive_bytes(
+            CSV_CONTENT
+            + '"50050000";"1";"Landesbank";"60311";"Frankfurt";"Helaba";"50050";"HELADEFFXXX";"01";"030001";"A";"0";"00000000"\n'
+        )
+        self.server.etag = '"v2"'
+
+        self.assertEqual(self.downloader.get_data_file("csv"), path)
+
+        self.assertEqual(self.server.paths(), [ArchiveServer.ARCHIVE_PATH])
+        self.assertEqual(self.downloader._load_cache_metadata("csv")["etag"], '"v2"')
+        self.assertEqual(IBANGenerator(path, seed=1).get_bank_count(), 3)
+
+    def test_moved_archive_resolves_url_again(self):
+        self._initial_download()
+        self.server.missing.add(ArchiveServer.ARCHIVE_PATH)
+        self.server.ARCHIVE_PATH = "/resource/new/blz-aktuell-csv-zip-data.zip"
+
+        self.downloader.get_data_file("csv")
+
+        self.assertEqual(
+            self.server.paths(),
+            [
+                "/resource/blz-aktuell-csv-zip-data.zip",
+                "/index.html",
+                "/resource/new/blz-aktuell-csv-zip-data.zip",
+            ],
+        )
+
+    def test_unreachable_server_keeps_fresh_cache(self):
+        path = self._initial_download()
+        self.server.__exit__()
+
+        self.assertEqual(self.downloader.get_data_file("csv"), path)
+
+
+class TestResumableDownload(unittest.TestCase):
+    """Test chunked, resumable downloads against a local HTTP server."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        # Uncompressed members make the archive large enough for several chunks
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as zf:
+            zf.writestr("blz-aktuell-csv-data.csv", CSV_CONTENT.encode("iso-8859-1"))
+            zf.writestr("padding.bin", os.urandom(200_000))
+        self.archive = buf.getvalue()
+        self.server = ArchiveServer(self.archive)
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__)
+        self.downloader = BundesbankDownloader(self.tmp.name)
+        self.downloader.CHUNK_SIZE = 8192
+        self.url = self.server.url(ArchiveServer.ARCHIVE_PATH)
+        self.cache_path = Path(self.tmp.name) / "bundesbank_data.csv.zip"
+        self.partial_path = Path(self.tmp.name) / "bundesbank_data.csv.zip.part"
+
+    def test_download_is_hashed_and_renamed_atomically(self):
+        path = self.downloader._download_archive(self.url, "csv")
+
+        self.assertEqual(Path(path).read_bytes(), self.archive)
+        metadata = self.downloader._load_cache_metadata("csv")
+        self.assertEqual(metadata["sha256"], hashlib.sha256(self.archive).hexdigest())
+        self.assertEqual(metadata["size"], len(self.archive))
+        self.assertFalse(self.partial_path.exists())
+
+    def test_truncated_download_keeps_partial_and_resumes(self):
+        self.server.truncate_after = 50_000
+
+        with self.assertRaises(Exception) as ctx:
+            self.downloader._download_archive(self.url, "csv")
+
+        self.assertIn("truncated", str(ctx.exception))
+        self.assertFalse(self.cache_path.exists())
+        self.assertEqual(self.partial_path.stat().st_size, 50_000)
+
+        path = self.downloader._download_archive(self.url, "csv")
+
+        _, _, headers = self.server.requests[-1]
+        self.assertEqual(headers["Range"], "bytes=50000-")
+        self.assertEqual(headers["If-Range"], '"v1"')
+        self.assertEqual(Path(path).read_bytes(), self.archive)
+        self.assertEqual(
+            self.downloader._load_cache_metadata("csv")["sha256"],
+            hashlib.sha256(self.archive).hexdigest(),
+        )
+        self.assertFalse(self.partial_path.exists())
+
+    def test_changed_archive_restarts_download(self):
+        self.server.truncate_after = 50_000
+        with self.assertRaises(Exception):
+            self.downloader._download_archive(self.url, "csv")
+
+        self.server.archive = _archive_bytes(CSV_CONTENT)
+        self.server.etag = '"v2"'
+        path = self.downloader._download_archive(self.url, "csv")
+
+        self.assertEqual(Path(path).read_bytes(), self.server.archive)
+
+    def test_truncation_keeps_previous_cache(self):
+        self.downloader._download_archive(self.url, "csv")
+        self.server.etag = '"v2"'
+        self.server.truncate_after = 10_000
+
+        with self.assertRaises(Exception):
+            self.downloader.get_data_file("csv", max_cache_age_hours=0)
+
+        # The complete previous archive is untouched
+        self.assertEqual(self.cache_path.read_bytes(), self.archive)
+
+    def test_corrupt_archive_is_discarded(self):
+        self.server.archive = b"not a zip file" * 100
+
+        with self.assertRaises(Exception) as ctx:
+            self.downloader._download_archive(self.url, "csv")
+
+        self.assertIn("corrupt", str(ctx.exception))
+        self.assertFalse(self.partial_path.exists())
+        self.assertFalse(self.cache_path.exists())
+
+
+class TestStaleWhileRevalidate(unittest.TestCase):
+    """Test serving stale data while refreshing in the background."""
+
+    NEW_ROW = '"50050000";"1";"Landesbank";"60311";"Frankfurt";"Helaba";"50050";"HELADEFFXXX";"01";"030001";"A";"0";"00000000"\n'
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.server = ArchiveServer(_archive_bytes(CSV_CONTENT))
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__)
+        self.downloader = BundesbankDownloader(self.tmp.name)
+        self.downloader.INDEX_URL = self.server.url("/index.html")
+        self.path = self.downloader.get_data_file("csv")
+        # Publish a new release and age the cache
+        self.server.archive = _archive_bytes(CSV_CONTENT + self.NEW_ROW)
+        self.server.etag = '"v2"'
+        self.server.requests.clear()
+
+    def _age_cache(self, hours):
+        old_time = time.time() - hours * 3600
+        os.utime(self.path, (old_time, old_time))
+
+    def test_stale_cache_is_served_and_refreshed_in_background(self):
+        self._age_cache(30)
+        with mock.patch.object(
+            BundesbankDownloader, "refresh", wraps=self.downloader.refresh
+        ) as refresh:
+            path = self.downloader.get_data_file("csv", stale_while_revalidate_hours=24)
+            self.assertEqual(path, self.path)
+            self.downloader.wait_for_refresh(timeout=10)
+
+        refresh.assert_called_once_with("csv", wait=False)
+        self.assertEqual(self.server.paths(), [ArchiveServer.ARCHIVE_PATH])
+        # The next run picks up the new release without blocking
+        self.assertEqual(IBANGenerator(path, seed=1).get_bank_count(), 3)
+        self.assertTrue(self.downloader._is_cache_fresh(Path(path), 1))
+
+    def test_hard_expiry_refreshes_before_returning(self):
+        self._age_cache(60)
+
+        with mock.patch.object(BundesbankDownloader, "refresh_in_background") as bg:
+            path = self.downloader.get_data_file("csv", stale_while_revalidate_hours=24)
+
+        bg.assert_not_called()
+        self.assertEqual(IBANGenerator(path, seed=1).get_bank_count(), 3)
+
+    def test_fresh_cache_is_revalidated_in_the_foreground(self):
+        with mock.patch.object(BundesbankDownloader, "refresh_in_background") as bg:
+            path = self.downloader.get_data_file("csv", stale_while_revalidate_hours=24)
+
+        bg.assert_not_called()
+        self.assertEqual(self.downloader.last_result.outcome, "updated")
+        self.assertEqual(IBANGenerator(path, seed=1).get_bank_count(), 3)
+
+    def test_detached_refresh_spawns_process(self):
+        self._age_cache(30)
+
+        with mock.patch("gen_ibans.downloader.subprocess.Popen") as popen:
+            self.downloader.get_data_file(
+                "csv", stale_while_revalidate_hours=24, background="process"
+            )
+
+        command = popen.call_args[0][0]
+        self.assertEqual(
+            command[1:5], ["-m", "gen_ibans.downloader", "--refresh", "csv"]
+        )
+        self.assertEqual(command[command.index("--cache-dir") + 1], self.tmp.name)
+        self.assertEqual(self.server.requests, [])
+
+    def test_detached_refresh_keeps_snapshot_limits(self):
+        self.downloader.snapshots.max_snapshots = 3
+        self.downloader.snapshots.max_bytes = None
+
+        with mock.patch("gen_ibans.downloader.subprocess.Popen") as popen:
+            self.downloader.refresh_in_background("csv", detach=True)
+
+        command = popen.call_args[0][0]
+        self.assertEqual(command[command.index("--max-snapshots") + 1], "3")
+        self.assertEqual(command[command.index("--max-snapshot-bytes") + 1], "none")
+
+        # The child builds its downloader with the same limits
+        with mock.patch("gen_ibans.downloader.BundesbankDownloader") as child:
+            child.return_value.refresh.return_value = None
+            self.assertEqual(_main(command[3:]), 0)
+        kwargs = child.call_args[1]
+        self.assertEqual(kwargs["max_snapshots"], 3)
+        self.assertIsNone(kwargs["max_snapshot_bytes"])
+
+    def test_refresh_entry_point_uses_cached_url(self):
+        self._age_cache(30)
+
+        self.assertEqual(_main(["--refresh", "csv", "--cache-dir", self.tmp.name]), 0)
+
+        self.assertEqual(self.server.paths(), [ArchiveServer.ARCHIVE_PATH])
+        self.assertEqual(IBANGenerator(self.path, seed=1).get_bank_count(), 3)
+
+
+class TestCacheLocking(unittest.TestCase):
+    """Test cross-process locking and single-flight refreshes."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.server = ArchiveServer(_archive_bytes(CSV_CONTENT))
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__)
+
+    def _downloader(self):
+        downloader = BundesbankDownloader(self.tmp.name)
+        downloader.INDEX_URL = self.server.url("/index.html")
+        downloader.FALLBACK_URLS = {}
+        return downloader
+
+    def test_lock_excludes_other_holders(self):
+        path = Path(self.tmp.name) / "test.lock"
+        with CacheLock(path):
+            self.assertFalse(CacheLock(path).acquire(blocking=False))
+            with self.assertRaises(CacheLockTimeout):
+                CacheLock(path, timeout=0.1).acquire()
+        other = CacheLock(path)
+        self.assertTrue(other.acquire(blocking=False))
+        other.release()
+
+    def test_concurrent_callers_download_once(self):
+        self.server.delay = 0.3
+        results = []
+
+        def worker():
+            # Separate instances behave like separate processes (one lock file each)
+            results.append(self._downloader().get_data_file("csv"))
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        self.assertEqual(len(results), 6)
+        self.assertEqual(len(set(results)), 1)
+        self.assertEqual(
+            self.server.paths(), ["/index.html", ArchiveServer.ARCHIVE_PATH]
+        )
+        self.assertEqual(IBANGenerator(results[0], seed=1).get_bank_count(), 2)
+
+    def test_background_refresh_skips_when_locked(self):
+        downloader = self._downloader()
+        downloader.get_data_file("csv")
+        self.server.requests.clear()
+
+        with CacheLock(downloader._get_lock_path("csv")):
+            self.assertIsNone(downloader.refresh("csv", wait=False))
+
+        self.assertEqual(self.server.requests, [])
+
+    def test_metadata_writes_are_atomic(self):
+        downloader = self._downloader()
+        downloader.get_data_file("csv")
+        downloader.get_data_file("csv")
+
+        leftovers = [
+            n for n in os.listdir(self.tmp.name) if n.endswith((".tmp", ".part"))
+        ]
+        self.assertEqual(leftovers, [])
+        self.assertIn("url", downloader._load_cache_metadata("csv"))
+
+        downloader.clear_cache()
+        self.assertEqual(
+            sorted(os.listdir(self.tmp.name)), ["bundesbank_data.csv.lock", "snapshots"]
+        )
+        self.assertEqual(downloader.get_cache_info(), {})
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Test timings, byte counts and cache outcome statistics."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.server = ArchiveServer(_archive_bytes(CSV_CONTENT))
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__)
+        self.downloader = BundesbankDownloader(self.tmp.name)
+        self.downloader.INDEX_URL = self.server.url("/index.html")
+        self.downloader.FALLBACK_URLS = {}
+
+    def test_outcomes_and_phases(self):
+        miss = self.downloader.fetch_data_file("csv")
+        revalidated = self.downloader.fetch_data_file("csv")
+        hit = self.downloader.fetch_data_file("csv", check_version=False)
+
+        self.assertEqual(miss.outcome, "miss")
+        self.assertEqual(miss.source, self.server.url(ArchiveServer.ARCHIVE_PATH))
+        self.assertEqual(
+            list(miss.timings),
+            ["lock", "index", "request", "download", "verify", "snapshot"],
+        )
+        self.assertEqual(miss.bytes["download"], len(self.server.archive))
+        self.assertGreater(miss.bytes["index"], 0)
+        self.assertFalse(miss.from_cache)
+
+        self.assertEqual(revalidated.outcome, "revalidated")
+        self.assertNotIn("download", revalidated.timings)
+        self.assertEqual(revalidated.bytes, {})
+
+        self.assertEqual(hit.outcome, "hit")
+        self.assertEqual(hit.timings, {})
+        self.assertTrue(hit.from_cache)
+        self.assertIs(self.downloader.last_result, hit)
+
+    def test_hit_ratio_across_runs(self):
+        self.downloader.get_data_file("csv")
+        # A new instance stands for the next run
+        downloader = BundesbankDownloader(self.tmp.name)
+        downloader.get_data_file("csv", check_version=False)
+        downloader.get_data_file("csv", check_version=False)
+        self.server.__exit__()
+        with self.assertRaises(Exception):
+            downloader.get_data_file("csv", force_download=True)
+
+        stats = downloader.get_cache_info()["csv"]["stats"]
+        self.assertEqual(stats["requests"], 4)
+        self.assertEqual(stats["counts"], {"miss": 1, "hit": 2, "error": 1})
+        self.assertEqual(stats["hit_ratio"], 0.5)
+        self.assertEqual(stats["miss_ratio"], 0.25)
+        self.assertEqual(downloader.last_result.outcome, "error")
+
+
+if __name__ == "__main__":
+    unittest.main()
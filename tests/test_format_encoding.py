@@ -28,6 +28,7 @@ SOFTWARE.
 import unittest
 import tempfile
 import os
+import zipfile
 from gen_ibans.iban_generator import IBANGenerator
 
 
@@ -344,6 +345,50 @@ class TestFormatAndEncoding(unittest.TestCase):
         self.assertEqual(len(ibans), 1)
         self.assertTrue(ibans[0].iban.startswith("DE"))
 
+    def _zip_file(self, data_path, member_name=None):
+        """Pack a data file into a ZIP archive (like the Bundesbank download)."""
+        zip_path = data_path + ".zip"
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("readme.pdf", b"%PDF-")
+            zf.write(data_path, member_name or os.path.basename(data_path))
+        return zip_path
+
+    def test_zip_archives_load_without_extraction(self):
+        """Test that CSV/TXT/XML members are read directly from a ZIP archive."""
+        for create in (
+            self._create_csv_file,
+            self._create_txt_file,
+            self._create_xml_file,
+        ):
+            zip_path = self._zip_file(create("iso-8859-1"))
+            before = set(os.listdir(self.test_dir))
+
+            generator = IBANGenerator(zip_path, seed=12345)
+
+            self.assertEqual(generator.get_bank_count(), 4)
+            bank_names = [bank.name for bank in generator.banks]
+            self.assertIn("Bank für München", bank_names)
+            # Nothing is extracted next to the archive
+            self.assertEqual(set(os.listdir(self.test_dir)), before)
+
+    def test_zip_archive_with_bom_and_nested_member(self):
+        """Test a UTF-8 BOM member stored in a sub directory of the archive."""
+        csv_path = self._create_csv_file("utf-8", with_bom=True)
+        zip_path = self._zip_file(csv_path, "blz/blz-aktuell.csv")
+
+        generator = IBANGenerator(zip_path, seed=12345)
+        self.assertEqual(generator.get_bank_count(), 4)
+
+    def test_zip_archive_without_data_member(self):
+        """Test that an archive without a data file raises a clear error."""
+        zip_path = os.path.join(self.test_dir, "empty.zip")
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.writestr("readme.pdf", b"%PDF-")
+
+        with self.assertRaises(ValueError) as ctx:
+            IBANGenerator(zip_path)
+        self.assertIn("No csv/txt/xml file found in archive", str(ctx.exception))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,185 @@
+"""
+Tests for partitioned output.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import gzip
+import json
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+import zlib
+from pathlib import Path
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pq = None
+
+from gen_ibans.iban_generator import BankInfo, IBANRecord
+from gen_ibans.partitioning import PartitionFileSink, PartitionWriter
+from gen_ibans.writers import (
+    JsonWriter,
+    ParquetWriter,
+    RelationalCsvWriter,
+    SqliteWriter,
+    XmlWriter,
+)
+
+from .test_writers import sample_records
+
+BANKS = [
+    BankInfo("37040044", "COBADEFFXXX", "Commerzbank", "13"),
+    BankInfo("10070000", "DEUTDEBBXXX", "Deutsche Bank", "63"),
+    BankInfo("50010517", "", "ING", "09"),
+]
+
+
+def records(n):
+    holders = sample_records()[0].account_holders
+    return [
+        IBANRecord(f"DE{i:020d}", BANKS[i % len(BANKS)], holders, []) for i in range(n)
+    ]
+
+
+class TestPartitionWriter(unittest.TestCase):
+    """Routing of records to partition files with bounded open handles."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name)
+
+    def test_one_file_per_key_with_lru_reopening(self):
+        writer = PartitionWriter(
+            JsonWriter, self.dir / "ibans.json", by="blz", max_open=1, buffer_size=0
+        )
+        with writer:
+            writer.write_all(records(30))
+        self.assertEqual(
+            sorted(p.name for p in writer.paths),
+            [
+                "ibans-blz-10070000.json",
+                "ibans-blz-37040044.json",
+                "ibans-blz-50010517.json",
+            ],
+        )
+        for bank in BANKS:
+            data = json.loads(
+                (self.dir / f"ibans-blz-{bank.bankleitzahl}.json").read_bytes()
+            )
+            self.assertEqual(len(data), 10)
+            self.assertTrue(all(d["bank"]["code"] == bank.bankleitzahl for d in data))
+        self.assertFalse(writer.writers)
+        self.assertFalse(any(sink.is_open for sink in writer.sinks.values()))
+
+    def test_live_writers_and_buffers_stay_bounded(self):
+        holders = sample_records()[0].account_holders
+        banks = [BankInfo(f"{10000000 + i}", "", f"Bank {i}", "09") for i in range(200)]
+        writer = PartitionWriter(
+            JsonWriter, self.dir / "ibans.json", by="blz", max_open=4
+        )
+        with writer:
+            for i in range(1000):
+                writer.write(IBANRecord(f"DE{i:020d}", banks[i % 200], holders, []))
+                sinks = writer.sinks.values()
+                self.assertLessEqual(len(writer.writers), 4)
+                self.assertLessEqual(sum(s.is_open for s in sinks), 4)
+                self.assertLessEqual(sum(bool(s._pending) for s in sinks), 4)
+        self.assertEqual(len(writer.paths), 200)
+        for bank in banks[::50]:
+            path = self.dir / f"ibans-blz-{bank.bankleitzahl}.json"
+            self.assertEqual(len(json.loads(path.read_bytes())), 5)
+
+    def test_empty_key_gets_placeholder_name(self):
+        with PartitionWriter(JsonWriter, self.dir / "ibans.json", by="bic") as writer:
+            writer.write_all(records(3))
+        self.assertTrue((self.dir / "ibans-bic-none.json").exists())
+        self.assertTrue((self.dir / "ibans-bic-COBADEFFXXX.json").exists())
+
+    def test_hash_buckets_are_stable_and_complete(self):
+        writer = PartitionWriter(
+            JsonWriter, self.dir / "ibans.json", by="method", partitions=4
+        )
+        with writer:
+            writer.write_all(records(9))
+        files = sorted(self.dir.glob("ibans-method-bucket-*.json"))
+        self.assertEqual(len(files), 4)
+        counts = {f.name: len(json.loads(f.read_bytes())) for f in files}
+        self.assertEqual(sum(counts.values()), 9)
+        bucket = zlib.crc32(b"13") % 4
+        self.assertGreaterEqual(counts[f"ibans-method-bucket-{bucket:04d}.json"], 3)
+
+    def test_compressed_partitions_survive_reopening(self):
+        writer = PartitionWriter(
+            XmlWriter,
+            self.dir / "ibans.xml.gz",
+            by="blz",
+            max_open=1,
+            buffer_size=0,
+            compression="gzip",
+        )
+        with writer:
+            writer.write_all(records(12))
+        path = self.dir / "ibans-blz-37040044.xml.gz"
+        with gzip.open(path, "rb") as f:
+            self.assertEqual(len(ET.fromstring(f.read())), 4)
+
+    @unittest.skipUnless(pq is not None, "pyarrow not installed")
+    def test_suspended_parquet_writers_flush_their_row_group(self):
+        writer = PartitionWriter(
+            ParquetWriter, self.dir / "ibans.parquet", by="blz", max_open=1
+        )
+        with writer:
+            writer.write_all(records(12))
+            self.assertEqual(len(writer.writers), 1)
+            self.assertEqual(len(writer._parked), 2)
+            self.assertFalse(any(w._pending for w in writer._parked.values()))
+        table = pq.read_table(self.dir / "ibans-blz-37040044.parquet")
+        self.assertEqual(table.num_rows, 4)
+
+    def test_unsupported_writers(self):
+        for writer_cls in (SqliteWriter, RelationalCsvWriter):
+            with self.assertRaises(ValueError):
+                PartitionWriter(writer_cls, self.dir / "x", by="blz")
+        with self.assertRaises(ValueError):
+            PartitionWriter(JsonWriter, self.dir / "x.json", by="name")
+
+
+class TestPartitionFileSink(unittest.TestCase):
+    """Suspending and reopening a partition file."""
+
+    def test_suspend_and_append(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            opened = []
+            sink = PartitionFileSink(Path(tmp) / "p.txt", on_open=opened.append)
+            sink.write(b"a")
+            sink.suspend()
+            self.assertFalse(sink.is_open)
+            sink.write(b"b")
+            sink.close()
+            self.assertEqual((Path(tmp) / "p.txt").read_bytes(), b"ab")
+            self.assertEqual(len(opened), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
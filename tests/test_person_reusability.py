@@ -256,6 +256,39 @@ def test_economic_activity_variation():
             os.unlink(test_csv_path)
 
 
+def test_person_ids_shared_by_variants():
+    """Variants of a pooled person share the base person's ID; IDs grow in stream order."""
+    test_csv_path = create_test_csv()
+
+    try:
+        config = GeneratorConfig(
+            legal_entity_probability=0.2,
+            person_reuse_distribution=[(3, 1.0)],
+        )
+        generator = IBANGenerator(test_csv_path, seed=7, config=config)
+
+        ids_by_tax_id = {}
+        last_person_id = 0
+        entity_ids = []
+        for record in generator.generate_ibans(50):
+            for person in record.account_holders + record.beneficiaries:
+                if isinstance(person, PersonalInfo):
+                    assert ids_by_tax_id.setdefault(
+                        person.tax_id, person.person_id
+                    ) == (person.person_id)
+                    # A person ID is never seen before all smaller ones
+                    assert person.person_id <= last_person_id + 1
+                    last_person_id = max(last_person_id, person.person_id)
+                else:
+                    entity_ids.append(person.entity_id)
+
+        assert sorted(ids_by_tax_id.values()) == list(range(1, last_person_id + 1))
+        assert entity_ids == list(range(1, len(entity_ids) + 1))
+    finally:
+        if os.path.exists(test_csv_path):
+            os.unlink(test_csv_path)
+
+
 def main():
     """Run all person reusability tests."""
     print("Starting person reusability tests...\n")
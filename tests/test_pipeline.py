@@ -0,0 +1,108 @@
+"""
+Tests for the background writer thread.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from gen_ibans.pipeline import BackgroundWriter
+from gen_ibans.writers import JsonlWriter, SqliteWriter
+
+from .test_writers import MemorySink, sample_records
+
+
+def records(n):
+    base = sample_records()
+    return [base[i % len(base)] for i in range(n)]
+
+
+class TestBackgroundWriter(unittest.TestCase):
+    """Batching, ordering, backpressure and error propagation."""
+
+    def test_records_are_written_in_order(self):
+        sink = MemorySink()
+        writer = JsonlWriter([sink])
+        with BackgroundWriter(writer, batch_size=3, queue_depth=2) as pipeline:
+            pipeline.write_all(records(10))
+        lines = bytes(sink.data).decode("utf-8").splitlines()
+        self.assertEqual(
+            [json.loads(line)["iban"] for line in lines], [r.iban for r in records(10)]
+        )
+        self.assertEqual(writer.count, 10)
+        self.assertTrue(sink.closed)
+
+    def test_full_queue_blocks_the_producer(self):
+        gate = threading.Event()
+
+        class SlowWriter(JsonlWriter):
+            def write(self, record):
+                gate.wait()
+                super().write(record)
+
+        pipeline = BackgroundWriter(
+            SlowWriter([MemorySink()]), batch_size=1, queue_depth=2
+        ).open()
+        producer = threading.Thread(target=pipeline.write_all, args=(records(10),))
+        producer.start()
+        producer.join(0.2)
+        self.assertTrue(producer.is_alive())
+        self.assertLessEqual(pipeline.count, 4)
+        gate.set()
+        producer.join(5)
+        pipeline.close()
+        self.assertEqual(pipeline.writer.count, 10)
+
+    def test_writer_errors_are_raised_on_close(self):
+        class FailingWriter(JsonlWriter):
+            def format_record(self, record):
+                raise OSError("disk full")
+
+        pipeline = BackgroundWriter(FailingWriter([MemorySink()]), batch_size=2)
+        pipeline.open()
+        pipeline.write_all(records(3))
+        with self.assertRaises(OSError):
+            pipeline.close()
+        pipeline.abort()
+
+    def test_abort_discards_queued_records(self):
+        sink = MemorySink()
+        pipeline = BackgroundWriter(JsonlWriter([sink]), batch_size=100)
+        pipeline.open()
+        pipeline.write_all(records(5))
+        pipeline.abort()
+        self.assertEqual(bytes(sink.data), b"")
+        self.assertTrue(sink.closed)
+
+    def test_sqlite_connection_is_used_from_the_worker(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = SqliteWriter(Path(tmp) / "ibans.db", batch_size=2)
+            with BackgroundWriter(writer, batch_size=2) as pipeline:
+                pipeline.write_all(records(5))
+            self.assertEqual(writer.count, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
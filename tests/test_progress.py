@@ -0,0 +1,130 @@
+"""
+Tests for throttled progress reporting.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import io
+import json
+import unittest
+from unittest.mock import patch
+
+from gen_ibans.progress import ProgressReporter, format_eta
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+
+class TestProgressReporter(unittest.TestCase):
+    """Throttling and output of the progress reporter."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = patch("gen_ibans.progress.time.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def events(self, stream):
+        return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    def test_updates_are_throttled_by_time(self):
+        bar = CountingStream()
+        progress = ProgressReporter(100_000, bar=bar, interval=0.1)
+        for done in range(1, 100_001):
+            if done % 1000 == 0:
+                self.clock.now += 0.01  # 100k records per second
+            progress.update(done)
+        # 1 simulated second at 10 Hz
+        self.assertLessEqual(bar.flushes, 11)
+        self.assertGreaterEqual(bar.flushes, 9)
+        self.assertIn("90%", bar.getvalue())
+
+    def test_clock_is_not_read_per_record(self):
+        progress = ProgressReporter(1_000_000, events=io.StringIO(), interval=0.1)
+        reads = 0
+
+        def clock():
+            nonlocal reads
+            reads += 1
+            return self.clock.now
+
+        with patch("gen_ibans.progress.time.monotonic", clock):
+            for done in range(1, 200_001):
+                if done % 1000 == 0:
+                    self.clock.now += 0.01
+                progress.update(done)
+        self.assertLess(reads, 2_000)
+
+    def test_every_n_records(self):
+        events = io.StringIO()
+        progress = ProgressReporter(10, events=events, every=4)
+        for done in range(1, 11):
+            progress.update(done)
+        progress.finish(10)
+        kinds = [(e["event"], e.get("done")) for e in self.events(events)]
+        self.assertEqual(
+            kinds,
+            [("start", None), ("progress", 4), ("progress", 8), ("done", 10)],
+        )
+
+    def test_events_report_rate_and_eta(self):
+        events = io.StringIO()
+        progress = ProgressReporter(1000, events=events, every=500)
+        self.clock.now += 2.0
+        progress.update(500)
+        event = self.events(events)[1]
+        self.assertEqual(event["done"], 500)
+        self.assertEqual(event["total"], 1000)
+        self.assertEqual(event["rate"], 250.0)
+        self.assertEqual(event["eta"], 2.0)
+
+    def test_finish_clears_bar(self):
+        bar = io.StringIO()
+        progress = ProgressReporter(3, bar=bar, every=1)
+        progress.update(1)
+        progress.finish(3)
+        self.assertTrue(bar.getvalue().endswith("\r"))
+        self.assertFalse(ProgressReporter(3).enabled)
+
+    def test_format_eta(self):
+        self.assertEqual(format_eta(None), "--:--")
+        self.assertEqual(format_eta(float("inf")), "--:--")
+        self.assertEqual(format_eta(75), "01:15")
+        self.assertEqual(format_eta(3725), "01:02:05")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+"""
+Tests for the shared-memory bank table.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import mmap
+import multiprocessing
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from gen_ibans.iban_generator import BankInfo, IBANGenerator
+from gen_ibans.shared_table import SharedBankTable
+
+
+def _worker_summary(kwargs):
+    """Attach in a child process and return what it sees."""
+    table = SharedBankTable.attach(**kwargs)
+    try:
+        generator = IBANGenerator(banks=table, seed=7)
+        record = generator.generate_iban()
+        return (
+            len(table),
+            table[1].name,
+            generator.get_bank_by_blz("37040044").city,
+            record.iban[4:12] in {"10000000", "37040044"},
+        )
+    finally:
+        table.close()
+
+
+class TestSharedBankTable(unittest.TestCase):
+    """Test publishing and attaching bank tables."""
+
+    def setUp(self):
+        self.banks = [
+            BankInfo("10000000", "MARKDEF1100", "Bundesbank", "09", merkmal="1"),
+            BankInfo(
+                "37040044",
+                "COBADEFFXXX",
+                "Commerzbank Köln",
+                "13",
+                postal_code="50667",
+                city="Köln",
+                record_number="024463",
+                change_flag="D",
+                deleted=True,
+                successor_blz="10000000",
+            ),
+        ]
+
+    def _assert_round_trip(self, table):
+        self.assertEqual(len(table), 2)
+        for original, shared in zip(self.banks, table):
+            self.assertEqual(vars(original), vars(shared))
+        self.assertEqual(table[-1].bankleitzahl, "37040044")
+        with self.assertRaises(IndexError):
+            table[2]
+
+    def test_shared_memory_round_trip(self):
+        with SharedBankTable.publish(self.banks) as table:
+            self._assert_round_trip(table)
+            attached = SharedBankTable.attach(name=table.name)
+            self._assert_round_trip(attached)
+            attached.close()
+
+    def test_mmap_file_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "banks.tbl")
+            with SharedBankTable.publish(self.banks, path=path) as table:
+                attached = SharedBankTable.attach(path=path)
+                self._assert_round_trip(attached)
+                attached.close()
+                width, view = table.column("bankleitzahl")
+                self.assertEqual(width, 8)
+                self.assertEqual(bytes(view), b"1000000037040044")
+                view.release()
+            self.assertFalse(os.path.exists(path))
+
+    def test_decoded_rows_are_memoized(self):
+        with SharedBankTable.publish(self.banks) as table:
+            attached = SharedBankTable.attach(name=table.name, row_cache_size=1)
+            first = attached[0]
+            self.assertIs(attached[0], first)
+            self.assertIsNot(attached[1], first)
+            # The bounded cache dropped row 0 and decodes it again
+            self.assertIsNot(attached[0], first)
+            self.assertEqual(vars(attached[0]), vars(first))
+            self.assertEqual(attached._row.cache_info().currsize, 1)
+            attached.close()
+
+    def test_attached_table_is_read_only(self):
+        with SharedBankTable.publish(self.banks) as table:
+            width, view = table.column("bic")
+            with self.assertRaises(TypeError):
+                view[0:1] = b"X"
+            view.release()
+
+    def test_rejects_foreign_data(self):
+        maps = []
+
+        def recording_mmap(*args, **kwargs):
+            maps.append(real_mmap(*args, **kwargs))
+            return maps[-1]
+
+        real_mmap = mmap.mmap
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "junk.tbl")
+            for junk in (b"\0" * 64, b"\0"):
+                with open(path, "wb") as f:
+                    f.write(junk)
+                with patch("mmap.mmap", recording_mmap):
+                    with self.assertRaises(ValueError):
+                        SharedBankTable.attach(path=path).close()
+        # The rejected mappings (and their file descriptors) were released
+        self.assertEqual(len(maps), 2)
+        self.assertTrue(all(m.closed for m in maps))
+        with self.assertRaises(ValueError):
+            SharedBankTable.attach()
+
+    def test_generator_requires_source(self):
+        with self.assertRaises(ValueError):
+            IBANGenerator()
+
+    def test_workers_attach_without_parsing(self):
+        ctx = multiprocessing.get_context("spawn")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "banks.tbl")
+            with SharedBankTable.publish(self.banks) as shm_table:
+                with SharedBankTable.publish(self.banks, path=path):
+                    with ctx.Pool(2) as pool:
+                        results = pool.map(
+                            _worker_summary, [{"name": shm_table.name}, {"path": path}]
+                        )
+        for result in results:
+            self.assertEqual(result, (2, "Commerzbank Köln", "Köln", True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+"""
+Tests for the snapshot store of downloaded Bundesbank releases.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+import zipfile
+from pathlib import Path
+
+from gen_ibans.downloader import BundesbankDownloader
+from gen_ibans.snapshot_store import SnapshotStore, detect_validity, file_sha256
+
+
+CSV_HEADER = "Bankleitzahl;Merkmal;Bezeichnung;PLZ;Ort;Kurzbezeichnung;PAN;BIC;Prüfzifferberechnungsmethode;Datensatznummer;Änderungskennzeichen;Bankleitzahllöschung;Nachfolge-Bankleitzahl\n"
+CSV_ROW = '"{blz}";"1";"{name}";"10591";"Berlin";"{name}";"20100";"MARKDEF1100";"09";"011380";"U";"0";"00000000"\n'
+
+XML_CONTENT = """<?xml version="1.0" encoding="UTF-8"?>
+<BLZDatei>
+  <FileHdr><ValidFrom>2025-03-03</ValidFrom><ValidTill>2025-06-08</ValidTill></FileHdr>
+  <BLZEintrag><BLZ>10000000</BLZ><Merkmal>1</Merkmal><Bezeichnung>Bundesbank</Bezeichnung>
+    <PLZ>10591</PLZ><Ort>Berlin</Ort><Kurzbezeichnung>BBk</Kurzbezeichnung><PAN>20100</PAN>
+    <BIC>MARKDEF1100</BIC><PruefZiffMeth>09</PruefZiffMeth></BLZEintrag>
+</BLZDatei>
+"""
+
+
+class TestSnapshotStore(unittest.TestCase):
+    """Test the content-addressed store of downloaded releases."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name)
+        self.store = SnapshotStore(self.dir / "snapshots")
+
+    def _archive(self, name, member, *banks):
+        path = self.dir / name
+        content = CSV_HEADER + "".join(
+            CSV_ROW.format(blz=blz, name=bank) for blz, bank in banks
+        )
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr(member, content.encode("iso-8859-1"))
+        return path
+
+    def test_add_is_content_addressed(self):
+        archive = self._archive("a.zip", "blz-20250303-csv.csv", ("10000000", "Alt"))
+
+        first = self.store.add(archive, "csv", etag='"v1"')
+        again = self.store.add(archive, "csv")
+
+        self.assertEqual(first.sha256, file_sha256(archive))
+        self.assertEqual(first.valid_from, "2025-03-03")
+        self.assertEqual(again.etag, '"v1"')
+        self.assertEqual(len(self.store.snapshots("csv")), 1)
+        self.assertTrue(self.store.archive_path(first.sha256).exists())
+
+    def test_validity_from_xml_header(self):
+        path = self.dir / "xml.zip"
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr("blz-aktuell-xml-data.xml", XML_CONTENT)
+
+        self.assertEqual(detect_validity(path, "xml"), "2025-03-03")
+
+    def test_select_by_date_and_hash(self):
+        old = self.store.add(
+            self._archive("a.zip", "blz-20250303-csv.csv", ("10000000", "Alt")), "csv"
+        )
+        new = self.store.add(
+            self._archive("b.zip", "blz-20250609-csv.csv", ("10000000", "Neu")), "csv"
+        )
+
+        self.assertEqual(self.store.select("csv").sha256, new.sha256)
+        self.assertEqual(
+            self.store.select("csv", valid_on="2025-05-01").sha256, old.sha256
+        )
+        self.assertEqual(
+            self.store.select("csv", valid_on="2025-06-09").sha256, new.sha256
+        )
+        self.assertIsNone(self.store.select("csv", valid_on="2024-12-31"))
+        self.assertEqual(
+            self.store.select("csv", sha256=old.sha256[:10]).sha256, old.sha256
+        )
+        self.assertIsNone(self.store.select("txt"))
+        with self.assertRaises(ValueError):
+            self.store.select("csv", valid_on="yesterday")
+
+    def test_least_recently_used_is_evicted(self):
+        store = SnapshotStore(self.dir / "limited", max_snapshots=2)
+        first = store.add(self._archive("a.zip", "a-20250101.csv", ("1", "A")), "csv")
+        time.sleep(0.01)
+        second = store.add(self._archive("b.zip", "b-20250201.csv", ("2", "B")), "csv")
+        time.sleep(0.01)
+        store.select("csv", sha256=first.sha256)
+        time.sleep(0.01)
+        third = store.add(self._archive("c.zip", "c-20250301.csv", ("3", "C")), "csv")
+
+        kept = {s.sha256 for s in store.snapshots()}
+        self.assertEqual(kept, {first.sha256, third.sha256})
+        self.assertFalse(store.archive_path(second.sha256).exists())
+
+    def test_size_limit_keeps_newest_snapshot(self):
+        store = SnapshotStore(self.dir / "tiny", max_bytes=1)
+        store.add(self._archive("a.zip", "a-20250101.csv", ("1", "A")), "csv")
+        latest = store.add(self._archive("b.zip", "b-20250201.csv", ("2", "B")), "csv")
+
+        self.assertEqual([s.sha256 for s in store.snapshots()], [latest.sha256])
+
+
+class TestDownloaderVersions(unittest.TestCase):
+    """Test pinning downloader results to stored releases."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.source = Path(self.tmp.name) / "source.zip"
+        self.downloader = BundesbankDownloader(str(Path(self.tmp.name) / "cache"))
+
+    def _publish(self, member, name):
+        with zipfile.ZipFile(self.source, "w") as zf:
+            zf.writestr(
+                member,
+                (CSV_HEADER + CSV_ROW.format(blz="10000000", name=name)).encode(
+                    "iso-8859-1"
+                ),
+            )
+        return self.downloader._download_archive(self.source.as_uri(), "csv")
+
+    def test_every_download_is_kept_as_version(self):
+        self._publish("blz-20250303-csv.csv", "Alt")
+        current = self._publish("blz-20250609-csv.csv", "Neu")
+
+        versions = self.downloader.get_cache_info()["csv"]["versions"]
+        self.assertEqual(
+            [v["valid_from"] for v in versions], ["2025-06-09", "2025-03-03"]
+        )
+
+        pinned = self.downloader.get_data_file(
+            "csv", check_version=False, version="2025-04-01"
+        )
+        self.assertNotEqual(pinned, current)
+        self.assertEqual(file_sha256(pinned), versions[1]["sha256"])
+        by_hash = self.downloader.get_data_file(
+            "csv", check_version=False, version=versions[0]["sha256"][:12]
+        )
+        self.assertEqual(file_sha256(by_hash), file_sha256(current))
+
+    def test_unknown_version_is_reported(self):
+        self._publish("blz-20250609-csv.csv", "Neu")
+
+        with self.assertRaises(ValueError) as ctx:
+            self.downloader.get_data_file(
+                "csv", check_version=False, version="2020-01-01"
+            )
+        self.assertIn("2025-06-09", str(ctx.exception))
+
+    def test_clear_cache_removes_versions(self):
+        self._publish("blz-20250609-csv.csv", "Neu")
+        self.downloader.clear_cache()
+
+        self.assertEqual(self.downloader.snapshots.snapshots(), [])
+        self.assertEqual(os.listdir(self.downloader.snapshots.root / "archives"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+"""
+Tests for split output with manifest.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from gen_ibans.splitting import SplitWriter, manifest_path, parse_size, part_path
+from gen_ibans.writers import (
+    CsvWriter,
+    JsonWriter,
+    RelationalCsvWriter,
+    SqliteWriter,
+    XmlWriter,
+)
+
+from .test_writers import sample_records
+
+
+def records(n):
+    base = sample_records()
+    return [base[i % len(base)] for i in range(n)]
+
+
+class TestSplitWriter(unittest.TestCase):
+    """Rotation of output parts and the manifest."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.output = Path(self.tmp.name) / "ibans.json"
+
+    def manifest(self, output=None):
+        with open(manifest_path(output or self.output), encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_split_every_writes_complete_documents(self):
+        with SplitWriter(JsonWriter, self.output, max_records=2) as writer:
+            writer.write_all(records(5))
+        self.assertFalse(self.output.exists())
+        manifest = self.manifest()
+        self.assertEqual(manifest["records"], 5)
+        self.assertEqual(
+            [(p["first_record"], p["last_record"]) for p in manifest["parts"]],
+            [(1, 2), (3, 4), (5, 5)],
+        )
+        for part in manifest["parts"]:
+            path = Path(self.tmp.name) / part["file"]
+            data = path.read_bytes()
+            self.assertEqual(len(json.loads(data)), part["records"])
+            self.assertEqual(part["bytes"], len(data))
+            self.assertEqual(part["sha256"], hashlib.sha256(data).hexdigest())
+
+    def test_split_size_repeats_csv_header(self):
+        output = Path(self.tmp.name) / "ibans.csv"
+        with SplitWriter(CsvWriter, output, max_bytes=400) as writer:
+            writer.write_all(records(10))
+        parts = self.manifest(output)["parts"]
+        self.assertGreater(len(parts), 1)
+        total = 0
+        for part in parts:
+            text = (Path(self.tmp.name) / part["file"]).read_text(encoding="utf-8")
+            rows = list(csv.reader(io.StringIO(text)))
+            self.assertEqual(rows[0][0], "IBAN")
+            self.assertEqual(len(rows) - 1, part["records"])
+            total += part["records"]
+        self.assertEqual(total, 10)
+
+    def test_compressed_parts_keep_suffix(self):
+        output = Path(self.tmp.name) / "ibans.xml.gz"
+        with SplitWriter(
+            XmlWriter, output, max_records=3, compression="gzip"
+        ) as writer:
+            writer.write_all(records(4))
+        manifest = self.manifest(output)
+        self.assertEqual(manifest["compression"], "gzip")
+        self.assertEqual(
+            [p["file"] for p in manifest["parts"]],
+            ["ibans-00001.xml.gz", "ibans-00002.xml.gz"],
+        )
+        for part in manifest["parts"]:
+            path = Path(self.tmp.name) / part["file"]
+            self.assertEqual(
+                part["sha256"], hashlib.sha256(path.read_bytes()).hexdigest()
+            )
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                self.assertTrue(f.read().endswith("</accounts>\n"))
+
+    def test_empty_run_writes_one_valid_part(self):
+        SplitWriter(JsonWriter, self.output, max_records=10).close()
+        parts = self.manifest()["parts"]
+        self.assertEqual(len(parts), 1)
+        self.assertIsNone(parts[0]["first_record"])
+        data = (Path(self.tmp.name) / parts[0]["file"]).read_bytes()
+        self.assertEqual(json.loads(data), [])
+
+    def test_sqlite_parts(self):
+        output = Path(self.tmp.name) / "ibans.db"
+        with SplitWriter(SqliteWriter, output, max_records=3) as writer:
+            writer.write_all(records(4))
+        parts = self.manifest(output)["parts"]
+        self.assertEqual([p["records"] for p in parts], [3, 1])
+        path = Path(self.tmp.name) / parts[1]["file"]
+        self.assertEqual(
+            parts[1]["sha256"], hashlib.sha256(path.read_bytes()).hexdigest()
+        )
+        with sqlite3.connect(str(path)) as connection:
+            count = connection.execute("SELECT count(*) FROM accounts").fetchone()
+        self.assertEqual(count, (1,))
+        with self.assertRaises(ValueError):
+            SplitWriter(SqliteWriter, output, max_bytes=1000).write(records(1)[0])
+
+    def test_unsupported_settings(self):
+        with self.assertRaises(ValueError):
+            SplitWriter(RelationalCsvWriter, self.tmp.name, max_records=1)
+        with self.assertRaises(ValueError):
+            SplitWriter(JsonWriter, self.output)
+
+    def test_abort_writes_no_manifest(self):
+        writer = SplitWriter(JsonWriter, self.output, max_records=2)
+        writer.write_all(records(3))
+        writer.abort()
+        self.assertFalse(os.path.exists(manifest_path(self.output)))
+
+
+class TestSplitHelpers(unittest.TestCase):
+    """Part naming and size parsing."""
+
+    def test_part_and_manifest_paths(self):
+        self.assertEqual(part_path("out/ibans.csv", 1), Path("out/ibans-00001.csv"))
+        self.assertEqual(
+            part_path("ibans.jsonl.zst", 12), Path("ibans-00012.jsonl.zst")
+        )
+        self.assertEqual(part_path("ibans", 2), Path("ibans-00002"))
+        self.assertEqual(manifest_path("ibans.csv.gz"), Path("ibans.manifest.json"))
+
+    def test_parse_size(self):
+        self.assertEqual(parse_size("4096"), 4096)
+        self.assertEqual(parse_size("1GB"), 10**9)
+        self.assertEqual(parse_size("1G"), 1 << 30)
+        self.assertEqual(parse_size("512 MiB"), 512 << 20)
+        self.assertEqual(parse_size("1.5kb"), 1500)
+        for invalid in ("", "1XB", "-1MB", "0"):
+            with self.assertRaises(ValueError):
+                parse_size(invalid)
+
+
+if __name__ == "__main__":
+    unittest.main()
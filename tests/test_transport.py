@@ -0,0 +1,181 @@
+"""
+Tests for the downloader transports and mirror failover.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from gen_ibans.downloader import BundesbankDownloader
+from gen_ibans.iban_generator import IBANGenerator
+from gen_ibans.transport import (
+    FileTransport,
+    HTTPStatusError,
+    HTTPTransport,
+    SourcesFailed,
+    hedged_request,
+)
+
+from .test_downloader import CSV_CONTENT, ArchiveServer, _archive_bytes
+
+
+class TransportTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache_dir = Path(self.tmp.name) / "cache"
+
+    def _server(self, **kwargs):
+        server = ArchiveServer(_archive_bytes(CSV_CONTENT), **kwargs)
+        server.__enter__()
+        self.addCleanup(server.__exit__)
+        return server
+
+    def _downloader(self, **kwargs):
+        downloader = BundesbankDownloader(str(self.cache_dir), **kwargs)
+        self.addCleanup(downloader.close)
+        return downloader
+
+
+class TestHTTPTransport(TransportTestCase):
+    """Test persistent connections against a local HTTP/1.1 server."""
+
+    def test_index_and_archive_share_one_connection(self):
+        server = self._server(keep_alive=True)
+        downloader = self._downloader()
+        downloader.INDEX_URL = server.url("/index.html")
+
+        path = downloader.get_data_file("csv")
+        downloader.get_data_file("csv")
+
+        self.assertEqual(
+            server.paths(),
+            ["/index.html", ArchiveServer.ARCHIVE_PATH, ArchiveServer.ARCHIVE_PATH],
+        )
+        self.assertEqual(len(set(server.clients)), 1)
+        self.assertEqual(downloader.transport.http.connections_opened, 1)
+        self.assertEqual(IBANGenerator(path, seed=1).get_bank_count(), 2)
+
+    def test_error_status_raises(self):
+        server = self._server(keep_alive=True)
+        transport = HTTPTransport()
+        self.addCleanup(transport.close)
+
+        with self.assertRaises(HTTPStatusError) as ctx:
+            transport.request(server.url("/nowhere"))
+
+        self.assertEqual(ctx.exception.status, 404)
+
+    def test_request_timeout(self):
+        server = self._server()
+        server.delay = 1.0
+        downloader = self._downloader(timeout=0.2)
+
+        started = time.monotonic()
+        with self.assertRaises(Exception):
+            downloader._download_archive(server.url(ArchiveServer.ARCHIVE_PATH), "csv")
+
+        self.assertLess(time.monotonic() - started, 0.9)
+
+
+class TestMirrors(TransportTestCase):
+    """Test ordered mirror lists with hedged failover."""
+
+    def test_failover_to_next_mirror(self):
+        broken, healthy = self._server(), self._server()
+        broken.missing.add(ArchiveServer.ARCHIVE_PATH)
+        downloader = self._downloader(
+            mirrors=[broken.url("/resource/"), healthy.url("/resource")]
+        )
+
+        path = downloader.get_data_file("csv")
+
+        self.assertEqual(broken.paths(), [ArchiveServer.ARCHIVE_PATH])
+        self.assertEqual(healthy.paths(), [ArchiveServer.ARCHIVE_PATH])
+        self.assertEqual(
+            downloader._load_cache_metadata("csv")["url"],
+            healthy.url(ArchiveServer.ARCHIVE_PATH),
+        )
+        self.assertEqual(IBANGenerator(path, seed=1).get_bank_count(), 2)
+
+    def test_slow_mirror_is_hedged(self):
+        slow, fast = self._server(), self._server()
+        slow.delay = 1.0
+        downloader = self._downloader(
+            mirrors=[slow.url("/resource/"), fast.url("/resource/")], hedge_delay=0.1
+        )
+
+        started = time.monotonic()
+        downloader.get_data_file("csv")
+
+        self.assertLess(time.monotonic() - started, 0.9)
+        self.assertEqual(
+            downloader._load_cache_metadata("csv")["url"],
+            fast.url(ArchiveServer.ARCHIVE_PATH),
+        )
+
+    def test_file_directory_mirror_revalidates(self):
+        mirror_dir = Path(self.tmp.name) / "mirror"
+        mirror_dir.mkdir()
+        (mirror_dir / "blz-aktuell-csv-zip-data.zip").write_bytes(
+            _archive_bytes(CSV_CONTENT)
+        )
+        downloader = self._downloader(mirrors=[mirror_dir.as_uri()])
+
+        path = downloader.get_data_file("csv")
+        etag = downloader._load_cache_metadata("csv")["etag"]
+        self.assertTrue(etag)
+
+        with mock.patch.object(
+            downloader, "_store_archive", wraps=downloader._store_archive
+        ) as store:
+            self.assertEqual(downloader.get_data_file("csv"), path)
+        store.assert_not_called()
+        self.assertEqual(IBANGenerator(path, seed=1).get_bank_count(), 2)
+
+    def test_official_site_as_last_resort(self):
+        server = self._server()
+        missing_dir = Path(self.tmp.name) / "missing"
+        downloader = self._downloader(
+            mirrors=[missing_dir.as_uri(), BundesbankDownloader.OFFICIAL_SOURCE]
+        )
+        downloader.INDEX_URL = server.url("/index.html")
+
+        downloader.get_data_file("csv")
+
+        self.assertEqual(server.paths(), ["/index.html", ArchiveServer.ARCHIVE_PATH])
+
+    def test_all_sources_failing(self):
+        missing = [(Path(self.tmp.name) / name).as_uri() + "/x.zip" for name in "ab"]
+
+        with self.assertRaises(SourcesFailed) as ctx:
+            hedged_request(FileTransport(), missing, hedge_delay=0.05)
+
+        self.assertTrue(ctx.exception.gone)
+        self.assertEqual([url for url, _ in ctx.exception.errors], missing)
+
+
+if __name__ == "__main__":
+    unittest.main()
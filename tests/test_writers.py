@@ -0,0 +1,637 @@
+"""
+Tests for the streaming record writers.
+
+Copyright (c) 2025 Sebastian Wallat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import csv
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from datetime import date
+from unittest.mock import patch
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pq = None
+
+from gen_ibans.iban_generator import BankInfo, IBANRecord, LegalEntity, PersonalInfo
+from gen_ibans.shared_table import SharedBankTable
+from gen_ibans.writers import (
+    WRITERS,
+    CsvWriter,
+    FileSink,
+    FragmentCache,
+    JsonlWriter,
+    JsonWriter,
+    ParquetWriter,
+    RecordWriter,
+    RelationalCsvWriter,
+    SqliteWriter,
+    Sink,
+    StreamSink,
+    TxtWriter,
+    XmlWriter,
+    field_value,
+    get_writer_class,
+    register_writer,
+)
+
+
+class MemorySink(Sink):
+    """Sink collecting everything it receives, counting raw writes."""
+
+    def __init__(self, buffer_size=0):
+        super().__init__(buffer_size)
+        self.data = bytearray()
+        self.raw_writes = 0
+        self.closed = False
+
+    def _write_raw(self, data):
+        self.raw_writes += 1
+        self.data += data
+
+    def close(self):
+        super().close()
+        self.closed = True
+
+
+def sample_records():
+    person = PersonalInfo(
+        first_name="Max",
+        last_name="Müller",
+        street_address="Musterstraße 1",
+        city="Berlin",
+        postal_code="10115",
+        tax_id="12345678901",
+        birth_date=date(1980, 5, 17),
+        wid="DE0000112345",
+        is_economically_active=True,
+    )
+    company = LegalEntity("Acme & Söhne", "Hauptstraße 42", "München", "80331", "DE1")
+    bank = BankInfo("37040044", "COBADEFFXXX", 'Bank "Nord" <Test>')
+    return [
+        IBANRecord("DE89370400440532013000", bank, [person], [company]),
+        IBANRecord("DE02120300000000202051", bank, [company], []),
+    ]
+
+
+def element_tree_account(record, fields=None):
+    """Reference rendering of one ``<account>`` element with ElementTree."""
+
+    def add_person(parent, tag, person):
+        elem = ET.SubElement(parent, tag)
+        if isinstance(person, LegalEntity):
+            ET.SubElement(elem, "type").text = "legal_entity"
+            ET.SubElement(elem, "name").text = person.name
+            ET.SubElement(elem, "wid").text = person.wid
+        else:
+            ET.SubElement(elem, "type").text = "natural_person"
+            ET.SubElement(elem, "first_name").text = person.first_name
+            ET.SubElement(elem, "last_name").text = person.last_name
+            ET.SubElement(elem, "birth_date").text = str(person.birth_date)
+            ET.SubElement(elem, "tax_id").text = person.tax_id
+            if person.wid:
+                ET.SubElement(elem, "wid").text = person.wid
+        ET.SubElement(elem, "street_address").text = person.street_address
+        ET.SubElement(elem, "city").text = person.city
+        ET.SubElement(elem, "postal_code").text = person.postal_code
+
+    account = ET.Element("account")
+    if fields:
+        for f in fields:
+            ET.SubElement(account, f).text = field_value(record, f)
+    else:
+        ET.SubElement(account, "iban").text = record.iban
+        holders = ET.SubElement(account, "account_holders")
+        for holder in record.account_holders:
+            add_person(holders, "holder", holder)
+        beneficiaries = ET.SubElement(account, "beneficiaries")
+        for beneficiary in record.beneficiaries:
+            add_person(beneficiaries, "beneficiary", beneficiary)
+        bank = ET.SubElement(account, "bank")
+        ET.SubElement(bank, "name").text = record.bank.name
+        ET.SubElement(bank, "bic").text = record.bank.bic
+        ET.SubElement(bank, "code").text = record.bank.bankleitzahl
+    return "  " + ET.tostring(account, encoding="unicode") + "\n"
+
+
+class TestRecordWriters(unittest.TestCase):
+    """Serialization and sink fan-out of the record writers."""
+
+    def write(self, writer_cls, **kwargs):
+        sink = MemorySink()
+        writer = writer_cls([sink], **kwargs)
+        with writer:
+            writer.write_all(sample_records())
+        self.assertTrue(sink.closed)
+        return sink.data.decode("utf-8")
+
+    def test_fan_out_writes_identical_bytes_to_all_sinks(self):
+        first, second = MemorySink(), MemorySink(buffer_size=1 << 16)
+        with JsonWriter([first, second]) as writer:
+            writer.write_all(sample_records())
+        self.assertEqual(bytes(first.data), bytes(second.data))
+        self.assertEqual(second.raw_writes, 1)
+        self.assertEqual(first.bytes_written, len(first.data))
+
+    def test_txt_honours_include_flags(self):
+        lines = self.write(TxtWriter).splitlines()
+        self.assertIn(
+            "Holders: Max Müller (Tax-ID: 12345678901, WID: DE0000112345)", lines[0]
+        )
+        self.assertIn("Address: Hauptstraße 42, 80331 München", lines[0])
+        self.assertTrue(
+            lines[1].endswith(
+                '| Beneficiaries: None | Bank "Nord" <Test> | COBADEFFXXX | 37040044'
+            )
+        )
+        bank_only = self.write(TxtWriter, include_personal_info=False)
+        self.assertEqual(
+            bank_only.splitlines()[0],
+            'DE89370400440532013000 | Bank "Nord" <Test> | COBADEFFXXX | 37040044',
+        )
+        iban_only = self.write(
+            TxtWriter, include_personal_info=False, include_bank_info=False
+        )
+        self.assertEqual(iban_only, "DE89370400440532013000\nDE02120300000000202051\n")
+
+    def test_csv_has_header_and_quotes_values(self):
+        rows = list(csv.reader(io.StringIO(self.write(CsvWriter))))
+        self.assertEqual(rows[0][0], "IBAN")
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[1][3], 'Bank "Nord" <Test>')
+        self.assertEqual(rows[2][2], "None")
+
+    def test_json_is_a_single_array(self):
+        data = json.loads(self.write(JsonWriter))
+        self.assertEqual([d["iban"] for d in data], [r.iban for r in sample_records()])
+        self.assertEqual(data[0]["account_holders"][0]["birth_date"], "1980-05-17")
+        self.assertEqual(data[1]["account_holders"][0]["type"], "legal_entity")
+        self.assertEqual(
+            json.loads(self.write(JsonWriter, fields=["iban"]))[1],
+            {"iban": "DE02120300000000202051"},
+        )
+
+    def test_jsonl_has_one_object_per_line(self):
+        text = self.write(JsonlWriter)
+        self.assertTrue(text.endswith("}\n"))
+        lines = text.splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(
+            [json.loads(line) for line in lines], json.loads(self.write(JsonWriter))
+        )
+        self.assertNotIn(", ", lines[1])
+
+    def test_json_fallback_matches_fast_path(self):
+        with patch("gen_ibans.writers._orjson", None):
+            fallback = self.write(JsonlWriter)
+            self.assertIn('"last_name":"Müller"', fallback)
+        try:
+            import orjson  # noqa: F401
+        except ImportError:
+            self.skipTest("orjson not installed")
+        self.assertEqual(self.write(JsonlWriter), fallback)
+
+    def test_empty_json_and_xml_are_valid(self):
+        for writer_cls in (JsonWriter, XmlWriter):
+            sink = MemorySink()
+            writer_cls([sink]).close()
+            text = sink.data.decode("utf-8")
+            if writer_cls is JsonWriter:
+                self.assertEqual(json.loads(text), [])
+            else:
+                self.assertEqual(len(ET.fromstring(sink.data)), 0)
+
+    def test_xml_is_a_well_formed_document(self):
+        root = ET.fromstring(self.write(XmlWriter).encode("utf-8"))
+        self.assertEqual(root.tag, "accounts")
+        self.assertEqual(len(root), 2)
+        self.assertEqual(root.find("account/bank/name").text, 'Bank "Nord" <Test>')
+        self.assertEqual(
+            root.find("account/beneficiaries/beneficiary/name").text, "Acme & Söhne"
+        )
+
+    def test_xml_templates_match_element_tree(self):
+        records = sample_records()
+        odd = PersonalInfo(
+            first_name="<A&B>",
+            last_name='O\'Neil "Jr"',
+            street_address="",
+            city="Köln",
+            postal_code="50667",
+            tax_id="98765432109",
+            birth_date=date(1999, 1, 2),
+        )
+        empty_entity = LegalEntity("X > Y", "Weg 1", None, "12345", "")
+        records.append(
+            IBANRecord(
+                "DE12500105170648489890",
+                BankInfo("50010517", "", "Ümlaut & Co"),
+                [odd, empty_entity],
+                [odd],
+            )
+        )
+        for fields in (None, ["iban", "bic", "beneficiaries", "wids", "method"]):
+            writer = XmlWriter([MemorySink()], fields=fields)
+            for record in records:
+                self.assertEqual(
+                    writer.format_record(record),
+                    element_tree_account(record, fields),
+                )
+
+    def test_xml_fragments_are_cached_per_person_variant(self):
+        base = dict(
+            first_name="Erika",
+            last_name="Muster & Sohn",
+            street_address="Weg 2",
+            city="Bonn",
+            postal_code="53111",
+            tax_id="11122233344",
+            birth_date=date(1970, 3, 4),
+            person_id=7,
+        )
+        variants = [
+            PersonalInfo(**base),
+            PersonalInfo(wid="DE0000700001", **base),
+            PersonalInfo(wid="DE0000700002", **base),
+        ]
+        other_bank = BankInfo("10000000", "MARKDEF1100", "Bundesbank")
+        records = [
+            IBANRecord(
+                f"DE0210000000000000000{i}",
+                other_bank if i % 2 else sample_records()[0].bank,
+                [variants[i % 3]],
+                [variants[(i + 1) % 3]],
+            )
+            for i in range(9)
+        ]
+        writer = XmlWriter([MemorySink()], fragment_cache_size=2)
+        for record in records:
+            self.assertEqual(writer.format_record(record), element_tree_account(record))
+        self.assertEqual(len(writer._person_fragments), 2)
+        self.assertEqual(len(writer._bank_fragments), 2)
+
+    def test_xml_bank_fragments_with_shared_table(self):
+        records = sample_records()
+        banks = [records[0].bank, BankInfo("10000000", "MARKDEF1100", "Bundesbank")]
+        with SharedBankTable.publish(banks) as published:
+            # Without row memoization every access decodes a new BankInfo
+            table = SharedBankTable.attach(name=published.name, row_cache_size=0)
+            self.addCleanup(table.close)
+            writer = XmlWriter([MemorySink()])
+            for i in range(6):
+                record = IBANRecord(
+                    records[i % 2].iban,
+                    table[i % 2],
+                    records[i % 2].account_holders,
+                    records[i % 2].beneficiaries,
+                )
+                self.assertEqual(
+                    writer.format_record(record), element_tree_account(record)
+                )
+            self.assertEqual(len(writer._bank_fragments), 2)
+
+    def test_fragment_cache_evicts_least_recently_used(self):
+        rendered = []
+
+        def render(value):
+            rendered.append(value)
+            return value.upper()
+
+        cache = FragmentCache(2)
+        for key in ("a", "b", "a", "c", "a", "b"):
+            self.assertEqual(cache.get(key, render, key), key.upper())
+        self.assertEqual(rendered, ["a", "b", "c", "b"])
+        self.assertEqual(len(cache), 2)
+
+        disabled = FragmentCache(0)
+        disabled.get("a", render, "a")
+        disabled.get("a", render, "a")
+        self.assertEqual(len(disabled), 0)
+        self.assertEqual(rendered[-2:], ["a", "a"])
+
+    def test_field_catalogue(self):
+        first, second = sample_records()
+        fields = [
+            "IBAN",
+            "account_number",
+            "Bank",
+            "code",
+            "method",
+            "holder_count",
+            "beneficiary_count",
+            "entity_type",
+            "birth_dates",
+            "wids",
+        ]
+        rows = list(csv.reader(io.StringIO(self.write(CsvWriter, fields=fields))))
+        self.assertEqual(rows[0], fields)
+        self.assertEqual(
+            rows[1],
+            [
+                first.iban,
+                "0532013000",
+                'Bank "Nord" <Test>',
+                "37040044",
+                "",
+                "1",
+                "1",
+                "natural_person",
+                "1980-05-17",
+                "DE0000112345",
+            ],
+        )
+        self.assertEqual(rows[2][7:], ["legal_entity", "", "DE1"])
+        self.assertEqual(field_value(second, " BIC "), "COBADEFFXXX")
+        self.assertEqual(field_value(second, "unknown"), "")
+
+    def test_unknown_fields_are_rejected(self):
+        with self.assertRaises(ValueError) as ctx:
+            CsvWriter([MemorySink()], fields=["iban", "nope", "bic", "foo"])
+        self.assertIn("nope, foo", str(ctx.exception))
+
+    def test_abort_skips_footer(self):
+        sink = MemorySink()
+        writer = XmlWriter([sink])
+        writer.open()
+        writer.abort()
+        writer.close()
+        self.assertTrue(sink.closed)
+        self.assertNotIn(b"</accounts>", bytes(sink.data))
+
+
+@unittest.skipUnless(pq is not None, "pyarrow not installed")
+class TestParquetWriter(unittest.TestCase):
+    """Parquet output with row groups and nested person columns."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "out.parquet")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_row_groups_and_nested_columns(self):
+        with ParquetWriter([FileSink(self.path)], row_group_size=2) as writer:
+            writer.write_all(sample_records() * 3)
+        parquet = pq.ParquetFile(self.path)
+        self.assertEqual(parquet.metadata.num_rows, 6)
+        self.assertEqual(parquet.metadata.num_row_groups, 3)
+        schema = parquet.schema_arrow
+        for column in ("bank_name", "bic", "bank_code"):
+            self.assertEqual(str(schema.field(column).type.value_type), "string")
+            self.assertTrue(str(schema.field(column).type).startswith("dictionary"))
+        rows = parquet.read().to_pylist()
+        holder = rows[0]["account_holders"][0]
+        self.assertEqual(holder["first_name"], "Max")
+        self.assertEqual(holder["birth_date"], date(1980, 5, 17))
+        self.assertEqual(rows[0]["beneficiaries"][0]["type"], "legal_entity")
+        self.assertEqual(rows[1]["beneficiaries"], [])
+        self.assertEqual(rows[1]["bank_code"], "37040044")
+
+    def test_selected_fields_and_empty_file(self):
+        with ParquetWriter([FileSink(self.path)], fields=["iban", "bic"]):
+            pass
+        table = pq.read_table(self.path)
+        self.assertEqual(table.num_rows, 0)
+        self.assertEqual(table.schema.names, ["iban", "bic"])
+
+        with ParquetWriter([FileSink(self.path)], fields=["iban", "bic"]) as writer:
+            writer.write_all(sample_records())
+        self.assertEqual(
+            pq.read_table(self.path).to_pylist()[1],
+            {"iban": "DE02120300000000202051", "bic": "COBADEFFXXX"},
+        )
+
+    def test_rejects_invalid_row_group_size(self):
+        with self.assertRaises(ValueError):
+            ParquetWriter([MemorySink()], row_group_size=0)
+
+
+class TestRelationalCsvWriter(unittest.TestCase):
+    """Normalized CSV tables with stable IDs."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmp.name, "tables")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self, table):
+        with open(
+            os.path.join(self.directory, f"{table}.csv"), encoding="utf-8", newline=""
+        ) as f:
+            return list(csv.DictReader(f))
+
+    def test_tables_and_links(self):
+        records = sample_records()
+        person = records[0].account_holders[0]
+        variant = PersonalInfo(
+            person.first_name,
+            person.last_name,
+            person.street_address,
+            person.city,
+            person.postal_code,
+            person.tax_id,
+            person.birth_date,
+            wid=None,
+        )
+        records.append(
+            IBANRecord("DE27100777770209299700", records[0].bank, [variant], [])
+        )
+        with RelationalCsvWriter.create(self.directory) as writer:
+            writer.write_all(records)
+
+        self.assertEqual(
+            [a["account_id"] for a in self.read("accounts")], ["1", "2", "3"]
+        )
+        persons = self.read("persons")
+        self.assertEqual(len(persons), 1)
+        self.assertEqual(persons[0]["birth_date"], "1980-05-17")
+        entities = self.read("legal_entities")
+        self.assertEqual([e["name"] for e in entities], ["Acme & Söhne"])
+
+        holders = self.read("account_holders")
+        self.assertEqual(
+            [
+                (
+                    h["account_id"],
+                    h["entity_type"],
+                    h["person_id"],
+                    h["legal_entity_id"],
+                )
+                for h in holders
+            ],
+            [
+                ("1", "natural_person", "1", ""),
+                ("2", "legal_entity", "", "1"),
+                ("3", "natural_person", "1", ""),
+            ],
+        )
+        self.assertEqual(holders[0]["wid"], "DE0000112345")
+        self.assertEqual(holders[2]["wid"], "")
+        beneficiaries = self.read("beneficiaries")
+        self.assertEqual(beneficiaries[0]["legal_entity_id"], "1")
+
+        with open(os.path.join(self.directory, "accounts.csv"), "rb") as f:
+            raw = f.read()
+        self.assertNotIn(b"\r", raw)
+        self.assertIn(b'"Bank ""Nord"" <Test>"', raw)
+
+    def test_rejects_fields_and_missing_directory(self):
+        with self.assertRaises(ValueError):
+            RelationalCsvWriter.create(self.directory, fields=["iban"])
+        with self.assertRaises(ValueError):
+            RelationalCsvWriter.create(None)
+
+
+class TestSqliteWriter(unittest.TestCase):
+    """Batched SQLite loading into the normalized schema."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "fixtures.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_load_in_batches_then_index(self):
+        with open(self.path, "w") as f:
+            f.write("not a database")
+        with SqliteWriter.create(self.path, batch_size=2) as writer:
+            writer.write_all(sample_records() * 2 + sample_records()[:1])
+
+        connection = sqlite3.connect(self.path)
+        try:
+            counts = {
+                table: connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in (
+                    "accounts",
+                    "persons",
+                    "legal_entities",
+                    "account_holders",
+                    "beneficiaries",
+                )
+            }
+            self.assertEqual(
+                counts,
+                {
+                    "accounts": 5,
+                    "persons": 1,
+                    "legal_entities": 1,
+                    "account_holders": 5,
+                    "beneficiaries": 3,
+                },
+            )
+            indexes = {
+                row[0]
+                for row in connection.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index'"
+                )
+            }
+            self.assertIn("ux_account_holders", indexes)
+            self.assertIn("ix_accounts_iban", indexes)
+            row = connection.execute(
+                "SELECT p.birth_date, h.wid FROM account_holders h "
+                "JOIN persons p USING (person_id) WHERE h.account_id = 1"
+            ).fetchone()
+            self.assertEqual(row, ("1980-05-17", "DE0000112345"))
+        finally:
+            connection.close()
+
+    def test_rejects_fields_and_missing_path(self):
+        with self.assertRaises(ValueError):
+            SqliteWriter.create(self.path, fields=["iban"])
+        with self.assertRaises(ValueError):
+            SqliteWriter.create(None)
+        with self.assertRaises(ValueError):
+            SqliteWriter(self.path, batch_size=0)
+
+
+class TestSinks(unittest.TestCase):
+    """Buffered file and stream sinks."""
+
+    def test_file_sink_buffers_until_close(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.txt")
+            sink = FileSink(path, buffer_size=1024)
+            sink.write(b"abc")
+            self.assertEqual(os.path.getsize(path), 0)
+            sink.close()
+            sink.close()
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), b"abc")
+
+    def test_stream_sink_uses_binary_buffer_for_utf8(self):
+        raw = io.BytesIO()
+        stream = io.TextIOWrapper(raw, encoding="utf-8")
+        stream.write("first\n")
+        sink = StreamSink(stream, buffer_size=0)
+        sink.write("zweite Zeile ß\n".encode("utf-8"))
+        sink.close()
+        self.assertEqual(raw.getvalue(), "first\nzweite Zeile ß\n".encode("utf-8"))
+
+    def test_stream_sink_falls_back_to_text(self):
+        stream = io.StringIO()
+        sink = StreamSink(stream)
+        sink.write("Größe\n".encode("utf-8"))
+        self.assertEqual(stream.getvalue(), "")
+        sink.close()
+        self.assertEqual(stream.getvalue(), "Größe\n")
+
+
+class TestWriterRegistry(unittest.TestCase):
+    """Format lookup and registration."""
+
+    def test_lookup(self):
+        self.assertIs(get_writer_class(None), TxtWriter)
+        self.assertIs(get_writer_class("csv"), CsvWriter)
+        with self.assertRaises(ValueError):
+            get_writer_class("yaml")
+
+    def test_register_custom_writer(self):
+        class IbanListWriter(RecordWriter):
+            name = "ibanlist"
+
+            def format_record(self, record):
+                return record.iban + ","
+
+        try:
+            register_writer(IbanListWriter)
+            sink = MemorySink()
+            with get_writer_class("ibanlist")([sink]) as writer:
+                writer.write_all(sample_records())
+            self.assertEqual(
+                bytes(sink.data), b"DE89370400440532013000,DE02120300000000202051,"
+            )
+        finally:
+            WRITERS.pop("ibanlist", None)
+
+
+if __name__ == "__main__":
+    unittest.main()